@@ -0,0 +1,125 @@
+"""
+Cold-start import time of every tool, checked against a per-tool budget.
+
+    python -m benchmarks.import_time                      # fail when a tool exceeds benchmarks/import_budget.json
+    python -m benchmarks.import_time --tools get_my_claims --repeat 9 -o import_time.json
+    python -m benchmarks.import_time --save-budget        # after an intended change, with headroom
+
+Each tool module is imported in a fresh interpreter with `-X importtime`, from
+a copy of `tools/` without bytecode (as the tools are uploaded to the runtime)
+and with `-B` so nothing is cached between runs. The ADK's `@tool` decorator
+module is imported by every tool and cannot be deferred, so the budget applies
+to `extra_ms`: the time spent in modules that a bare
+`import ibm_watsonx_orchestrate.agent_builder.tools` does not load, including
+compiling and running the tool module itself. `(all tools)` imports every tool
+in one process, as a tool server does, so shared modules are only paid once.
+"""
+import argparse
+import json
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from runtime.toolbox import TOOLS_DIR
+
+BUDGET_PATH = Path(__file__).resolve().parent / "import_budget.json"
+BASELINE_IMPORT = "ibm_watsonx_orchestrate.agent_builder.tools"
+ALL_TOOLS = "(all tools)"
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def tool_modules() -> Dict[str, str]:
+    """Tool name -> module that defines it, for every Python tool in the manifest."""
+    from runtime.manifest import get_manifest
+
+    return {name: tool.entrypoint.split(":")[0] for name, tool in sorted(get_manifest().tools.items())
+            if tool.toolkit == "python" and tool.entrypoint}
+
+
+def import_times(statement: str, cwd: Path) -> Dict[str, int]:
+    """Self time in microseconds of every module imported by `statement` in a fresh interpreter."""
+    out = subprocess.run([sys.executable, "-B", "-X", "importtime", "-c", statement], cwd=cwd,
+                         capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in out.splitlines():
+        match = LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(1))
+    return times
+
+
+def measure(modules: List[str], cwd: Path, baseline: set, repeat: int) -> Dict:
+    statement = "; ".join(f"import {module}" for module in modules)
+    runs = [import_times(statement, cwd) for _ in range(repeat)]
+    extras = [{name: us for name, us in run.items() if name not in baseline} for run in runs]
+    median_run = sorted(zip((sum(extra.values()) for extra in extras), range(repeat)))[repeat // 2][1]
+    heaviest = sorted(extras[median_run].items(), key=lambda item: -item[1])[:5]
+    return {
+        "extra_ms": round(statistics.median(sum(extra.values()) for extra in extras) / 1000, 2),
+        "total_ms": round(statistics.median(sum(run.values()) for run in runs) / 1000, 2),
+        "modules_loaded": len(extras[median_run]),
+        "heaviest": {name: round(us / 1000, 2) for name, us in heaviest},
+    }
+
+
+def check(results: Dict[str, Dict], budget: Dict) -> List[str]:
+    """Tools whose extra import time is over their budget (or the default budget)."""
+    over = []
+    for name, result in results.items():
+        limit = budget.get("tools", {}).get(name, budget.get("default_ms"))
+        if limit is not None and result["extra_ms"] > limit:
+            over.append(f"{name}: {result['extra_ms']}ms > {limit}ms")
+    return over
+
+
+def main(argv=None):
+    modules = tool_modules()
+    parser = argparse.ArgumentParser(description="Measure and budget the import time of the tools")
+    parser.add_argument("--tools", nargs="+", choices=list(modules) + [ALL_TOOLS], default=None)
+    parser.add_argument("--repeat", type=int, default=5, help="Interpreters started per measurement (median)")
+    parser.add_argument("--budget", default=str(BUDGET_PATH), help="Budget JSON to check against")
+    parser.add_argument("--save-budget", action="store_true",
+                        help=f"Write the measurements plus --headroom to {BUDGET_PATH.name}")
+    parser.add_argument("--headroom", type=float, default=1.5, help="Budget as a multiple of the measurement")
+    parser.add_argument("--output", "-o", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    selected = args.tools or list(modules) + [ALL_TOOLS]
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # A copy without __pycache__, so every run compiles the tools from source like a fresh upload
+        cwd = Path(tmp) / "tools"
+        shutil.copytree(TOOLS_DIR, cwd, ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+        baseline = set(import_times(f"import {BASELINE_IMPORT}", cwd))
+        for name in selected:
+            targets = list(dict.fromkeys(modules.values())) if name == ALL_TOOLS else [modules[name]]
+            results[name] = measure(targets, cwd, baseline, args.repeat)
+            print(json.dumps({"tool": name, **results[name]}), file=sys.stderr)
+
+    report = {"benchmark": "import_time", "python": sys.version.split()[0], "results": results}
+    budget_path = Path(args.budget)
+    over: Optional[List[str]] = None
+    if args.save_budget:
+        budget = {"default_ms": 50.0, "tools": {name: round(result["extra_ms"] * args.headroom + 1, 1)
+                                                for name, result in results.items()}}
+        BUDGET_PATH.write_text(json.dumps(budget, indent=2) + "\n")
+    elif budget_path.exists():
+        over = report["over_budget"] = check(results, json.loads(budget_path.read_text()))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    for line in over or []:
+        print(f"OVER BUDGET {line}", file=sys.stderr)
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
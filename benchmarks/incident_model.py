@@ -0,0 +1,147 @@
+"""
+Construction and serialization cost of the shared ServiceNow incident model.
+
+    python -m benchmarks.incident_model --sizes 10000 100000 -o incident_model.json
+
+Rows come from the seeded ServiceNow stand-in, i.e. they look like Table API
+results. Each strategy is timed on the whole result set (best of `--repeat`)
+and reported in milliseconds per 10k incidents:
+
+- `validate_per_row`: one `ServiceNowIncident(...)` call per row, as the tools did
+- `construct_per_row`: `ServiceNowIncident.model_construct(...)` per row, skipping validation
+- `validate_batch`: `incidents_from_rows`, one pydantic-core call for the result set
+- `top10_then_validate`: what `get_my_service_now_incidents` does now, sorting the
+  raw rows and validating only the 10 it returns
+- `json_per_model` / `json_stdlib` / `json_batch`: a JSON array of the incidents
+  from `model_dump_json` per incident, `json.dumps` of `model_dump`s, and `incidents_json`
+
+`transfer` compares the response body of every field with reference links
+against `table_params()` (the fields the model needs, no links), raw and
+gzip-compressed, and picking the 10 newest rows from it with `json.loads` against
+`json_stream.iter_result` over 64 KiB chunks: total and time-to-first-record
+(best of `--repeat`), and the tracemalloc peak of parsing.
+"""
+import argparse
+import gzip
+import heapq
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from mocks import servicenow_service
+from runtime.toolbox import TOOLS_DIR
+
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from json_stream import CHUNK_SIZE, iter_result  # noqa: E402
+from servicenow_models import (ServiceNowIncident, incidents_from_rows, incidents_json,  # noqa: E402
+                               table_params)
+
+
+def incident_fields(row: Dict) -> Dict:
+    return dict(incident_number=row['number'], short_description=row['short_description'],
+                description=row.get('description', ''), state=row['state'], urgency=row['urgency'],
+                created_on=row['opened_at'])
+
+
+def best_ms(fn: Callable, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def peak_kib(fn: Callable) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def bench_transfer(repeat: int) -> Dict:
+    base_url = "http://localhost:8004/"
+    full = [servicenow_service.render_incident(row, base_url, None, "false", False)
+            for row in servicenow_service.incidents_db.values()]
+    params = table_params()
+    trimmed = [servicenow_service.render_incident(row, base_url, params['sysparm_fields'],
+                                                  params['sysparm_display_value'], True)
+               for row in servicenow_service.incidents_db.values()]
+    full_body = json.dumps({"result": full}).encode("utf-8")
+    body = json.dumps({"result": trimmed}).encode("utf-8")
+
+    def chunks():
+        return (body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+
+    def load():
+        return heapq.nlargest(10, json.loads(body)["result"], key=lambda row: row['opened_at'])
+
+    def stream():
+        return heapq.nlargest(10, iter_result(chunks()), key=lambda row: row['opened_at'])
+
+    assert load() == stream()
+    return {
+        "body_kib": {"all_fields": round(len(full_body) / 1024, 1), "table_params": round(len(body) / 1024, 1),
+                     "table_params_gzip": round(len(gzip.compress(body, 6)) / 1024, 1)},
+        "top10_ms": {"json_loads": round(best_ms(load, repeat), 2), "stream": round(best_ms(stream, repeat), 2)},
+        "first_record_ms": {"json_loads": round(best_ms(lambda: json.loads(body)["result"][0], repeat), 2),
+                            "stream": round(best_ms(lambda: next(iter_result(chunks())), repeat), 3)},
+        "peak_kib": {"json_loads": peak_kib(load), "stream": peak_kib(stream)},
+    }
+
+
+def bench_size(size: int, repeat: int, seed: int) -> Dict:
+    servicenow_service.seed(size, seed=seed)
+    rows: List[Dict] = [dict(row) for row in servicenow_service.incidents_db.values()]
+    incidents = incidents_from_rows(rows)
+    strategies = {
+        "validate_per_row": lambda: [ServiceNowIncident(**incident_fields(row)) for row in rows],
+        "construct_per_row": lambda: [ServiceNowIncident.model_construct(**incident_fields(row)) for row in rows],
+        "validate_batch": lambda: incidents_from_rows(rows),
+        "top10_then_validate": lambda: incidents_from_rows(
+            sorted(rows, key=lambda row: row['opened_at'], reverse=True)[:10]),
+        "json_per_model": lambda: "[" + ",".join(incident.model_dump_json() for incident in incidents) + "]",
+        "json_stdlib": lambda: json.dumps([incident.model_dump() for incident in incidents]),
+        "json_batch": lambda: incidents_json(incidents),
+    }
+    assert json.loads(strategies["json_per_model"]()) == json.loads(incidents_json(incidents))
+    scale = 10_000 / size
+    return {"size": size, "ms_per_10k": {name: round(best_ms(fn, repeat) * scale, 2)
+                                         for name, fn in strategies.items()},
+            "transfer": bench_transfer(repeat)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark incident model construction and serialization")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per strategy (best is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    try:
+        for size in args.sizes:
+            result = bench_size(size, args.repeat, args.seed)
+            print(json.dumps(result), file=sys.stderr)
+            results.append(result)
+    finally:
+        servicenow_service.seed()
+
+    report = json.dumps({"benchmark": "incident_model", "results": results}, indent=2)
+    if args.output:
+        Path(args.output).write_text(report)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
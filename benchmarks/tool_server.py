@@ -0,0 +1,105 @@
+"""
+Cost of a tool call made as its own process against the warm tool server.
+
+    python -m benchmarks.tool_server --tools get_directory_tool get_healthcare_benefits -o tool_server.json
+
+The mocks run in-process, and `runtime.tool_server` is served on an ephemeral
+port. For each tool, milliseconds per call (median) are reported for:
+
+- `process`: a new interpreter that imports the tool and calls it once
+  (`--process-calls` times, as the tools run without a long-lived server)
+- `server`: sequential `POST /tools/{name}` requests over one keep-alive connection
+- `batch`: `POST /batch` with `--batch-size` calls, divided by the batch size
+
+Tool result caching and client-side rate limiting are disabled, so every call
+reaches the mock.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+
+from benchmarks.tools import CASES, seed_datasets
+from mocks.harness import MockServer, MockServices
+from runtime.tool_server import create_app
+from runtime.toolbox import PROJECT_ROOT
+
+PROCESS_CALL = ("import json, sys; from runtime.toolbox import resolve_tool; "
+                "resolve_tool(sys.argv[1])(**json.loads(sys.argv[2]))")
+
+
+def median_ms(samples: List[float]) -> float:
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def bench_tool(url: str, name: str, size: int, calls: int, process_calls: int, batch_size: int) -> Dict:
+    case = CASES[name]
+    process = []
+    for i in range(process_calls):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", PROCESS_CALL, name, json.dumps(case(i, size))], cwd=PROJECT_ROOT,
+                       check=True)
+        process.append(time.perf_counter() - started)
+
+    session = requests.Session()
+    server = []
+    for i in range(calls):
+        started = time.perf_counter()
+        response = session.post(f"{url}/tools/{name}", json=case(i, size))
+        server.append(time.perf_counter() - started)
+        assert response.json()["status"] == "succeeded", response.text
+
+    batch = []
+    for start in range(0, calls, batch_size):
+        body = {"calls": [{"tool": name, "arguments": case(i, size)} for i in range(start, start + batch_size)]}
+        started = time.perf_counter()
+        results = session.post(f"{url}/batch", json=body).json()["results"]
+        batch.append((time.perf_counter() - started) / batch_size)
+        assert all(result["status"] == "succeeded" for result in results)
+
+    return {"tool": name, "size": size, "ms_per_call": {"process": median_ms(process), "server": median_ms(server),
+                                                        "batch": median_ms(batch)}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark per-process tool calls against the warm tool server")
+    parser.add_argument("--tools", nargs="+", default=["get_directory_tool", "get_healthcare_benefits"],
+                        choices=list(CASES))
+    parser.add_argument("--size", type=int, default=100, help="Records seeded into each mock")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per tool through the server")
+    parser.add_argument("--process-calls", type=int, default=5, help="Calls per tool in new processes")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--output", "-o", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    os.environ["TOOL_CACHE_DISABLED"] = "1"
+    os.environ["TOOL_RATE_LIMIT"] = "off"
+    results = []
+    with MockServices():
+        server = MockServer(create_app(args.tools), ready_path="/tools", lifespan="on").start(timeout=60)
+        try:
+            for name in args.tools:
+                seed_datasets(args.size)
+                result = bench_tool(server.url, name, args.size, args.calls, args.process_calls, args.batch_size)
+                print(json.dumps(result), file=sys.stderr)
+                results.append(result)
+        finally:
+            server.stop()
+
+    report = json.dumps({"benchmark": "tool_server", "results": results}, indent=2)
+    if args.output:
+        Path(args.output).write_text(report)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
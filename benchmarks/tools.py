@@ -0,0 +1,257 @@
+"""
+Latency, throughput and allocation benchmarks for every tool in `tools/`.
+
+    python -m benchmarks.tools --latency-ms 0 20 --sizes 100 10000 -o tools.json
+    python -m benchmarks.tools --save-baseline          # record benchmarks/baseline.json
+    python -m benchmarks.tools --tools get_directory_tool --compare benchmarks/baseline.json
+
+The mocks (including the healthcare and ServiceNow stand-ins) run in-process on
+ephemeral ports with `LatencyMiddleware` adding the requested latency, and are
+seeded with `--sizes` records from `mocks.datagen`. For each tool, latency percentiles come from
+sequential calls, throughput from `--concurrency` threads sharing the same
+number of calls, and allocations from tracemalloc peaks per call; every figure
+is the median of `--repeat` runs, for the results and the baseline alike. Calls that
+raise or return an error are counted in `errors` rather than ending the run,
+and more errors than the baseline are a regression. Allocation
+figures include the in-process mock's share of the request. Tool result caching
+and client-side rate limiting are disabled unless `--cache` / `--rate-limit`
+are given, and so is request hedging unless `--hedge` is; `--tail-ms` and
+`--tail-rate` add a latency tail to the mocks for it to cut, and with
+`--hedge` each result has the hedges sent and won per endpoint.
+
+    python -m benchmarks.tools --tools search_healthcare_providers --latency-ms 5 --tail-ms 200 --tail-rate 0.03 --hedge
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from mocks import datagen, healthcare_service
+from mocks.harness import MockServices
+from mocks.middleware import set_latency
+from runtime.toolbox import TOOLS_DIR, is_error_result, resolve_tool
+
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+import hedging  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+# Metrics compared against the baseline, and whether a higher value is better
+METRICS = {"p50_ms": False, "p95_ms": False, "p99_ms": False, "alloc_kib_per_call": False}
+
+# tool -> keyword arguments of the i-th call against a dataset of `size` records
+CASES: Dict[str, Callable[[int, int], Dict]] = {
+    "create_profile_tool": lambda i, size: {"name": f"Bench User {i}", "email": f"bench{i}@example.com",
+                                            "title": "Engineer"},
+    "get_directory_tool": lambda i, size: {"email": datagen.employee_email(i % size)},
+    "schedule_meeting_tool": lambda i, size: {"subject": f"Sync {i}", "participants": ["a@example.com"],
+                                              "start_time": "2025-01-15T10:00:00"},
+    "get_healthcare_benefits": lambda i, size: {"plan": ["HDHP", "HDHP Plus", "PPO"][i % 3], "in_network": i % 2 == 0},
+    "search_healthcare_providers": lambda i, size: {"location": healthcare_service.CITIES[i % len(healthcare_service.CITIES)]},
+    "get_my_claims": lambda i, size: {},
+    "create_service_now_incident": lambda i, size: {"short_description": f"Benchmark incident {i}", "urgency": 2},
+    "get_my_service_now_incidents": lambda i, size: {},
+    "get_service_now_incident_by_number": lambda i, size: {"incident_number": f"INC{10001 + i % size:07d}"},
+    "get_my_service_now_incident_stats": lambda i, size: {"opened_within_days": [None, 30, 365][i % 3]},
+}
+
+
+def seed_datasets(size: int):
+    datagen.load_directory(datagen.directory(size))
+    datagen.load_healthcare(datagen.providers(size))
+    # All opened by the connection's user, so the get_my_* tools see every incident
+    datagen.load_servicenow(datagen.incidents(size, employees=size, user="admin", user_share=1.0))
+
+
+def percentile_ms(samples: List[float], q: float) -> float:
+    return round(float(np.percentile(samples, q)) * 1000, 3)
+
+
+def bench_tool(name: str, size: int, calls: int, concurrency: List[int], warmup: int = 5) -> Dict:
+    tool = resolve_tool(name)
+    case = CASES[name]
+    errors = []
+
+    def fn(**kwargs):
+        try:
+            result = tool(**kwargs)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+            return None
+        if is_error_result(result):
+            errors.append(result)
+        return result
+
+    for i in range(warmup):
+        fn(**case(i, size))
+    del errors[:]
+
+    latencies = []
+    for i in range(calls):
+        kwargs = case(i, size)
+        started = time.perf_counter()
+        fn(**kwargs)
+        latencies.append(time.perf_counter() - started)
+
+    throughput = {}
+    for workers in concurrency:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            started = time.perf_counter()
+            list(pool.map(lambda i: fn(**case(i, size)), range(calls)))
+            throughput[str(workers)] = round(calls / (time.perf_counter() - started), 1)
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(min(calls, 50)):
+            kwargs = case(i, size)
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn(**kwargs)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "tool": name,
+        "calls": calls,
+        "p50_ms": percentile_ms(latencies, 50),
+        "p95_ms": percentile_ms(latencies, 95),
+        "p99_ms": percentile_ms(latencies, 99),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "throughput_per_s": throughput,
+        "alloc_kib_per_call": round(statistics.median(peaks) / 1024, 2),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def median_result(runs: List[Dict]) -> Dict:
+    """Metric-wise median of repeated measurements of one tool; errors are added up."""
+    merged = dict(runs[0])
+    for metric in ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "alloc_kib_per_call"):
+        merged[metric] = round(statistics.median(run[metric] for run in runs), 3)
+    merged["throughput_per_s"] = {c: round(statistics.median(run["throughput_per_s"][c] for run in runs), 1)
+                                  for c in runs[0]["throughput_per_s"]}
+    merged["errors"] = sum(run["errors"] for run in runs)
+    merged["first_error"] = next((run["first_error"] for run in runs if run["first_error"]), None)
+    merged["repeats"] = len(runs)
+    return merged
+
+
+def result_key(result: Dict) -> str:
+    return f"{result['tool']}|latency_ms={result['latency_ms']}|size={result['size']}"
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float, min_delta_ms: float) -> List[Dict]:
+    """
+    Flag metrics that got worse than the baseline by more than `tolerance` (relative).
+
+    Latency changes smaller than `min_delta_ms` are ignored, so sub-millisecond
+    tools do not flap on scheduler noise. Throughput is compared per concurrency level,
+    with the same floor applied to the time per call (1000 / throughput) it implies.
+    """
+    previous = {result_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+        if result.get("errors", 0) > old.get("errors", 0):
+            regressions.append({"key": result_key(result), "metric": "errors", "baseline": old.get("errors", 0),
+                                "current": result["errors"], "change": 1.0})
+        checks = [(metric, old.get(metric), result[metric], higher_is_better)
+                  for metric, higher_is_better in METRICS.items()]
+        checks += [(f"throughput_per_s[{c}]", old.get("throughput_per_s", {}).get(c), value, True)
+                    for c, value in result["throughput_per_s"].items()]
+        for metric, before, after, higher_is_better in checks:
+            if not before:
+                continue
+            change = (before - after) / before if higher_is_better else (after - before) / before
+            if metric.endswith("_ms") and abs(after - before) < min_delta_ms:
+                continue
+            if metric.startswith("throughput") and (after <= 0 or abs(1000 / after - 1000 / before) < min_delta_ms):
+                continue
+            if change > tolerance:
+                regressions.append({"key": result_key(result), "metric": metric, "baseline": before,
+                                    "current": after, "change": round(change, 3)})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the tools against the local mock services")
+    parser.add_argument("--tools", nargs="+", default=list(CASES), choices=list(CASES))
+    parser.add_argument("--latency-ms", type=float, nargs="+", default=[0.0], help="Injected backend latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Standard deviation of the injected latency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100], help="Records seeded into each mock")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per measurement")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per tool; the report has their medians")
+    parser.add_argument("--cache", action="store_true", help="Leave tool result caching enabled")
+    parser.add_argument("--rate-limit", action="store_true", help="Leave client-side rate limiting enabled")
+    parser.add_argument("--hedge", action="store_true", help="Hedge slow requests to the endpoints that allow it")
+    parser.add_argument("--tail-ms", type=float, default=0.0, help="Extra latency of the slowest requests")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="Fraction of requests with --tail-ms extra")
+    parser.add_argument("--output", "-o", help="Write results as JSON to this file")
+    parser.add_argument("--compare", default=str(BASELINE_PATH), help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Write the results to {BASELINE_PATH.name}")
+    parser.add_argument("--tolerance", type=float, default=0.6,
+                        help="Allowed relative regression; timings drift by up to ~50%% between runs on a shared VM")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="Ignore smaller changes of latency and of time per call at each concurrency")
+    args = parser.parse_args(argv)
+
+    if not args.cache:
+        os.environ["TOOL_CACHE_DISABLED"] = "1"
+    if not args.rate_limit:
+        os.environ["TOOL_RATE_LIMIT"] = "off"
+    os.environ["TOOL_HEDGE"] = "1" if args.hedge else "0"
+
+    results = []
+    with MockServices():
+        for size in args.sizes:
+            for latency in args.latency_ms:
+                set_latency(latency, args.jitter_ms, tail_ms=args.tail_ms, tail_rate=args.tail_rate)
+                for name in args.tools:
+                    hedging.reset()
+                    runs = []
+                    for _ in range(max(1, args.repeat)):
+                        seed_datasets(size)  # so records created by one tool (or run) do not grow another's dataset
+                        runs.append(bench_tool(name, size, args.calls, args.concurrency))
+                    result = {**median_result(runs), "latency_ms": latency, "size": size}
+                    if args.hedge:
+                        result["hedging"] = hedging.stats()
+                    print(json.dumps(result), file=sys.stderr)
+                    results.append(result)
+        set_latency(0.0)
+
+    report = {"benchmark": "tools", "python": sys.version.split()[0], "results": results}
+    baseline_path = Path(args.compare)
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps(report, indent=2) + "\n")
+    elif baseline_path.exists():
+        report["regressions"] = compare(results, json.loads(baseline_path.read_text()), args.tolerance,
+                                        args.min_delta_ms)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    for regression in report.get("regressions", []):
+        print(f"REGRESSION {regression['key']} {regression['metric']}: {regression['baseline']} -> "
+              f"{regression['current']} ({regression['change']:+.0%})", file=sys.stderr)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
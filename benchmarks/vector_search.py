@@ -0,0 +1,116 @@
+"""
+Query latency and recall of the quantized vector store.
+
+    python -m benchmarks.vector_search --sizes 10000 100000 1000000 --output vector_search.json
+
+Vectors are synthetic (seeded, clustered around random centroids so neighbours
+are meaningful) and generated block by block, so the exact float32 baseline can
+be computed without holding the whole matrix in memory. Recall@k is measured
+against that exact baseline.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from runtime.vector_store import BLOCK_ROWS, VectorStore, normalize
+
+
+def synthetic_block(seed: int, block: int, rows: int, dim: int, centroids: np.ndarray) -> np.ndarray:
+    rng = np.random.default_rng([seed, block])
+    assignment = rng.integers(0, centroids.shape[0], rows)
+    return normalize(centroids[assignment] + 0.6 * rng.standard_normal((rows, dim), dtype=np.float32))
+
+
+def blocks(size: int, dim: int, seed: int, centroids: np.ndarray):
+    for block, start in enumerate(range(0, size, BLOCK_ROWS)):
+        yield synthetic_block(seed, block, min(BLOCK_ROWS, size - start), dim, centroids)
+
+
+def exact_top_k(queries: np.ndarray, size: int, dim: int, seed: int, centroids: np.ndarray, top_k: int) -> np.ndarray:
+    best_ids = np.empty((queries.shape[0], 0), dtype=np.int64)
+    best_scores = np.empty((queries.shape[0], 0), dtype=np.float32)
+    for block, vectors in enumerate(blocks(size, dim, seed, centroids)):
+        scores = queries @ vectors.T
+        best_ids = np.concatenate([best_ids, np.argsort(-scores, axis=1)[:, :top_k] + block * BLOCK_ROWS], axis=1)
+        best_scores = np.concatenate([best_scores, -np.sort(-scores, axis=1)[:, :top_k]], axis=1)
+        keep = np.argsort(-best_scores, axis=1)[:, :top_k]
+        best_ids = np.take_along_axis(best_ids, keep, axis=1)
+        best_scores = np.take_along_axis(best_scores, keep, axis=1)
+    return best_ids
+
+
+def percentile_ms(samples, q):
+    return round(float(np.percentile(samples, q)) * 1000, 3)
+
+
+def bench_size(size: int, dim: int, dtype: str, queries: int, batch: int, top_k: int, seed: int, workdir: Path):
+    centroids = normalize(np.random.default_rng(seed).standard_normal((256, dim), dtype=np.float32))
+    started = time.perf_counter()
+    store = VectorStore.write(workdir / f"{dtype}-{size}", blocks(size, dim, seed, centroids), size, dim, dtype)
+    build_seconds = time.perf_counter() - started
+
+    rng = np.random.default_rng(seed + 1)
+    query_vectors = normalize(centroids[rng.integers(0, 256, queries)] +
+                              0.6 * rng.standard_normal((queries, dim), dtype=np.float32))
+    truth = exact_top_k(query_vectors, size, dim, seed, centroids, top_k)
+
+    latencies, found = [], []
+    store.search(query_vectors[:1], top_k)  # warm the page cache
+    for start in range(0, queries, batch):
+        chunk = query_vectors[start:start + batch]
+        began = time.perf_counter()
+        ids, _ = store.search(chunk, top_k)
+        latencies.append((time.perf_counter() - began) / len(chunk))
+        found.append(ids)
+    found = np.concatenate(found)
+    recall = np.mean([len(set(found[i]) & set(truth[i])) / top_k for i in range(queries)])
+
+    return {
+        "size": size,
+        "dim": dim,
+        "dtype": dtype,
+        "batch": batch,
+        "top_k": top_k,
+        "index_mb": round(store.vectors.nbytes / 2 ** 20, 1),
+        "build_seconds": round(build_seconds, 3),
+        "query_ms_p50": percentile_ms(latencies, 50),
+        "query_ms_p95": percentile_ms(latencies, 95),
+        "recall_at_k": round(float(recall), 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark vector store latency and recall")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--dtypes", nargs="+", default=["int8", "float16"], choices=["int8", "float16"])
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--batch", type=int, default=16, help="Queries per matrix multiply")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", "-o", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            for dtype in args.dtypes:
+                result = bench_size(size, args.dim, dtype, args.queries, args.batch, args.top_k, args.seed, Path(tmp))
+                print(json.dumps(result), file=sys.stderr)
+                results.append(result)
+
+    report = json.dumps({"benchmark": "vector_search", "results": results}, indent=2)
+    if args.output:
+        Path(args.output).write_text(report)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
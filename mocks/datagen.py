@@ -0,0 +1,452 @@
+"""
+Deterministic synthetic datasets for the mock services, at any scale.
+
+    python -m mocks.datagen --employees 1000000 --out data/ --format jsonl.gz
+    python -m mocks.datagen --employees 10000 --only directory claims --format csv --out data/
+
+    load_directory(directory(10_000))
+    load_servicenow(incidents(1_000_000, employees=10_000, user="admin", user_share=0.01))
+
+Every field of a record is computed from a hash of (seed, kind, index), so
+record i is the same whatever else is generated, records are produced as a
+stream in constant memory, and references can be followed without holding the
+records they point to:
+
+- `employees`: names, titles and departments in a manager tree; employee 0
+  leads, every manager has up to FANOUT direct reports, and departments follow
+  the first level below the lead
+- `directory`: the directory service's entries (email, department, manager email)
+- `meetings`: organized by an employee with their manager, peers or reports, on a
+  30-minute grid in working hours over WORK_DAYS weekdays, so the calendars of
+  people in the same team overlap as they do in practice
+- `incidents`: ServiceNow Table API rows opened by employees (a `user_share`
+  of them by `user`, the connection's user, so the `get_my_*` tools see them)
+- `providers`: the healthcare service's provider directory
+- `claims`: claims of employees with services at generated providers, in the
+  shape `get_my_claims` returns; generate-only for now, as no mock serves them
+
+`write` streams records to JSONL or CSV (nested values JSON-encoded), gzipped
+when the path ends in `.gz`, `read` streams them back, and the `load_*` functions bulk load records into
+the in-process mocks, replacing their data.
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from mocks import directory_service, healthcare_service, hr_service, servicenow_service
+
+FANOUT = 7
+WORK_DAYS = 60
+FIRST_DAY = date(2025, 1, 6)  # a Monday
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "Finance", "HR", "Operations", "Legal"]
+LEVEL_TITLES = ["Chief Executive Officer", "Vice President", "Director", "Senior Manager", "Manager"]
+TITLES = {
+    "Engineering": ["Software Engineer", "Senior Software Engineer", "Site Reliability Engineer", "QA Engineer"],
+    "Sales": ["Account Executive", "Sales Development Representative", "Solutions Consultant"],
+    "Marketing": ["Marketing Specialist", "Content Strategist", "Product Marketing Manager"],
+    "Finance": ["Financial Analyst", "Accountant", "Payroll Specialist"],
+    "HR": ["HR Generalist", "Recruiter", "Benefits Specialist"],
+    "Operations": ["Operations Analyst", "Facilities Coordinator", "IT Support Specialist"],
+    "Legal": ["Paralegal", "Counsel", "Compliance Analyst"],
+}
+FIRST_NAMES = ["Alice", "Bob", "Carmen", "Deepak", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jamal", "Kara",
+               "Liam", "Mei", "Noah", "Olga", "Priya", "Quinn", "Rafael", "Sofia", "Tariq", "Uma", "Victor",
+               "Wen", "Ximena", "Yusuf", "Zoe"]
+LAST_NAMES = ["Adams", "Brown", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Haddad", "Ito", "Johnson", "Kim",
+              "Lopez", "Muller", "Nguyen", "Okafor", "Patel", "Rossi", "Silva", "Tanaka", "Williams"]
+_FIRST_LOWER = [name.lower() for name in FIRST_NAMES]
+_LAST_LOWER = [name.lower() for name in LAST_NAMES]
+SUBJECTS = ["1:1", "Team sync", "Planning", "Design review", "Retrospective", "Customer call", "Interview",
+            "Onboarding check-in", "Budget review", "All hands prep"]
+DURATIONS = [15, 30, 30, 30, 45, 60, 60, 90]
+INCIDENT_SUBJECTS = ["Cannot add dependent to plan", "Benefits document missing", "Claim status not updating",
+                     "Password reset", "Laptop not booting", "VPN disconnects", "Payroll discrepancy",
+                     "Access request for shared drive"]
+# (description, lowest amount, highest amount)
+SERVICES = [("General Consultation", 80, 200), ("Blood Test", 30, 120), ("X-ray Imaging", 150, 500),
+            ("MRI Scan", 400, 2500), ("Physical Therapy Session", 60, 180), ("Vaccination", 20, 90),
+            ("Specialist Consultation", 150, 400), ("Emergency Room Visit", 500, 3000)]
+REJECTION_REASONS = ["Service not covered by policy", "Out-of-network provider", "Missing documentation",
+                     "Duplicate claim"]
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+# Stream of each kind of record, mixed into the hash so the kinds are independent
+_EMPLOYEE, _MEETING, _INCIDENT, _PROVIDER, _CLAIM = range(1, 6)
+
+
+def _mix(x: int) -> int:
+    """splitmix64 finalizer: a bijection of 64-bit integers with well-spread output bits."""
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+class _Draws:
+    """Independent pseudo-random numbers for record `index` of `kind`, the same on every run."""
+
+    __slots__ = ("state",)
+
+    def __init__(self, seed: int, kind: int, index: int):
+        self.state = (seed * 0xD1B54A32D192ED03 + kind * 0xABC98388FB8FAC03 + index * _GOLDEN) & _MASK
+
+    def bits(self) -> int:
+        self.state = (self.state + _GOLDEN) & _MASK
+        return _mix(self.state)
+
+    def below(self, n: int) -> int:
+        return self.bits() % n
+
+    def pick(self, options):
+        return options[self.bits() % len(options)]
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.bits() << 64 | self.bits(), version=4)
+
+
+def manager_of(index: int) -> Optional[int]:
+    return None if index == 0 else (index - 1) // FANOUT
+
+
+def reports_of(index: int, count: int) -> range:
+    return range(min(count, index * FANOUT + 1), min(count, index * FANOUT + FANOUT + 1))
+
+
+def _level(index: int) -> int:
+    level = 0
+    while index:
+        index = (index - 1) // FANOUT
+        level += 1
+    return level
+
+
+def _department(index: int) -> str:
+    if index == 0:
+        return "Executive"
+    while index > FANOUT:
+        index = (index - 1) // FANOUT
+    return DEPARTMENTS[(index - 1) % len(DEPARTMENTS)]
+
+
+def _name(draws: _Draws) -> str:
+    return f"{draws.pick(FIRST_NAMES)} {draws.pick(LAST_NAMES)}"
+
+
+def employee_email(index: int, seed: int = 0) -> str:
+    """Email of employee `index`; the index keeps it unique among employees with the same name."""
+    # The same draws as _name, without building the name
+    draws = _Draws(seed, _EMPLOYEE, index)
+    return f"{draws.pick(_FIRST_LOWER)}.{draws.pick(_LAST_LOWER)}{index}@example.com"
+
+
+def employee(index: int, count: int, seed: int = 0) -> Dict[str, Any]:
+    """Employee `index` of an organization of `count` employees."""
+    draws = _Draws(seed, _EMPLOYEE, index)
+    name = _name(draws)
+    department = _department(index)
+    if index == 0:
+        title = LEVEL_TITLES[0]
+    elif reports_of(index, count):
+        title = LEVEL_TITLES[min(_level(index), len(LEVEL_TITLES) - 1)]
+    else:
+        title = draws.pick(TITLES[department])
+    manager = manager_of(index)
+    return {
+        "employee_id": str(draws.uuid()),
+        "name": name,
+        "email": employee_email(index, seed),
+        "title": title,
+        "department": department,
+        "manager": None if manager is None else employee_email(manager, seed),
+        "hired_on": (FIRST_DAY - timedelta(days=draws.below(3650))).isoformat(),
+    }
+
+
+def employees(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    for index in range(count):
+        yield employee(index, count, seed)
+
+
+def directory(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Directory entries of `count` employees; the lead is their own manager."""
+    for index in range(count):
+        manager = manager_of(index)
+        yield {"email": employee_email(index, seed), "department": _department(index),
+               "manager": employee_email(index if manager is None else manager, seed)}
+
+
+def _work_day(offset: int) -> date:
+    return FIRST_DAY + timedelta(days=offset // 5 * 7 + offset % 5)
+
+
+def meetings(count: int, employees: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Meetings of an organizer with one to four people from their manager, peers and direct reports."""
+    for index in range(count):
+        draws = _Draws(seed, _MEETING, index)
+        organizer = draws.below(employees)
+        boss = manager_of(organizer)
+        team = [] if boss is None else [boss] + [peer for peer in reports_of(boss, employees) if peer != organizer]
+        team.extend(reports_of(organizer, employees))
+        invited = [team.pop(draws.below(len(team))) for _ in range(min(len(team), 1 + draws.below(4)))]
+        day = _work_day(draws.below(WORK_DAYS))
+        start = datetime(day.year, day.month, day.day, 9) + timedelta(minutes=30 * draws.below(16))
+        yield {
+            "meeting_id": str(draws.uuid()),
+            "subject": draws.pick(SUBJECTS),
+            "participants": [employee_email(member, seed) for member in [organizer] + invited],
+            "start_time": start.isoformat(),
+            "duration_minutes": draws.pick(DURATIONS),
+            "created_at": (start - timedelta(days=1 + draws.below(14))).isoformat(),
+        }
+
+
+def incidents(count: int, employees: int, seed: int = 0, user: Optional[str] = None,
+              user_share: float = 0.0) -> Iterator[Dict[str, Any]]:
+    """
+    ServiceNow incidents opened over 2025 by employees.
+
+    Args:
+        user: ServiceNow user who opened a `user_share` fraction of them, e.g. the connection's user
+    """
+    start = datetime(2025, 1, 1)
+    for index in range(count):
+        draws = _Draws(seed, _INCIDENT, index)
+        opener = draws.below(employees)
+        if user and draws.bits() < user_share * (1 << 64):
+            created_by = user
+        else:
+            created_by = employee_email(opener, seed).split("@")[0]
+        yield {
+            "sys_id": draws.uuid().hex,
+            "number": f"INC{10001 + index:07d}",
+            "short_description": draws.pick(INCIDENT_SUBJECTS),
+            "description": "Generated incident",
+            "state": draws.pick(servicenow_service.STATES),
+            "urgency": str(1 + draws.below(3)),
+            "opened_at": (start + timedelta(minutes=draws.below(365 * 24 * 60))).strftime("%Y-%m-%d %H:%M:%S"),
+            "sys_created_by": created_by,
+        }
+
+
+def provider(index: int, seed: int = 0) -> Dict[str, Any]:
+    draws = _Draws(seed, _PROVIDER, index)
+    cities = healthcare_service.CITIES
+    return {
+        "provider_id": f"PRV{index:06d}",
+        "name": f"{draws.pick(['North', 'South', 'City', 'Valley', 'Lakeside'])} Health {index}",
+        "provider_type": draws.pick(healthcare_service.PROVIDER_TYPES),
+        # Every city gets every specialty before any repeats
+        "specialty": healthcare_service.SPECIALTIES[(index // len(cities)) % len(healthcare_service.SPECIALTIES)],
+        "address": f"{100 + draws.below(9900)} Main St, {cities[index % len(cities)]}",
+        "contact": {"phone": f"555-{index % 10000:04d}", "email": f"provider{index}@example.com"},
+    }
+
+
+def providers(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    for index in range(count):
+        yield provider(index, seed)
+
+
+def claims(count: int, employees: int, providers: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """Claims of employees for one to three services at a provider; 70% processed, 20% pending, 10% rejected."""
+    for index in range(count):
+        draws = _Draws(seed, _CLAIM, index)
+        member = employee_email(draws.below(employees), seed)
+        at = provider(draws.below(providers), seed)
+        submitted = date(2025, 1, 1) + timedelta(days=draws.below(365))
+        services = []
+        for _ in range(1 + draws.below(3)):
+            number = draws.below(len(SERVICES))
+            description, low, high = SERVICES[number]
+            services.append({"serviceId": f"SVC{number + 1:03d}", "description": description,
+                             "dateOfService": (submitted - timedelta(days=draws.below(10))).isoformat(),
+                             "amount": float(low + draws.below(high - low + 1))})
+        claimed = sum(service["amount"] for service in services)
+        outcome = draws.below(10)
+        status = "Processed" if outcome < 7 else "Pending" if outcome < 9 else "Rejected"
+        claim = {
+            "claimId": f"CLM{index:07d}",
+            "memberEmail": member,
+            "submittedDate": submitted.isoformat(),
+            "claimStatus": status,
+            "processedDate": None if status == "Pending" else
+            (submitted + timedelta(days=1 + draws.below(30))).isoformat(),
+            "amountClaimed": claimed,
+            "amountApproved": {"Processed": round(claimed * 0.8, 2), "Pending": None, "Rejected": 0.0}[status],
+            "provider": {"name": at["name"], "providerId": at["provider_id"], "providerType": at["provider_type"]},
+            "services": services,
+        }
+        if status == "Rejected":
+            claim["rejectionReason"] = draws.pick(REJECTION_REASONS)
+        yield claim
+
+
+def sizes(employees: int) -> Dict[str, int]:
+    """Record counts of a dataset for an organization of `employees`."""
+    return {"employees": employees, "directory": employees, "meetings": 2 * employees, "incidents": employees,
+            "providers": max(60, employees // 100), "claims": 2 * employees}
+
+
+def generate(kind: str, counts: Dict[str, int], seed: int = 0, user: Optional[str] = None,
+             user_share: float = 0.0) -> Iterator[Dict[str, Any]]:
+    """The records of one kind of a dataset with the given `sizes`."""
+    people = counts["employees"]
+    generators: Dict[str, Callable[[], Iterator[Dict[str, Any]]]] = {
+        "employees": lambda: employees(people, seed),
+        "directory": lambda: directory(counts["directory"], seed),
+        "meetings": lambda: meetings(counts["meetings"], people, seed),
+        "incidents": lambda: incidents(counts["incidents"], people, seed, user, user_share),
+        "providers": lambda: providers(counts["providers"], seed),
+        "claims": lambda: claims(counts["claims"], people, counts["providers"], seed),
+    }
+    return generators[kind]()
+
+
+KINDS = list(sizes(1))
+
+
+def _open(path: Path, mode: str):
+    if path.suffix == ".gz":
+        return io.TextIOWrapper(gzip.open(path, mode + "b", compresslevel=6), encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def _format(path: Path, fmt: Optional[str]) -> str:
+    fmt = fmt or Path(path.stem if path.suffix == ".gz" else path.name).suffix.lstrip(".")
+    if fmt not in ("jsonl", "csv"):
+        raise ValueError(f"Unsupported format {fmt!r}; use jsonl or csv")
+    return fmt
+
+
+def write(records: Iterable[Dict[str, Any]], path, fmt: Optional[str] = None) -> int:
+    """
+    Stream records to a JSONL or CSV file, gzip-compressed if the path ends in `.gz`.
+
+    Args:
+        fmt: `jsonl` or `csv`; by default from the suffix before any `.gz`
+
+    Returns:
+        int: Number of records written
+    """
+    path = Path(path)
+    fmt = _format(path, fmt)
+    written = 0
+    with _open(path, "w") as f:
+        if fmt == "jsonl":
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                written += 1
+            return written
+        writer = None
+        for record in records:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(record), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow({key: json.dumps(value) if isinstance(value, (dict, list)) else value
+                             for key, value in record.items()})
+            written += 1
+    return written
+
+
+def read(path, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of a JSONL or CSV file written by `write` (optionally gzipped).
+
+    CSV cells holding JSON objects or arrays are decoded back to nested values; other
+    cells come back as strings, since CSV does not keep their types.
+
+    Args:
+        fmt: `jsonl` or `csv`; by default from the suffix before any `.gz`
+    """
+    path = Path(path)
+    fmt = _format(path, fmt)
+    with _open(path, "r") as f:
+        if fmt == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        for row in csv.DictReader(f):
+            yield {key: json.loads(value) if value[:1] in ("[", "{") else value for key, value in row.items()}
+
+
+def load_hr(employee_records: Iterable[Dict[str, Any]] = (), meeting_records: Iterable[Dict[str, Any]] = (),
+            clear: bool = True) -> Dict[str, int]:
+    """Load employees and meetings into the HR mock, keyed by their ids."""
+    if clear:
+        hr_service.db.clear()
+        hr_service.meetings_db.clear()
+    for record in employee_records:
+        hr_service.db[record["employee_id"]] = {"name": record["name"], "email": record["email"],
+                                                "title": record["title"]}
+    for record in meeting_records:
+        hr_service.meetings_db[record["meeting_id"]] = dict(record)
+    return {"employees": len(hr_service.db), "meetings": len(hr_service.meetings_db)}
+
+
+def load_directory(entries: Iterable[Dict[str, Any]], clear: bool = True) -> int:
+    if clear:
+        directory_service.dir_db.clear()
+    for entry in entries:
+        directory_service.dir_db[entry["email"]] = {"email": entry["email"], "department": entry["department"],
+                                                    "manager": entry["manager"]}
+    return len(directory_service.dir_db)
+
+
+def load_healthcare(provider_records: Iterable[Dict[str, Any]], clear: bool = True) -> int:
+    if clear:
+        healthcare_service.providers_db.clear()
+    healthcare_service.providers_db.extend(provider_records)
+    return len(healthcare_service.providers_db)
+
+
+def load_servicenow(incident_records: Iterable[Dict[str, Any]], clear: bool = True) -> int:
+    return servicenow_service.load(incident_records, clear=clear)
+
+
+def load_all(counts: Dict[str, int], seed: int = 0, user: Optional[str] = "admin",
+             user_share: float = 0.01) -> Dict[str, int]:
+    """Generate a dataset with the given `sizes` straight into the mocks (claims have no mock; see `write`)."""
+    loaded = load_hr(generate("employees", counts, seed), generate("meetings", counts, seed))
+    loaded["directory"] = load_directory(generate("directory", counts, seed))
+    loaded["providers"] = load_healthcare(generate("providers", counts, seed))
+    loaded["incidents"] = load_servicenow(generate("incidents", counts, seed, user, user_share))
+    return loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic datasets for the mocks")
+    parser.add_argument("--employees", type=int, default=1000, help="Organization size; other kinds scale with it")
+    parser.add_argument("--count", action="append", default=[], metavar="KIND=N", help="Override a kind's count")
+    parser.add_argument("--only", nargs="+", choices=KINDS, help="Kinds to generate (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--user", default="admin", help="ServiceNow user who opened --user-share of the incidents")
+    parser.add_argument("--user-share", type=float, default=0.01)
+    parser.add_argument("--format", default="jsonl", choices=["jsonl", "jsonl.gz", "csv", "csv.gz"])
+    parser.add_argument("--out", default="data", help="Directory to write <kind>.<format> files to")
+    args = parser.parse_args(argv)
+
+    counts = sizes(args.employees)
+    for pair in args.count:
+        kind, _, value = pair.partition("=")
+        if kind not in counts:
+            parser.error(f"Unknown kind {kind!r}; choose from {', '.join(KINDS)}")
+        counts[kind] = int(value)
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    for kind in args.only or KINDS:
+        path = out / f"{kind}.{args.format}"
+        written = write(generate(kind, counts, args.seed, args.user, args.user_share), path)
+        print(json.dumps({"kind": kind, "records": written, "path": str(path)}), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,12 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
-app = FastAPI()
+from mocks.middleware import LatencyMiddleware, MetricsMiddleware, TimedJSONResponse
+
+app = FastAPI(default_response_class=TimedJSONResponse)
+app.add_middleware(LatencyMiddleware)
+app.add_middleware(MetricsMiddleware, service="directory",
+                   stores={"directory_entries": lambda: len(dir_db)})
 
 class DirectoryEntry(BaseModel):
     email: str
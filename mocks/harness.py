@@ -0,0 +1,152 @@
+"""
+Run the mock services in-process on ephemeral ports.
+
+    with MockServices() as mocks:
+        requests.get(f"{mocks.url('hr')}/meetings")
+
+Each mock is served by uvicorn on a background thread, on a socket bound to
+port 0 so parallel test runs never collide. `start()` returns only once the
+service answers HTTP requests, and the tools are pointed at the mocks through
+environment variables (`*_SERVICE_URL`, `HEALTHCARE_*_URL` and the
+`WXO_*` variables of the `service-now` connection).
+"""
+import importlib
+import os
+import socket
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import requests
+import uvicorn
+
+# name -> (ASGI app, environment the tools need to reach it; "{url}" is the mock's base URL)
+MOCKS = {
+    "hr": ("mocks.hr_service:app", {"HR_SERVICE_URL": "{url}"}),
+    "directory": ("mocks.directory_service:app", {"DIRECTORY_SERVICE_URL": "{url}"}),
+    "healthcare": ("mocks.healthcare_service:app", {
+        "HEALTHCARE_BENEFITS_URL": "{url}/benefits",
+        "HEALTHCARE_PROVIDERS_URL": "{url}/providers",
+    }),
+    # The ServiceNow tools read the `service-now` connection the way the Orchestrate runtime provides it
+    "servicenow": ("mocks.servicenow_service:app", {
+        "WXO_SECURITY_SCHEMA_service_now": "basic_auth",
+        "WXO_CONNECTION_service_now_url": "{url}",
+        "WXO_CONNECTION_service_now_username": "admin",
+        "WXO_CONNECTION_service_now_password": "admin",
+    }),
+}
+
+
+def _load_app(path: str):
+    module_name, attr = path.split(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class MockServer:
+    """One ASGI app served by uvicorn on a background thread."""
+
+    def __init__(self, app, host: str = "127.0.0.1", port: int = 0, ready_path: str = "/openapi.json",
+                 lifespan: str = "off"):
+        self.app = _load_app(app) if isinstance(app, str) else app
+        self.host = host
+        self.requested_port = port
+        self.ready_path = ready_path
+        self.lifespan = lifespan
+        self.port: Optional[int] = None
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 10.0) -> "MockServer":
+        # Binding here rather than in uvicorn means the port is known before the server starts
+        # IPPROTO_TCP must be explicit: asyncio only sets TCP_NODELAY on sockets created with it, and
+        # without it keep-alive requests stall ~40ms on delayed ACKs
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.requested_port))
+        self.port = sock.getsockname()[1]
+
+        config = uvicorn.Config(self.app, log_level="warning", access_log=False, lifespan=self.lifespan)
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, kwargs={"sockets": [sock]},
+                                        name=f"mock-{self.port}", daemon=True)
+        self._thread.start()
+        self.wait_ready(timeout)
+        return self
+
+    def wait_ready(self, timeout: float = 10.0):
+        """Poll the readiness path until it answers 200."""
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        while True:
+            if not self._thread.is_alive():
+                raise RuntimeError(f"Mock server on port {self.port} exited during startup")
+            try:
+                if requests.get(self.url + self.ready_path, timeout=1).status_code == 200:
+                    return
+            except requests.exceptions.ConnectionError:
+                pass
+            if time.monotonic() > deadline:
+                self.stop()
+                raise TimeoutError(f"Mock server on port {self.port} not ready after {timeout}s")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    def stop(self, timeout: float = 5.0):
+        if self._server is not None:
+            self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+class MockServices:
+    """
+    Start a set of mocks and point the tools at them for the duration of a `with` block.
+
+    Args:
+        names: Mocks to start, keys of MOCKS (default: all)
+        set_env: Export the environment variables that point the tools at each mock
+    """
+
+    def __init__(self, names: Optional[Iterable[str]] = None, set_env: bool = True):
+        self.names = list(names or MOCKS)
+        self.set_env = set_env
+        self.servers: Dict[str, MockServer] = {}
+        self._saved_env: Dict[str, Optional[str]] = {}
+
+    def url(self, name: str) -> str:
+        return self.servers[name].url
+
+    def start(self) -> "MockServices":
+        try:
+            for name in self.names:
+                app, env = MOCKS[name]
+                self.servers[name] = MockServer(app).start()
+                if self.set_env:
+                    for env_var, template in env.items():
+                        self._saved_env.setdefault(env_var, os.environ.get(env_var))
+                        os.environ[env_var] = template.format(url=self.servers[name].url)
+        except Exception:
+            self.stop()
+            raise
+        return self
+
+    def stop(self):
+        for server in self.servers.values():
+            server.stop()
+        for env_var, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(env_var, None)
+            else:
+                os.environ[env_var] = value
+        self._saved_env.clear()
+
+    def __enter__(self) -> "MockServices":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,72 @@
+from fastapi import FastAPI
+from typing import Optional
+import random
+
+from mocks.middleware import LatencyMiddleware, MetricsMiddleware, TimedJSONResponse
+
+app = FastAPI(default_response_class=TimedJSONResponse)
+app.add_middleware(LatencyMiddleware)
+app.add_middleware(MetricsMiddleware, service="healthcare",
+                   stores={"benefits": lambda: len(benefits_db), "providers": lambda: len(providers_db)})
+
+PLANS = ["HDHP", "HDHP Plus", "PPO"]
+SPECIALTIES = ["General Medicine", "Cardiology", "Pediatrics", "Orthopedics", "Ear, Nose and Throat", "Multi-specialty"]
+PROVIDER_TYPES = ["Hospital", "Clinic", "Individual Practitioner"]
+CITIES = ["Austin, TX", "Boston, MA", "Chicago, IL", "Denver, CO", "Raleigh, NC", "Seattle, WA"]
+
+benefits_db = [
+    {"Coverage": "Annual Deductible", "HDHP (In-Network)": "$3,000", "HDHP (Out-of-Network)": "$6,000",
+     "HDHP Plus (In-Network)": "$2,000", "HDHP Plus (Out-of-Network)": "$4,000",
+     "PPO (In-Network)": "$500", "PPO (Out-of-Network)": "$1,500"},
+    {"Coverage": "Out-of-Pocket Maximum", "HDHP (In-Network)": "$6,000", "HDHP (Out-of-Network)": "$12,000",
+     "HDHP Plus (In-Network)": "$5,000", "HDHP Plus (Out-of-Network)": "$10,000",
+     "PPO (In-Network)": "$3,000", "PPO (Out-of-Network)": "$6,000"},
+    {"Coverage": "Preventive Services", "HDHP (In-Network)": "0%", "HDHP (Out-of-Network)": "40%",
+     "HDHP Plus (In-Network)": "0%", "HDHP Plus (Out-of-Network)": "30%",
+     "PPO (In-Network)": "0%", "PPO (Out-of-Network)": "20%"},
+    {"Coverage": "Primary Care Visit", "HDHP (In-Network)": "20%", "HDHP (Out-of-Network)": "40%",
+     "HDHP Plus (In-Network)": "10%", "HDHP Plus (Out-of-Network)": "30%",
+     "PPO (In-Network)": "$25 copay", "PPO (Out-of-Network)": "20%"},
+    {"Coverage": "Specialist Visit", "HDHP (In-Network)": "20%", "HDHP (Out-of-Network)": "40%",
+     "HDHP Plus (In-Network)": "10%", "HDHP Plus (Out-of-Network)": "30%",
+     "PPO (In-Network)": "$50 copay", "PPO (Out-of-Network)": "20%"},
+    {"Coverage": "Emergency Room", "HDHP (In-Network)": "20%", "HDHP (Out-of-Network)": "20%",
+     "HDHP Plus (In-Network)": "10%", "HDHP Plus (Out-of-Network)": "10%",
+     "PPO (In-Network)": "$250 copay", "PPO (Out-of-Network)": "$250 copay"},
+]
+
+providers_db = []
+
+
+def seed(count: int = 60, seed: int = 0):
+    """Replace the provider directory with `count` deterministic providers."""
+    rng = random.Random(seed)
+    providers_db.clear()
+    for i in range(count):
+        city = CITIES[i % len(CITIES)]
+        providers_db.append({
+            "provider_id": f"PRV{i:06d}",
+            "name": f"{rng.choice(['North', 'South', 'City', 'Valley', 'Lakeside'])} Health {i}",
+            "provider_type": rng.choice(PROVIDER_TYPES),
+            "specialty": SPECIALTIES[(i // len(CITIES)) % len(SPECIALTIES)],
+            "address": f"{100 + i} Main St, {city}",
+            "contact": {"phone": f"555-{i % 10000:04d}", "email": f"provider{i}@example.com"},
+        })
+
+
+seed()
+
+
+@app.get("/benefits")
+def get_benefits(plan: Optional[str] = None, in_network: Optional[bool] = None):
+    plans = [plan] if plan in PLANS else PLANS
+    networks = {True: ["In-Network"], False: ["Out-of-Network"]}.get(in_network, ["In-Network", "Out-of-Network"])
+    columns = [f"{p} ({n})" for p in plans for n in networks]
+    return {"benefits": [{"Coverage": row["Coverage"], **{c: row[c] for c in columns}} for row in benefits_db]}
+
+
+@app.get("/providers")
+def search_providers(location: str = "", speciality: Optional[str] = None):
+    location = location.lower()
+    return {"providers": [p for p in providers_db
+                          if location in p["address"].lower() and (not speciality or p["specialty"] == speciality)]}
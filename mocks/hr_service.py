@@ -4,7 +4,12 @@ from typing import List
 import uuid
 from datetime import datetime
 
-app = FastAPI()
+from mocks.middleware import LatencyMiddleware, MetricsMiddleware, TimedJSONResponse
+
+app = FastAPI(default_response_class=TimedJSONResponse)
+app.add_middleware(LatencyMiddleware)
+app.add_middleware(MetricsMiddleware, service="hr",
+                   stores={"employees": lambda: len(db), "meetings": lambda: len(meetings_db)})
 
 class Employee(BaseModel):
     name: str
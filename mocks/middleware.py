@@ -0,0 +1,218 @@
+"""
+ASGI middleware shared by the mock services.
+
+`LatencyMiddleware` delays every response by a configurable amount so tools can
+be exercised against realistic backend latency. Latency is read from
+MOCK_LATENCY_MS / MOCK_LATENCY_JITTER_MS at import time and can be changed at
+runtime with `set_latency` (the benchmarks run the mocks in-process). A
+fraction of requests (MOCK_LATENCY_TAIL_RATE) can take MOCK_LATENCY_TAIL_MS
+longer, to reproduce a long latency tail.
+
+`MetricsMiddleware` times every request by route and serves the numbers on
+`/metrics` in the Prometheus text format, with the requests in flight, the
+size of each of the mock's stores and, for apps whose default response class
+is `TimedJSONResponse`, the time spent serializing JSON responses.
+"""
+import asyncio
+import bisect
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+
+
+class _Latency:
+    def __init__(self):
+        self.mean_ms = float(os.environ.get("MOCK_LATENCY_MS", "0"))
+        self.jitter_ms = float(os.environ.get("MOCK_LATENCY_JITTER_MS", "0"))
+        self.tail_ms = float(os.environ.get("MOCK_LATENCY_TAIL_MS", "0"))
+        self.tail_rate = float(os.environ.get("MOCK_LATENCY_TAIL_RATE", "0"))
+        self.random = random.Random(0)
+
+    def sample(self) -> float:
+        delay_ms = self.mean_ms
+        if self.jitter_ms:
+            delay_ms = max(0.0, self.random.gauss(self.mean_ms, self.jitter_ms))
+        if self.tail_rate and self.random.random() < self.tail_rate:
+            delay_ms += self.tail_ms
+        return delay_ms / 1000
+
+
+latency = _Latency()
+
+
+def set_latency(mean_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0, tail_ms: float = 0.0,
+                tail_rate: float = 0.0):
+    """
+    Delay each response by `mean_ms` (normally distributed with `jitter_ms` standard deviation),
+    and a `tail_rate` fraction of them by another `tail_ms`.
+    """
+    latency.mean_ms = mean_ms
+    latency.jitter_ms = jitter_ms
+    latency.tail_ms = tail_ms
+    latency.tail_rate = tail_rate
+    latency.random = random.Random(seed)
+
+
+class LatencyMiddleware:
+    """Sleeps before passing HTTP requests on; the event loop keeps serving other requests meanwhile."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            delay = latency.sample()
+            if delay:
+                await asyncio.sleep(delay)
+        await self.app(scope, receive, send)
+
+
+# Upper bounds of the latency buckets, in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Histogram:
+    """Prometheus histogram with one series per label set."""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series: Dict[Tuple[Tuple[str, str], ...], List] = {}
+
+    def observe(self, labels: Tuple[Tuple[str, str], ...], seconds: float):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, seconds)] += 1
+        series[1] += seconds
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {total!r}")
+            lines.append(f"{self.name}_count{_labels(labels)} {count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels) + "}"
+
+
+class Metrics:
+    """The metrics of one mock service."""
+
+    def __init__(self, service: str, stores: Optional[Dict[str, Callable[[], int]]] = None):
+        self.service = service
+        self.stores = stores or {}
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = _Histogram("mock_http_request_duration_seconds",
+                                   "Time from receiving a request to sending the last byte of its response")
+        self.render = _Histogram("mock_http_response_render_seconds", "Time spent serializing JSON response bodies")
+
+    def render_text(self) -> str:
+        service = (("service", self.service),)
+        with self.lock:
+            lines = self.requests.render() + self.render.render()
+            lines += ["# HELP mock_http_requests_in_flight Requests being handled",
+                      "# TYPE mock_http_requests_in_flight gauge",
+                      f"mock_http_requests_in_flight{_labels(service)} {self.in_flight}"]
+        lines += ["# HELP mock_store_size Records held in each in-memory store", "# TYPE mock_store_size gauge"]
+        lines += [f"mock_store_size{_labels(service + (('store', store),))} {size()}"
+                  for store, size in sorted(self.stores.items())]
+        return "\n".join(lines) + "\n"
+
+
+# service name -> metrics, for tests and the benchmarks running the mocks in-process
+registry: Dict[str, Metrics] = {}
+
+# Seconds spent rendering the current request's response, accumulated by TimedJSONResponse
+_render_seconds: ContextVar[Optional[List[float]]] = ContextVar("render_seconds", default=None)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that reports its serialization time to MetricsMiddleware."""
+
+    def render(self, content) -> bytes:
+        started = time.perf_counter()
+        body = super().render(content)
+        elapsed = _render_seconds.get()
+        if elapsed is not None:
+            elapsed[0] += time.perf_counter() - started
+        return body
+
+
+class MetricsMiddleware:
+    """
+    Times requests by route and answers `GET /metrics`.
+
+    Add it last so it wraps the other middleware (including the injected latency)
+    and `/metrics` is served without delay.
+
+    Args:
+        service: Value of the `service` label
+        stores: Store name -> callable returning its current size
+    """
+
+    def __init__(self, app, service: str, stores: Optional[Dict[str, Callable[[], int]]] = None):
+        self.app = app
+        # Starlette may build the middleware stack more than once; keep the numbers collected so far
+        if service not in registry:
+            registry[service] = Metrics(service, stores)
+        self.metrics = registry[service]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] == "/metrics" and scope["method"] == "GET":
+            body = self.metrics.render_text().encode("utf-8")
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": [(b"content-type", b"text/plain; version=0.0.4; charset=utf-8"),
+                                    (b"content-length", str(len(body)).encode())]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        metrics = self.metrics
+        status = [500]
+        render = [0.0]
+        token = _render_seconds.set(render)
+        started = time.perf_counter()
+
+        async def send_timed(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        with metrics.lock:
+            metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            elapsed = time.perf_counter() - started
+            _render_seconds.reset(token)
+            # The route template, not the path, keeps one series per endpoint
+            route = getattr(scope.get("route"), "path", "unmatched")
+            labels = (("service", metrics.service), ("method", scope["method"]), ("route", route),
+                      ("status", str(status[0])))
+            with metrics.lock:
+                metrics.in_flight -= 1
+                metrics.requests.observe(labels, elapsed)
+                if render[0]:
+                    metrics.render.observe(labels[:3], render[0])
@@ -0,0 +1,218 @@
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from pydantic import BaseModel
+from collections import Counter
+from typing import Iterable, Optional
+from datetime import datetime, timedelta
+import random
+import re
+import time
+import uuid
+
+from mocks.middleware import LatencyMiddleware, MetricsMiddleware, TimedJSONResponse
+
+app = FastAPI(default_response_class=TimedJSONResponse)
+# Compresses responses for clients sending `Accept-Encoding: gzip`, as ServiceNow instances do
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+app.add_middleware(LatencyMiddleware)
+app.add_middleware(MetricsMiddleware, service="servicenow",
+                   stores={"incidents": lambda: len(incidents_db)})
+security = HTTPBasic()
+
+STATES = ["1", "2", "3", "6", "7"]  # New, In Progress, On Hold, Resolved, Closed
+DISPLAY_VALUES = {
+    "state": {"1": "New", "2": "In Progress", "3": "On Hold", "6": "Resolved", "7": "Closed"},
+    "urgency": {"1": "1 - High", "2": "2 - Medium", "3": "3 - Low"},
+}
+REFERENCE_FIELDS = {"opened_by": "sys_user"}
+
+class IncidentCreate(BaseModel):
+    short_description: str
+    description: Optional[str] = None
+    urgency: int = 3
+
+incidents_db = {}
+numbers = {}
+users = {}  # sys_user sys_id -> user name, for the opened_by reference
+# Per-user request limit like the instance's rate limit rules; None means unlimited
+rate_limit = {"per_second": None, "retry_after": 1}
+_recent_requests = {}
+
+
+def _user_id(name: str) -> str:
+    sys_id = uuid.uuid5(uuid.NAMESPACE_URL, f"sys_user/{name}").hex
+    users[sys_id] = name
+    return sys_id
+
+
+def render_incident(row: dict, base_url: str, fields: Optional[str], display_value: str,
+                    exclude_reference_link: bool) -> dict:
+    """A stored incident as the Table API returns it for the given sysparm_* options."""
+    names = [f for f in fields.split(",") if f in row] if fields else list(row)
+    rendered = {}
+    for name in names:
+        value = row[name]
+        if name in REFERENCE_FIELDS:
+            shown = users.get(value, value)
+            link = f"{base_url}api/now/table/{REFERENCE_FIELDS[name]}/{value}"
+        else:
+            shown = DISPLAY_VALUES.get(name, {}).get(value, value)
+            link = None
+        if display_value == "all":
+            rendered[name] = {"display_value": shown, "value": value}
+            if link and not exclude_reference_link:
+                rendered[name]["link"] = link
+        else:
+            plain = shown if display_value == "true" else value
+            rendered[name] = plain if link is None or exclude_reference_link else \
+                {"link": link, ("display_value" if display_value == "true" else "value"): plain}
+    return rendered
+
+
+def _store(incident: dict):
+    incidents_db[incident["sys_id"]] = incident
+    numbers[incident["number"]] = incident["sys_id"]
+
+
+def _next_number() -> str:
+    return f"INC{10001 + len(incidents_db):07d}"
+
+
+def seed(count: int = 20, seed: int = 0, created_by: str = "admin"):
+    """Replace the incident table with `count` deterministic incidents opened over the past year."""
+    rng = random.Random(seed)
+    incidents_db.clear()
+    numbers.clear()
+    start = datetime(2025, 1, 1)
+    for _ in range(count):
+        opened = start + timedelta(minutes=rng.randrange(365 * 24 * 60))
+        _store({
+            "sys_id": uuid.UUID(int=rng.getrandbits(128)).hex,
+            "number": _next_number(),
+            "short_description": rng.choice(["Cannot add dependent to plan", "Benefits document missing",
+                                             "Claim status not updating", "Password reset"]),
+            "description": "Seeded incident",
+            "state": rng.choice(STATES),
+            "urgency": str(rng.randint(1, 3)),
+            "opened_at": opened.strftime("%Y-%m-%d %H:%M:%S"),
+            "sys_created_by": created_by,
+            "opened_by": _user_id(created_by),
+        })
+
+
+seed()
+
+
+def load(rows: Iterable[dict], clear: bool = True) -> int:
+    """Store Table API incident rows, e.g. from `mocks.datagen`; `opened_by` is set from `sys_created_by`."""
+    if clear:
+        incidents_db.clear()
+        numbers.clear()
+    for row in rows:
+        _store({**row, "opened_by": _user_id(row["sys_created_by"])})
+    return len(incidents_db)
+
+
+def set_rate_limit(per_second: Optional[int] = None, retry_after: int = 1):
+    """Answer 429 with `Retry-After` once a user exceeds `per_second` requests within a second."""
+    rate_limit.update(per_second=per_second, retry_after=retry_after)
+    _recent_requests.clear()
+
+
+def current_user(credentials: HTTPBasicCredentials = Depends(security)) -> str:
+    if not credentials.username or not credentials.password:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if rate_limit["per_second"] is not None:
+        now = time.monotonic()
+        recent = [t for t in _recent_requests.get(credentials.username, []) if now - t < 1]
+        if len(recent) >= rate_limit["per_second"]:
+            raise HTTPException(status_code=429, detail="Rate limit exceeded",
+                                headers={"Retry-After": str(rate_limit["retry_after"])})
+        _recent_requests[credentials.username] = recent + [now]
+    return credentials.username
+
+
+@app.post("/api/now/table/incident")
+def create_incident(incident: IncidentCreate, user: str = Depends(current_user)):
+    record = {
+        "sys_id": uuid.uuid4().hex,
+        "number": _next_number(),
+        "short_description": incident.short_description,
+        "description": incident.description or "",
+        "state": "1",
+        "urgency": str(incident.urgency),
+        "opened_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "sys_created_by": user,
+        "opened_by": _user_id(user),
+    }
+    _store(record)
+    return {"result": record}
+
+
+@app.get("/api/now/table/incident/{sys_id}")
+def get_incident(request: Request, sys_id: str, sysparm_fields: Optional[str] = None,
+                 sysparm_display_value: str = "false", sysparm_exclude_reference_link: bool = False,
+                 user: str = Depends(current_user)):
+    if sys_id not in incidents_db:
+        raise HTTPException(status_code=404, detail="Record not found")
+    return {"result": render_incident(incidents_db[sys_id], str(request.base_url), sysparm_fields,
+                                      sysparm_display_value, sysparm_exclude_reference_link)}
+
+
+@app.get("/api/now/table/incident")
+def list_incidents(request: Request, number: Optional[str] = None, sys_created_by: Optional[str] = None,
+                   sysparm_limit: Optional[int] = None, sysparm_fields: Optional[str] = None,
+                   sysparm_display_value: str = "false", sysparm_exclude_reference_link: bool = False,
+                   user: str = Depends(current_user)):
+    if number is not None:
+        rows = [incidents_db[numbers[number]]] if number in numbers else []
+    else:
+        rows = [r for r in incidents_db.values() if sys_created_by is None or r["sys_created_by"] == sys_created_by]
+    base_url = str(request.base_url)
+    rows = rows[:sysparm_limit] if sysparm_limit else rows
+    return {"result": [render_incident(r, base_url, sysparm_fields, sysparm_display_value,
+                                       sysparm_exclude_reference_link) for r in rows]}
+
+
+# The encoded-query conditions the tools send: `field=value`, `field!=value`, `fieldINa,b`
+# and `field>=value` / `field<value`, where a value may be `javascript:gs.daysAgoStart(n)`
+_CONDITION = re.compile(r"^(\w+?)(!=|>=|<=|=|>|<|IN)(.*)$")
+_DAYS_AGO = re.compile(r"^javascript:gs\.daysAgoStart\((\d+)\)$")
+GROUPABLE = {"state", "urgency", "sys_created_by"}
+
+
+def _condition(text: str):
+    match = _CONDITION.match(text)
+    if match is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported query condition: {text}")
+    field, op, value = match.groups()
+    days = _DAYS_AGO.match(value)
+    if days:
+        start = datetime.now() - timedelta(days=int(days.group(1)))
+        value = start.strftime("%Y-%m-%d 00:00:00")
+    if op == "IN":
+        values = set(value.split(","))
+        return lambda row: row.get(field) in values
+    compare = {"=": str.__eq__, "!=": str.__ne__, ">=": str.__ge__, "<=": str.__le__, ">": str.__gt__,
+               "<": str.__lt__}[op]
+    # Dates are stored as `YYYY-MM-DD HH:MM:SS`, which compare correctly as strings
+    return lambda row: compare(str(row.get(field, "")), value)
+
+
+@app.get("/api/now/stats/incident")
+def incident_stats(sysparm_query: Optional[str] = None, sysparm_group_by: Optional[str] = None,
+                   sysparm_count: bool = False, user: str = Depends(current_user)):
+    """Aggregate API: the number of incidents matching `sysparm_query`, per `sysparm_group_by` value."""
+    conditions = [_condition(part) for part in (sysparm_query or "").split("^") if part]
+    rows = [r for r in incidents_db.values() if all(condition(r) for condition in conditions)]
+    if not sysparm_group_by:
+        return {"result": {"stats": {"count": str(len(rows))}}}
+    fields = sysparm_group_by.split(",")
+    unknown = set(fields) - GROUPABLE
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cannot group by {', '.join(sorted(unknown))}")
+    counts = Counter(tuple(r[field] for field in fields) for r in rows)
+    return {"result": [{"stats": {"count": str(count)},
+                        "groupby_fields": [{"field": field, "value": value} for field, value in zip(fields, key)]}
+                       for key, count in sorted(counts.items())]}
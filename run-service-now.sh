@@ -62,27 +62,31 @@ fi
 
 # Import the get_my_claims tool
 echo "Importing get_my_claims tool..."
-orchestrate tools import -k python -f ./tools/get_my_claims.py
+orchestrate tools import -k python -f ./tools/get_my_claims.py -p ./tools
 
 # Import the get_healthcare_benefits tool
 echo "Importing get_healthcare_benefits tool..."
-orchestrate tools import -k python -f ./tools/get_healthcare_benefits.py
+orchestrate tools import -k python -f ./tools/get_healthcare_benefits.py -p ./tools
 
 # Import the search_healthcare_providers tool
 echo "Importing search_healthcare_providers tool..."
-orchestrate tools import -k python -f ./tools/search_healthcare_providers.py
+orchestrate tools import -k python -f ./tools/search_healthcare_providers.py -p ./tools
 
 # Import the create_service_now_incident tool
 echo "Importing create_service_now_incident tool..."
-orchestrate tools import -k python -f ./tools/create_service_now_incident.py -a service-now
+orchestrate tools import -k python -f ./tools/create_service_now_incident.py -p ./tools -a service-now
 
 # Import the get_my_service_now_incidents tool
 echo "Importing get_my_service_now_incidents tool..."
-orchestrate tools import -k python -f ./tools/get_my_service_now_incidents.py -a service-now
+orchestrate tools import -k python -f ./tools/get_my_service_now_incidents.py -p ./tools -a service-now
 
 # Import the get_service_now_incident_by_number tool
 echo "Importing get_service_now_incident_by_number tool..."
-orchestrate tools import -k python -f ./tools/get_service_now_incident_by_number.py -a service-now
+orchestrate tools import -k python -f ./tools/get_service_now_incident_by_number.py -p ./tools -a service-now
+
+# Import the get_my_service_now_incident_stats tool
+echo "Importing get_my_service_now_incident_stats tool..."
+orchestrate tools import -k python -f ./tools/get_my_service_now_incident_stats.py -p ./tools -a service-now
 
 # Import the service_now_agent
 echo "Importing service_now_agent..."
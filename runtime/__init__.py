@@ -0,0 +1 @@
+# Local runtime package 
\ No newline at end of file
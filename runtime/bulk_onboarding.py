@@ -0,0 +1,166 @@
+"""
+Batch onboarding for new-hire cohorts.
+
+Streams rows from a CSV or JSONL file (or stdin), runs the onboarding flow for
+each row and writes one JSON result line per row as soon as that row finishes:
+
+    python -m runtime.bulk_onboarding cohort.csv --concurrency 32 -o results.jsonl
+
+At most `--concurrency` rows are in flight; the reader only pulls the next row
+once one finishes, so memory stays flat however large the cohort is. Row fields
+are the flow inputs (`name`, `email`, `title`, `start_time`).
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TextIO
+
+from runtime.checkpoints import CheckpointStore
+from runtime.flow_runner import FlowRun, FlowRunner, FlowSpec, load_flow
+from runtime.toolbox import PROJECT_ROOT, resolve_tool
+
+DEFAULT_FLOW = PROJECT_ROOT / "flows" / "onboarding_flow.yaml"
+
+
+def iter_rows(stream: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """Yield new-hire rows one at a time from a CSV or JSONL stream."""
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            yield {key: value for key, value in row.items() if value not in (None, "")}
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def summarize(row_number: int, run: FlowRun) -> Dict[str, Any]:
+    return {
+        "row": row_number,
+        "run_id": run.run_id,
+        "status": run.status,
+        "elapsed": round(run.elapsed, 4),
+        "steps": {
+            step_id: {key: value for key, value in
+                      {"status": step.status, "outputs": step.outputs, "error": step.error,
+                       "source": step.source if step.source != "executed" else None}.items() if value}
+            for step_id, step in run.steps.items()
+        },
+    }
+
+
+class BulkOnboarding:
+    """
+    Runs a flow over a stream of rows with bounded concurrency.
+
+    Rows run on their own thread pool while all of their steps share one step
+    pool, so steps of different rows interleave and the tools' pooled HTTP
+    connections are reused across rows.
+    """
+
+    def __init__(self, spec: FlowSpec, concurrency: int = 16, defaults: Optional[Dict[str, Any]] = None,
+                 resolver: Callable[[str], Callable] = resolve_tool, checkpoints: Optional[CheckpointStore] = None,
+                 cohort: Optional[str] = None, memo_window: float = 0):
+        self.spec = spec
+        self.concurrency = concurrency
+        self.defaults = defaults or {}
+        self.cohort = cohort
+        self.resolver = resolver
+        self.checkpoints = checkpoints
+        self.memo_window = memo_window
+
+    def _run_id(self, row_number: int, row: Dict[str, Any]) -> Optional[str]:
+        # A stable id per cohort row lets a rerun of the same cohort resume
+        if self.cohort is None:
+            return None
+        return f"{self.cohort}:{row.get('email') or row_number}"
+
+    def _run_row(self, runner: FlowRunner, row_number: int, row: Dict[str, Any]) -> Dict[str, Any]:
+        inputs = {**self.defaults, **row}
+        return summarize(row_number, runner.run(self.spec, inputs, run_id=self._run_id(row_number, row)))
+
+    def run(self, rows: Iterable[Dict[str, Any]], emit: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        """
+        Process every row, calling `emit` with each row's result in completion order.
+
+        Returns:
+            dict: Totals for the batch (rows, succeeded, failed, elapsed, rows_per_second)
+        """
+        started = time.perf_counter()
+        totals = {"rows": 0, "succeeded": 0, "failed": 0}
+
+        def collect(done):
+            for future in done:
+                result = future.result()
+                totals["rows"] += 1
+                totals["succeeded" if result["status"] == "succeeded" else "failed"] += 1
+                emit(result)
+
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency * 2, thread_name_prefix="bulk-step") as step_pool, \
+                ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="bulk-row") as row_pool:
+            runner = FlowRunner(resolver=self.resolver, executor=step_pool, checkpoints=self.checkpoints,
+                                memo_window=self.memo_window)
+            for row_number, row in enumerate(rows, start=1):
+                if len(in_flight) >= self.concurrency:
+                    # Backpressure: stop reading until a row finishes
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                in_flight.add(row_pool.submit(self._run_row, runner, row_number, row))
+            done, _ = wait(in_flight)
+            collect(done)
+
+        elapsed = time.perf_counter() - started
+        totals["elapsed"] = round(elapsed, 3)
+        totals["rows_per_second"] = round(totals["rows"] / elapsed, 2) if elapsed else 0.0
+        return totals
+
+
+def _parse_defaults(pairs):
+    return dict(pair.partition("=")[::2] for pair in pairs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Onboard a cohort of new hires from CSV or JSONL")
+    parser.add_argument("input", help="CSV or JSONL file with one new hire per row ('-' for stdin)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from file extension)")
+    parser.add_argument("--output", "-o", default="-", help="Where to write JSONL results (default: stdout)")
+    parser.add_argument("--flow", default=str(DEFAULT_FLOW))
+    parser.add_argument("--concurrency", "-c", type=int, default=16, help="Rows in flight at once")
+    parser.add_argument("--default", "-d", action="append", default=[], metavar="KEY=VALUE",
+                        help="Flow input used when a row does not set it, e.g. start_time")
+    parser.add_argument("--cohort", help="Cohort name; checkpoints rows so a rerun resumes where it failed")
+    parser.add_argument("--checkpoints", help="Checkpoint database path (default with --cohort: .adk_cache)")
+    parser.add_argument("--memo-window", type=float, default=0)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.endswith(".csv") else "jsonl")
+    checkpoints = None
+    if args.cohort or args.checkpoints:
+        checkpoints = CheckpointStore(args.checkpoints) if args.checkpoints else CheckpointStore()
+
+    bulk = BulkOnboarding(load_flow(args.flow), concurrency=args.concurrency, defaults=_parse_defaults(args.default),
+                          checkpoints=checkpoints, cohort=args.cohort, memo_window=args.memo_window)
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", newline="")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        def emit(result):
+            sink.write(json.dumps(result) + "\n")
+            sink.flush()
+
+        totals = bulk.run(iter_rows(source, fmt), emit)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(json.dumps(totals), file=sys.stderr)
+    return 0 if totals["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
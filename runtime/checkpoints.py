@@ -0,0 +1,108 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from pydantic_core import to_jsonable_python
+
+from runtime.toolbox import PROJECT_ROOT
+
+CACHE_DIR = PROJECT_ROOT / ".adk_cache"
+DEFAULT_PATH = CACHE_DIR / "checkpoints.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    flow TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id TEXT NOT NULL,
+    step_id TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    result TEXT NOT NULL,
+    outputs TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (run_id, step_id)
+);
+CREATE INDEX IF NOT EXISTS steps_by_input ON steps (tool, input_hash, completed_at);
+"""
+
+
+def _dumps(value: Any, **kwargs) -> str:
+    """JSON-encode tool inputs and results; pydantic models are stored as their fields, not their str()."""
+    return json.dumps(to_jsonable_python(value, fallback=str), **kwargs)
+
+
+def input_hash(tool: str, inputs: Dict[str, Any]) -> str:
+    payload = _dumps([tool, inputs], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """
+    SQLite record of completed flow steps, keyed by flow run id.
+
+    Only successful steps are stored, so resuming a run re-executes whatever
+    failed or never started. The same rows back step memoization: a step whose
+    tool and inputs match a recent completion (in any run) reuses its result.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def save_run(self, run_id: str, flow: str, inputs: Dict[str, Any], status: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)",
+                (run_id, flow, _dumps(inputs), status, time.time()),
+            )
+
+    def run_inputs(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT inputs FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_step(self, run_id: str, step_id: str, tool: str, inputs: Dict[str, Any], result: Any,
+                  outputs: Dict[str, Any]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO steps VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, step_id, tool, input_hash(tool, inputs), _dumps(inputs),
+                 _dumps(result), _dumps(outputs), time.time()),
+            )
+
+    def completed_step(self, run_id: str, step_id: str, tool: str, inputs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the checkpointed result of a step in this run if it completed with the same inputs."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, outputs FROM steps WHERE run_id = ? AND step_id = ? AND input_hash = ?",
+                (run_id, step_id, input_hash(tool, inputs)),
+            ).fetchone()
+        return {"result": json.loads(row[0]), "outputs": json.loads(row[1])} if row else None
+
+    def memoized(self, tool: str, inputs: Dict[str, Any], window: float) -> Optional[Dict[str, Any]]:
+        """Return the most recent result of `tool` with these inputs completed within `window` seconds."""
+        if window <= 0:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, outputs FROM steps WHERE tool = ? AND input_hash = ? AND completed_at >= ? "
+                "ORDER BY completed_at DESC LIMIT 1",
+                (tool, input_hash(tool, inputs), time.time() - window),
+            ).fetchone()
+        return {"result": json.loads(row[0]), "outputs": json.loads(row[1])} if row else None
@@ -0,0 +1,329 @@
+"""
+Offline evaluation of agent test cases such as `evaluations/onboarding_tests.json`.
+
+    python -m runtime.eval_runner evaluations/onboarding_tests.json --backend router --mock-services
+    python -m runtime.eval_runner cases.jsonl --backend transcript:recorded.jsonl --workers 8 --shard 0/4 -o results.jsonl
+
+Cases are read as a stream, from a JSON array or from JSONL, so suites of any
+size use constant memory. Cases are sent to a process pool in chunks, with a
+bounded number of chunks in flight. Each case's answer comes from a pluggable
+backend:
+
+- `router[:agent]`: the deterministic guideline router. It calls the tool
+  when the fast path applies; otherwise it reports no action.
+- `transcript:<path>`: answers recorded from a real LLM run, as JSONL with
+  `query` (or `id`), `action`, `tools_invoked` and `output`.
+
+A case passes when the action matches, the invoked tools contain every
+expected tool, and each other expected field is found in the answer. One JSON
+line is written per case, and a summary goes to stderr.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from runtime.toolbox import is_error_result
+
+DEFAULT_AGENT = "onboarding_agent"
+READ_SIZE = 1 << 16
+RESERVED = {"action", "tools_invoked"}
+
+
+class EvalCase(BaseModel):
+    id: str
+    query: str
+    expected: Dict[str, Any] = Field(default_factory=dict)
+    agent: Optional[str] = None
+
+
+class Answer(BaseModel):
+    action: Optional[str] = None
+    tools_invoked: List[str] = Field(default_factory=list)
+    output: Any = None
+    fields: Dict[str, Any] = Field(default_factory=dict)
+
+
+class CaseResult(BaseModel):
+    id: str
+    query: str
+    passed: bool
+    failures: List[str] = Field(default_factory=list)
+    action: Optional[str] = None
+    tools_invoked: List[str] = Field(default_factory=list)
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+def _array_values(stream: TextIO, buffer: str) -> Iterator[Any]:
+    """Yield the elements of a JSON array whose opening bracket has been consumed, reading as needed."""
+    decoder = json.JSONDecoder()
+    while True:
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            value, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            chunk = stream.read(READ_SIZE)
+            if not chunk:
+                raise ValueError("Unterminated JSON array of cases")
+            buffer += chunk
+            continue
+        yield value
+        buffer = buffer[end:]
+
+
+def _jsonl_values(stream: TextIO, buffer: str) -> Iterator[Any]:
+    while True:
+        newline = buffer.find("\n")
+        if newline < 0:
+            chunk = stream.read(READ_SIZE)
+            if chunk:
+                buffer += chunk
+                continue
+            if buffer.strip():
+                yield json.loads(buffer)
+            return
+        line, buffer = buffer[:newline], buffer[newline + 1:]
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_cases(stream: TextIO, shard: Tuple[int, int] = (0, 1)) -> Iterator[EvalCase]:
+    """
+    Stream cases from a JSON array or JSONL, keeping only those of `shard` (index, count).
+
+    Case ids default to the case's position in the file, so shards of the same
+    file never overlap and their results can simply be concatenated.
+    """
+    head = stream.read(READ_SIZE)
+    stripped = head.lstrip()
+    values = _array_values(stream, stripped[1:]) if stripped.startswith("[") else _jsonl_values(stream, head)
+    index, count = shard
+    for position, value in enumerate(values):
+        if position % count == index:
+            yield EvalCase(id=str(value.get("id", position)), query=value["query"],
+                           expected=value.get("expected", {}), agent=value.get("agent"))
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    index, _, count = value.partition("/")
+    index, count = int(index), int(count or 1)
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError("shard must be i/n with 0 <= i < n")
+    return index, count
+
+
+class RouterBackend:
+    """Answers with the guideline router's fast path, calling the routed tool."""
+
+    def __init__(self, agent: Optional[str] = DEFAULT_AGENT):
+        from runtime.router import GuidelineRouter
+
+        self.router = GuidelineRouter()
+        self.agent = agent
+
+    def answer(self, case: EvalCase) -> Answer:
+        decision, output = self.router.dispatch(case.query, llm=lambda query: None, agent=case.agent or self.agent)
+        if not decision.fast_path:
+            return Answer(output=decision.reason)
+        return Answer(action=decision.tool, tools_invoked=[decision.tool], output=output)
+
+
+class TranscriptBackend:
+    """Replays answers recorded from an LLM, looked up by case id or query."""
+
+    def __init__(self, path: str):
+        self.answers: Dict[str, Answer] = {}
+        with open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    answer = Answer(**{k: v for k, v in record.items() if k in Answer.model_fields})
+                    for key in ("id", "query"):
+                        if key in record:
+                            self.answers[f"{key}:{record[key]}"] = answer
+
+    def answer(self, case: EvalCase) -> Answer:
+        answer = self.answers.get(f"id:{case.id}") or self.answers.get(f"query:{case.query}")
+        if answer is None:
+            raise KeyError(f"No recorded answer for case {case.id}")
+        return answer
+
+
+def make_backend(spec: str):
+    name, _, argument = spec.partition(":")
+    if name == "router":
+        return RouterBackend(argument or DEFAULT_AGENT)
+    if name == "transcript":
+        return TranscriptBackend(argument)
+    raise ValueError(f"Unknown backend: {spec}")
+
+
+def _text(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, default=str)
+
+
+def field_found(key: str, value: Any, answer: Answer) -> bool:
+    """An expected field matches a structured field of the answer, or appears as `key: value` in its output."""
+    if key in answer.fields:
+        return answer.fields[key] == value
+    label = re.escape(key).replace("_", "[ _]")
+    return re.search(rf"{label}[\"']?\s*[:=]\s*[\"']?{re.escape(str(value))}", _text(answer.output),
+                     re.IGNORECASE) is not None
+
+
+def check(case: EvalCase, answer: Answer) -> List[str]:
+    failures = []
+    expected = case.expected
+    if "action" in expected and answer.action != expected["action"]:
+        failures.append(f"action: expected {expected['action']}, got {answer.action}")
+    missing = [tool for tool in expected.get("tools_invoked", []) if tool not in answer.tools_invoked]
+    if missing:
+        failures.append(f"tools_invoked: missing {', '.join(missing)}")
+    if is_error_result(answer.output):
+        failures.append(f"tool error: {answer.output}")
+    for key, value in expected.items():
+        if key not in RESERVED and not field_found(key, value, answer):
+            failures.append(f"{key}: expected {value!r}")
+    return failures
+
+
+def evaluate(backend, case: EvalCase) -> CaseResult:
+    started = time.perf_counter()
+    try:
+        answer = backend.answer(case)
+    except Exception as e:
+        return CaseResult(id=case.id, query=case.query, passed=False, error=f"{type(e).__name__}: {e}",
+                          elapsed=round(time.perf_counter() - started, 4))
+    failures = check(case, answer)
+    return CaseResult(id=case.id, query=case.query, passed=not failures, failures=failures, action=answer.action,
+                      tools_invoked=answer.tools_invoked, elapsed=round(time.perf_counter() - started, 4))
+
+
+_worker_backend = None
+
+
+def _init_worker(backend_spec: str):
+    global _worker_backend
+    _worker_backend = make_backend(backend_spec)
+
+
+def _evaluate_chunk(cases: List[EvalCase]) -> List[Dict[str, Any]]:
+    return [evaluate(_worker_backend, case).model_dump() for case in cases]
+
+
+def _chunks(cases: Iterator[EvalCase], size: int) -> Iterator[List[EvalCase]]:
+    chunk = []
+    for case in cases:
+        chunk.append(case)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_eval(cases: Iterator[EvalCase], backend_spec: str, emit: Callable[[Dict[str, Any]], None],
+             workers: int = 4, chunk_size: int = 16) -> Dict[str, Any]:
+    """
+    Evaluate a stream of cases and return the aggregate.
+
+    Args:
+        cases: Cases to run, e.g. from `iter_cases`
+        backend_spec: `router[:agent]` or `transcript:<path>`; built once per worker process
+        emit: Called with each case result, in completion order
+        workers: Worker processes; 0 evaluates in this process
+        chunk_size: Cases sent to a worker at a time
+
+    Returns:
+        dict: Case, pass and failure counts, pass rate, latency percentiles and per-action pass rates
+    """
+    started = time.perf_counter()
+    elapsed, by_action = [], {}
+    totals = {"cases": 0, "passed": 0, "failed": 0, "errors": 0}
+
+    def collect(results: List[Dict[str, Any]]):
+        for result in results:
+            totals["cases"] += 1
+            totals["passed" if result["passed"] else "failed"] += 1
+            totals["errors"] += result["error"] is not None
+            elapsed.append(result["elapsed"])
+            stats = by_action.setdefault(result["action"] or "none", {"cases": 0, "passed": 0})
+            stats["cases"] += 1
+            stats["passed"] += result["passed"]
+            emit(result)
+
+    if workers <= 0:
+        _init_worker(backend_spec)
+        for chunk in _chunks(cases, chunk_size):
+            collect(_evaluate_chunk(chunk))
+    else:
+        in_flight = set()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(backend_spec,)) as pool:
+            for chunk in _chunks(cases, chunk_size):
+                if len(in_flight) >= workers * 2:
+                    # Backpressure: stop reading cases until a chunk finishes
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+                in_flight.add(pool.submit(_evaluate_chunk, chunk))
+            for future in wait(in_flight)[0]:
+                collect(future.result())
+
+    totals["pass_rate"] = round(totals["passed"] / totals["cases"], 4) if totals["cases"] else 0.0
+    if elapsed:
+        totals["case_ms_p50"] = round(float(np.percentile(elapsed, 50)) * 1000, 3)
+        totals["case_ms_p95"] = round(float(np.percentile(elapsed, 95)) * 1000, 3)
+    totals["by_action"] = by_action
+    totals["elapsed"] = round(time.perf_counter() - started, 3)
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run agent evaluation cases offline")
+    parser.add_argument("cases", help="JSON array or JSONL file of cases ('-' for stdin)")
+    parser.add_argument("--backend", default="router", help="'router[:agent]' or 'transcript:<path>'")
+    parser.add_argument("--workers", "-w", type=int, default=4, help="Worker processes (0: run in-process)")
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--shard", type=parse_shard, default=(0, 1), metavar="I/N",
+                        help="Only run cases whose position modulo N is I")
+    parser.add_argument("--mock-services", action="store_true", help="Run the tools against in-process mocks")
+    parser.add_argument("--output", "-o", default="-", help="Where to write JSONL results (default: stdout)")
+    args = parser.parse_args(argv)
+
+    mocks = nullcontext()
+    if args.mock_services:
+        from mocks.harness import MockServices
+
+        mocks = MockServices()
+
+    source = sys.stdin if args.cases == "-" else open(args.cases, "r")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        def emit(result):
+            sink.write(json.dumps(result) + "\n")
+
+        # Workers inherit the mock URLs because the pool is started inside this block
+        with mocks:
+            totals = run_eval(iter_cases(source, args.shard), args.backend, emit, args.workers, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(json.dumps({"shard": "/".join(map(str, args.shard)), **totals}), file=sys.stderr)
+    return 0 if totals["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
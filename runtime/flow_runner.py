@@ -0,0 +1,364 @@
+"""
+Local executor for the flow YAML files in `flows/`.
+
+A flow's `steps` are either plain tool names, which run as a sequential chain
+(the original format), or step mappings:
+
+    steps:
+      - id: create_profile
+        tool: create_profile_tool
+        inputs:
+          name: '${flow.name}'
+        outputs:
+          employee_id: 'Employee ID: ([\\w-]+)'
+      - id: schedule_meeting
+        tool: schedule_meeting_tool
+        depends_on: [create_profile]
+        inputs:
+          subject: 'Welcome ${flow.name} (${create_profile.employee_id})'
+
+`${flow.<key>}` refers to a flow input, `${<step>.<output>}` to an output of an
+earlier step and `${<step>}` to its whole result. Steps that reference another
+step depend on it implicitly. Independent steps run concurrently, so a run takes
+as long as the flow's critical path rather than the sum of all its steps.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+from pydantic import BaseModel, Field
+
+from runtime.checkpoints import DEFAULT_PATH as DEFAULT_CHECKPOINTS, CheckpointStore
+from runtime.toolbox import is_error_result, resolve_tool
+
+REFERENCE = re.compile(r"\$\{([A-Za-z_]\w*)(?:\.(\w+))?\}")
+
+
+class FlowError(Exception):
+    """Raised for invalid flow definitions and unresolvable step references."""
+
+
+class FlowStep(BaseModel):
+    id: str
+    tool: str
+    depends_on: List[str] = Field(default_factory=list)
+    inputs: Dict[str, Any] = Field(default_factory=dict)
+    outputs: Dict[str, str] = Field(default_factory=dict)
+    optional: bool = False
+
+
+class FlowSpec(BaseModel):
+    name: str
+    steps: List[FlowStep]
+
+
+class StepResult(BaseModel):
+    id: str
+    tool: str
+    status: str
+    inputs: Dict[str, Any] = Field(default_factory=dict)
+    result: Any = None
+    outputs: Dict[str, Any] = Field(default_factory=dict)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    source: str = "executed"
+
+
+class FlowRun(BaseModel):
+    flow: str
+    run_id: str
+    status: str
+    steps: Dict[str, StepResult]
+    elapsed: float
+
+
+def _references(value: Any):
+    if isinstance(value, str):
+        for match in REFERENCE.finditer(value):
+            yield match.group(1)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _references(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _references(item)
+
+
+def parse_flow(config: Dict[str, Any]) -> FlowSpec:
+    """
+    Build a validated FlowSpec from a parsed flow YAML document.
+
+    Args:
+        config: The flow YAML as returned by `yaml.safe_load`
+
+    Returns:
+        FlowSpec: The flow with explicit and implicit dependencies resolved
+
+    Raises:
+        FlowError: On duplicate step ids, unknown dependencies or cycles
+    """
+    steps = []
+    previous = None
+    for entry in config.get("steps", []):
+        if isinstance(entry, str):
+            # Legacy format: a bare list of tools is a sequential chain
+            step = FlowStep(id=entry, tool=entry, depends_on=[previous] if previous else [])
+        else:
+            entry = dict(entry)
+            entry.setdefault("id", entry.get("tool"))
+            step = FlowStep(**entry)
+        steps.append(step)
+        previous = step.id
+
+    ids = [step.id for step in steps]
+    if len(ids) != len(set(ids)):
+        raise FlowError(f"Flow {config.get('name')} has duplicate step ids")
+
+    for step in steps:
+        implicit = [ref for ref in _references(step.inputs) if ref != "flow"]
+        for dep in implicit:
+            if dep not in step.depends_on:
+                step.depends_on.append(dep)
+        for dep in step.depends_on:
+            if dep not in ids:
+                raise FlowError(f"Step {step.id} depends on unknown step {dep}")
+
+    spec = FlowSpec(name=config.get("name", ""), steps=steps)
+    topological_order(spec)
+    return spec
+
+
+def load_flow(path) -> FlowSpec:
+    with open(path, "r") as f:
+        return parse_flow(yaml.safe_load(f))
+
+
+def topological_order(spec: FlowSpec) -> List[str]:
+    remaining = {step.id: set(step.depends_on) for step in spec.steps}
+    order = []
+    while remaining:
+        ready = sorted(step_id for step_id, deps in remaining.items() if not deps)
+        if not ready:
+            raise FlowError(f"Flow {spec.name} has a dependency cycle between {sorted(remaining)}")
+        for step_id in ready:
+            order.append(step_id)
+            del remaining[step_id]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+def _lookup(name: str, attr: Optional[str], flow_inputs: Dict[str, Any], results: Dict[str, StepResult]) -> Any:
+    if name == "flow":
+        if attr is None or attr not in flow_inputs:
+            raise FlowError(f"Missing flow input: {attr}")
+        return flow_inputs[attr]
+    step = results[name]
+    if attr is None:
+        return step.result
+    if attr in step.outputs:
+        return step.outputs[attr]
+    if isinstance(step.result, dict) and attr in step.result:
+        return step.result[attr]
+    raise FlowError(f"Step {name} has no output {attr}")
+
+
+def render(value: Any, flow_inputs: Dict[str, Any], results: Dict[str, StepResult]) -> Any:
+    """Substitute `${...}` references in a step input; a lone reference keeps the referenced value's type."""
+    if isinstance(value, str):
+        match = REFERENCE.fullmatch(value)
+        if match:
+            return _lookup(match.group(1), match.group(2), flow_inputs, results)
+        return REFERENCE.sub(lambda m: str(_lookup(m.group(1), m.group(2), flow_inputs, results)), value)
+    if isinstance(value, list):
+        return [render(item, flow_inputs, results) for item in value]
+    if isinstance(value, dict):
+        return {key: render(item, flow_inputs, results) for key, item in value.items()}
+    return value
+
+
+def extract_outputs(step: FlowStep, result: Any) -> Dict[str, Any]:
+    outputs = {}
+    for name, pattern in step.outputs.items():
+        match = re.search(pattern, result if isinstance(result, str) else json.dumps(result))
+        if not match:
+            raise FlowError(f"Output {name} not found in result of step {step.id}")
+        outputs[name] = match.group(1) if match.groups() else match.group(0)
+    return outputs
+
+
+class FlowRunner:
+    """
+    Runs a FlowSpec as a DAG on a thread pool, starting every step as soon as
+    all of its dependencies have succeeded.
+
+    With a CheckpointStore, every completed step is recorded under the run id.
+    Re-running the same run id resumes it: steps that already completed with the
+    same inputs are not executed again. `memo_window` additionally reuses the
+    result of any run's step with the same tool and inputs completed within that
+    many seconds.
+    """
+
+    def __init__(self, resolver: Callable[[str], Callable] = resolve_tool, max_workers: int = 8,
+                 executor: Optional[Executor] = None, checkpoints: Optional[CheckpointStore] = None,
+                 memo_window: float = 0):
+        self.resolver = resolver
+        self.max_workers = max_workers
+        self.executor = executor
+        self.checkpoints = checkpoints
+        self.memo_window = memo_window
+
+    def _execute(self, step: FlowStep, inputs: Dict[str, Any]) -> StepResult:
+        started = time.perf_counter()
+        try:
+            result = self.resolver(step.tool)(**inputs)
+            if is_error_result(result):
+                raise FlowError(result)
+            outputs = extract_outputs(step, result)
+        except Exception as e:
+            return StepResult(id=step.id, tool=step.tool, status="failed", inputs=inputs,
+                              error=str(e), elapsed=time.perf_counter() - started)
+        return StepResult(id=step.id, tool=step.tool, status="succeeded", inputs=inputs, result=result,
+                          outputs=outputs, elapsed=time.perf_counter() - started)
+
+    def _restore(self, run_id: str, step: FlowStep, inputs: Dict[str, Any]) -> Optional[StepResult]:
+        if self.checkpoints is None:
+            return None
+        source = "checkpoint"
+        saved = self.checkpoints.completed_step(run_id, step.id, step.tool, inputs)
+        if saved is None:
+            source = "memo"
+            saved = self.checkpoints.memoized(step.tool, inputs, self.memo_window)
+        if saved is None:
+            return None
+        return StepResult(id=step.id, tool=step.tool, status="succeeded", inputs=inputs, source=source, **saved)
+
+    def run(self, spec: FlowSpec, flow_inputs: Dict[str, Any], run_id: Optional[str] = None) -> FlowRun:
+        """
+        Execute a flow.
+
+        Args:
+            spec: The flow to run
+            flow_inputs: Values for the `${flow.<key>}` references
+            run_id: Identifier for this run; pass a previous run's id to resume it
+
+        Returns:
+            FlowRun: Per-step results; `status` is `failed` if any required step failed
+        """
+        started = time.perf_counter()
+        run_id = run_id or str(uuid.uuid4())
+        steps = {step.id: step for step in spec.steps}
+        waiting = {step.id: set(step.depends_on) for step in spec.steps}
+        dependents: Dict[str, List[str]] = {step.id: [] for step in spec.steps}
+        for step in spec.steps:
+            for dep in step.depends_on:
+                dependents[dep].append(step.id)
+
+        results: Dict[str, StepResult] = {}
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.max_workers)
+        running = {}
+        if self.checkpoints is not None:
+            self.checkpoints.save_run(run_id, spec.name, flow_inputs, "running")
+
+        def skip(step_id: str, reason: str):
+            for child in dependents[step_id]:
+                if child in waiting:
+                    del waiting[child]
+                    results[child] = StepResult(id=child, tool=steps[child].tool, status="skipped", error=reason)
+                    skip(child, reason)
+
+        def finish(result: StepResult):
+            results[result.id] = result
+            if result.status == "succeeded":
+                if result.source == "executed" and self.checkpoints is not None:
+                    self.checkpoints.save_step(run_id, result.id, result.tool, result.inputs, result.result,
+                                               result.outputs)
+                for child in dependents[result.id]:
+                    if child in waiting:
+                        waiting[child].discard(result.id)
+            else:
+                skip(result.id, f"dependency {result.id} failed")
+
+        def submit_ready():
+            ready = [s for s, deps in waiting.items() if not deps]
+            while ready:
+                for step_id in ready:
+                    del waiting[step_id]
+                    step = steps[step_id]
+                    try:
+                        inputs = render(step.inputs, flow_inputs, results)
+                    except FlowError as e:
+                        finish(StepResult(id=step_id, tool=step.tool, status="failed", error=str(e)))
+                        continue
+                    restored = self._restore(run_id, step, inputs)
+                    if restored is not None:
+                        # Restored steps complete immediately and may unblock more steps
+                        finish(restored)
+                    else:
+                        running[executor.submit(self._execute, step, inputs)] = step_id
+                ready = [s for s, deps in waiting.items() if not deps]
+
+        try:
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    finish(future.result())
+                submit_ready()
+        finally:
+            if self.executor is None:
+                executor.shutdown(wait=False)
+
+        failed = any(r.status != "succeeded" and not steps[r.id].optional for r in results.values())
+        status = "failed" if failed else "succeeded"
+        if self.checkpoints is not None:
+            self.checkpoints.save_run(run_id, spec.name, flow_inputs, status)
+        return FlowRun(flow=spec.name, run_id=run_id, status=status,
+                       steps={step.id: results[step.id] for step in spec.steps},
+                       elapsed=time.perf_counter() - started)
+
+
+def _parse_inputs(pairs: List[str]) -> Dict[str, Any]:
+    inputs = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        try:
+            inputs[key] = json.loads(value)
+        except json.JSONDecodeError:
+            inputs[key] = value
+    return inputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a flow YAML locally against the Python tools")
+    parser.add_argument("flow", help="Path to the flow YAML, e.g. flows/onboarding_flow.yaml")
+    parser.add_argument("--input", "-i", action="append", default=[], metavar="KEY=VALUE",
+                        help="Flow input; VALUE is parsed as JSON when possible")
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--run-id", help="Run id to checkpoint under; reuse it to resume a failed run")
+    parser.add_argument("--checkpoints", default=str(DEFAULT_CHECKPOINTS), help="Checkpoint database path")
+    parser.add_argument("--no-checkpoints", action="store_true", help="Run without recording checkpoints")
+    parser.add_argument("--memo-window", type=float, default=0,
+                        help="Reuse results of identical steps completed within this many seconds")
+    args = parser.parse_args(argv)
+
+    checkpoints = None if args.no_checkpoints else CheckpointStore(args.checkpoints)
+    inputs = _parse_inputs(args.input)
+    if checkpoints is not None and args.run_id and not inputs:
+        inputs = checkpoints.run_inputs(args.run_id) or {}
+
+    runner = FlowRunner(max_workers=args.max_workers, checkpoints=checkpoints, memo_window=args.memo_window)
+    run = runner.run(load_flow(args.flow), inputs, run_id=args.run_id)
+    print(run.model_dump_json(indent=2))
+    return 0 if run.status == "succeeded" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
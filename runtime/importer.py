@@ -0,0 +1,327 @@
+"""
+Incremental importer for the project's connections, tools, knowledge bases and agents.
+
+    python -m runtime.importer                 # import what changed since the last run
+    python -m runtime.importer --dry-run       # show the plan and its estimated duration
+    python -m runtime.importer --force -j 8
+
+Resources come from the compiled manifest (`runtime.manifest`) and are imported
+kind by kind, connections -> tools -> knowledge bases -> agents; within a kind
+the `orchestrate` commands run in parallel (agents in waves, collaborators
+first). The content hash and duration of every successful import are kept in
+`.adk_cache/import_state.json` per Orchestrate environment (the active
+environment's name and URL in the ADK config, as set by `orchestrate env
+activate`), and resources whose hash is unchanged in that environment are
+skipped. After a server reset, which keeps the environment, use --force.
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import yaml
+from pydantic import BaseModel, Field
+
+from runtime.checkpoints import CACHE_DIR
+from runtime.manifest import Manifest, load_manifest
+from runtime.toolbox import PROJECT_ROOT
+
+KINDS = ["connection", "tool", "knowledge_base", "agent"]
+STATE_PATH = CACHE_DIR / "import_state.json"
+# Where `orchestrate env activate` records the active environment
+ADK_CONFIG_PATH = Path.home() / ".config/orchestrate/config.yaml"
+DEFAULT_SECONDS = 10.0
+# .env keys holding the API key of each connection (as in the original import_all.sh)
+CREDENTIAL_KEYS = {"hr_api_conn": "HR_API_KEY", "dir_api_conn": "DIR_API_KEY"}
+
+
+class ImportTask(BaseModel):
+    kind: str
+    name: str
+    files: List[str]
+    commands: List[List[str]] = Field(default_factory=list)
+    digest: str = ""
+    wave: int = 0
+
+
+class ImportResult(BaseModel):
+    kind: str
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def read_env(path: Path) -> Dict[str, str]:
+    """Parse KEY=VALUE lines of a .env file; comments and blank lines are ignored."""
+    values = {}
+    if not path.exists():
+        return values
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, _, value = line.partition("=")
+        values[key.strip()] = value.strip().strip("'\"")
+    return values
+
+
+def active_environment(config_path: Path = ADK_CONFIG_PATH) -> str:
+    """The ADK's active environment as `<name>@<url>`; empty if the config cannot be read."""
+    try:
+        config = yaml.safe_load(Path(config_path).read_text()) or {}
+    except (OSError, yaml.YAMLError):
+        return ""
+    name = (config.get("context") or {}).get("active_environment") or ""
+    url = ((config.get("environments") or {}).get(name) or {}).get("wxo_url") or ""
+    return f"{name}@{url}" if name else ""
+
+
+def local_imports(path: Path) -> List[Path]:
+    """The sibling modules a tool imports, transitively; they are packaged with it by `-p ./tools`."""
+    found, pending = [], [path]
+    while pending:
+        current = pending.pop()
+        for node in ast.walk(ast.parse(current.read_text(encoding="utf-8"))):
+            names = [a.name for a in node.names] if isinstance(node, ast.Import) else \
+                [node.module] if isinstance(node, ast.ImportFrom) and node.module and not node.level else []
+            for name in names:
+                sibling = path.parent / f"{name.split('.')[0]}.py"
+                if sibling.exists() and sibling != path and sibling not in found:
+                    found.append(sibling)
+                    pending.append(sibling)
+    return sorted(found)
+
+
+def content_hash(root: Path, files: Sequence[str], extra: str = "") -> str:
+    digest = hashlib.sha256(extra.encode("utf-8"))
+    for rel in files:
+        digest.update(rel.encode("utf-8"))
+        path = root / rel
+        digest.update(path.read_bytes() if path.exists() else b"<missing>")
+    return digest.hexdigest()
+
+
+def plan(manifest: Manifest, env: Dict[str, str]) -> List[ImportTask]:
+    """Build one task per resource, in dependency order; knowledge base commands are chosen at run time."""
+    root = Path(manifest.root)
+    tasks = []
+    for app_id, connection in sorted(manifest.connections.items()):
+        commands = [["orchestrate", "connections", "import", "--file", connection.path]]
+        api_key = env.get(CREDENTIAL_KEYS.get(app_id, ""), "")
+        if api_key:
+            commands.append(["orchestrate", "connections", "set-credentials", "--app-id", app_id,
+                             "--env", "draft", "--api-key", api_key])
+        # The key's hash is part of the digest so rotated credentials are set again
+        key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+        tasks.append(ImportTask(kind="connection", name=app_id, files=[connection.path], commands=commands,
+                                digest=content_hash(root, [connection.path], key_hash)))
+
+    for name, tool in sorted(manifest.tools.items()):
+        if tool.spec is None:
+            continue  # Python-only tools are imported by run-service-now.sh
+        files = [tool.spec, tool.path] + [p.relative_to(root).as_posix() for p in local_imports(root / tool.path)]
+        command = ["orchestrate", "tools", "import", "-k", "python", "-f", tool.path, "-p", "./tools"]
+        for app_id in tool.connections:
+            command += ["-a", app_id]
+        tasks.append(ImportTask(kind="tool", name=name, files=files, commands=[command],
+                                digest=content_hash(root, files)))
+
+    for name, kb in sorted(manifest.knowledge_bases.items()):
+        # Document paths are relative to the knowledge base YAML, as for `orchestrate knowledge-bases import`
+        documents = [(Path(kb.path).parent / doc).as_posix() for doc in kb.config.get("documents") or []]
+        files = [kb.path] + documents
+        tasks.append(ImportTask(kind="knowledge_base", name=name, files=files, digest=content_hash(root, files)))
+
+    waves: Dict[str, int] = {}
+    for name in manifest.agent_order():
+        collaborators = manifest.agents[name].config.get("collaborators") or []
+        waves[name] = 1 + max((waves[c] for c in collaborators if c in waves), default=-1)
+        agent = manifest.agents[name]
+        tasks.append(ImportTask(kind="agent", name=name, files=[agent.path], wave=waves[name],
+                                commands=[["orchestrate", "agents", "import", "-f", agent.path]],
+                                digest=content_hash(root, [agent.path])))
+    return tasks
+
+
+def run_command(command: List[str], cwd: Path) -> str:
+    completed = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError((completed.stderr or completed.stdout).strip() or f"exit code {completed.returncode}")
+    return completed.stdout
+
+
+def estimate(durations: List[float], jobs: int) -> float:
+    """Wall time of running `durations` on `jobs` workers, longest first."""
+    workers = [0.0] * max(1, jobs)
+    for seconds in sorted(durations, reverse=True):
+        workers[workers.index(min(workers))] += seconds
+    return max(workers)
+
+
+class Importer:
+    """
+    Imports the tasks of a plan, skipping those whose content hash was already imported.
+
+    Args:
+        root: Project directory the `orchestrate` commands run in
+        state_path: JSON file with the hash and duration of each imported resource, per environment
+        jobs: Parallel imports within a kind
+        runner: Runs one command and returns its stdout; raises on failure
+        force: Import everything regardless of the stored hashes
+        environment: Orchestrate environment imports go to (default: the ADK's active one)
+    """
+
+    def __init__(self, root: Path = PROJECT_ROOT, state_path: Path = STATE_PATH, jobs: int = 4,
+                 runner: Callable[[List[str], Path], str] = run_command, force: bool = False,
+                 environment: Optional[str] = None):
+        self.root = Path(root)
+        self.state_path = Path(state_path)
+        self.jobs = jobs
+        self.runner = runner
+        self.force = force
+        self.environment = active_environment() if environment is None else environment
+        saved = json.loads(self.state_path.read_text()) if self.state_path.exists() else {}
+        # What was imported into another environment (or before states were kept per environment) is not current here
+        self.environments: Dict[str, Dict[str, Dict]] = saved.get("environments", {})
+        self.state: Dict[str, Dict] = self.environments.setdefault(self.environment, {})
+        self._lock = threading.Lock()
+        self._kb_list: Optional[str] = None
+
+    @staticmethod
+    def key(task: ImportTask) -> str:
+        return f"{task.kind}:{task.name}"
+
+    def is_current(self, task: ImportTask) -> bool:
+        return not self.force and self.state.get(self.key(task), {}).get("digest") == task.digest
+
+    def expected_seconds(self, task: ImportTask) -> float:
+        previous = self.state.get(self.key(task), {}).get("seconds")
+        if previous is not None:
+            return previous
+        same_kind = [v["seconds"] for k, v in self.state.items() if k.startswith(f"{task.kind}:")]
+        return sum(same_kind) / len(same_kind) if same_kind else DEFAULT_SECONDS
+
+    def _knowledge_bases(self) -> str:
+        # Listed once per run instead of once per knowledge base
+        with self._lock:
+            if self._kb_list is None:
+                self._kb_list = self.runner(["orchestrate", "knowledge-bases", "list"], self.root)
+            return self._kb_list
+
+    def _commands(self, task: ImportTask) -> List[List[str]]:
+        if task.kind != "knowledge_base":
+            return task.commands
+        kb_yaml = task.files[0]
+        if task.name in self._knowledge_bases():
+            return [["orchestrate", "knowledge-bases", "patch", "-n", task.name, "-f", kb_yaml]]
+        return [["orchestrate", "knowledge-bases", "import", "-f", kb_yaml]]
+
+    def _run(self, task: ImportTask) -> ImportResult:
+        started = time.perf_counter()
+        try:
+            for command in self._commands(task):
+                self.runner(command, self.root)
+        except Exception as e:
+            return ImportResult(kind=task.kind, name=task.name, status="failed",
+                                seconds=round(time.perf_counter() - started, 3), error=str(e))
+        seconds = round(time.perf_counter() - started, 3)
+        with self._lock:
+            self.state[self.key(task)] = {"digest": task.digest, "seconds": seconds, "imported_at": time.time()}
+        return ImportResult(kind=task.kind, name=task.name, status="imported", seconds=seconds)
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        with self._lock:
+            tmp.write_text(json.dumps({"environments": self.environments}, indent=2, sort_keys=True))
+        os.replace(tmp, self.state_path)
+
+    def run(self, tasks: List[ImportTask], emit: Callable[[ImportResult], None] = lambda result: None) -> List[ImportResult]:
+        """Import kind by kind; a kind with failures stops the kinds that depend on it."""
+        results = []
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            for kind in KINDS:
+                batch = [task for task in tasks if task.kind == kind]
+                for wave in sorted({task.wave for task in batch}):
+                    pending = []
+                    for task in batch:
+                        if task.wave != wave:
+                            continue
+                        if self.is_current(task):
+                            result = ImportResult(kind=kind, name=task.name, status="unchanged")
+                            results.append(result)
+                            emit(result)
+                        else:
+                            pending.append(task)
+                    for result in pool.map(self._run, pending):
+                        results.append(result)
+                        emit(result)
+                    self._save_state()
+                    if any(r.status == "failed" for r in results):
+                        return results
+        return results
+
+    def dry_run(self, tasks: List[ImportTask]) -> Dict:
+        """The plan with each resource's previous import time and the estimated wall time per kind."""
+        report = {"environment": self.environment, "resources": [], "kinds": {}, "estimated_seconds": 0.0}
+        for kind in KINDS:
+            batch = [task for task in tasks if task.kind == kind]
+            todo = [task for task in batch if not self.is_current(task)]
+            for task in batch:
+                report["resources"].append({"kind": kind, "name": task.name,
+                                            "action": "skip" if task not in todo else "import",
+                                            "expected_seconds": round(self.expected_seconds(task), 3)})
+            waves = sorted({task.wave for task in todo})
+            sequential = sum(self.expected_seconds(task) for task in todo)
+            parallel = sum(estimate([self.expected_seconds(t) for t in todo if t.wave == w], self.jobs) for w in waves)
+            report["kinds"][kind] = {"import": len(todo), "skip": len(batch) - len(todo),
+                                     "sequential_seconds": round(sequential, 3), "parallel_seconds": round(parallel, 3)}
+            report["estimated_seconds"] += parallel
+        report["estimated_seconds"] = round(report["estimated_seconds"], 3)
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import changed connections, tools, knowledge bases and agents")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan and estimated duration only")
+    parser.add_argument("--force", action="store_true", help="Import every resource, changed or not")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="Parallel imports within a kind")
+    parser.add_argument("--kind", dest="kinds", action="append", choices=KINDS, help="Only import these kinds")
+    parser.add_argument("--state", default=str(STATE_PATH), help="Where imported content hashes are kept")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest(PROJECT_ROOT)
+    tasks = [task for task in plan(manifest, read_env(PROJECT_ROOT / ".env"))
+             if not args.kinds or task.kind in args.kinds]
+    importer = Importer(PROJECT_ROOT, Path(args.state), args.jobs, force=args.force)
+
+    if args.dry_run:
+        print(json.dumps(importer.dry_run(tasks), indent=2))
+        return 0
+
+    def emit(result: ImportResult):
+        line = f"{result.status:>9}  {result.kind}: {result.name}"
+        if result.status != "unchanged":
+            line += f" ({result.seconds:.1f}s)"
+        print(line + (f"\n           {result.error}" if result.error else ""), flush=True)
+
+    started = time.perf_counter()
+    results = importer.run(tasks, emit)
+    failed = [r for r in results if r.status == "failed"]
+    print(f"{'Import failed' if failed else 'All imports completed'} in {time.perf_counter() - started:.1f}s: "
+          f"{sum(r.status == 'imported' for r in results)} imported, "
+          f"{sum(r.status == 'unchanged' for r in results)} unchanged, {len(failed)} failed.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Offline ingestion and BM25 search for the knowledge bases in `knowledge-bases/`.
+
+    python -m runtime.kb_index build knowledge-bases/onboarding_docs.yaml
+    python -m runtime.kb_index query onboarding_docs "two-factor authentication" -k 3
+
+Each document is extracted, chunked and tokenized into a segment file named by
+the SHA-256 of its content, so a rebuild only re-processes documents whose
+content changed. The BM25 postings are then assembled from the segments into a
+single `index.json` next to them.
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+from pydantic import BaseModel, Field
+
+from runtime.checkpoints import CACHE_DIR
+from runtime.toolbox import PROJECT_ROOT
+
+INDEX_ROOT = CACHE_DIR / "kb"
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with "
+    "you your our we".split()
+)
+
+
+class KnowledgeBaseSpec(BaseModel):
+    name: str
+    documents: List[Path]
+
+
+class BuildStats(BaseModel):
+    indexed: List[str] = Field(default_factory=list)
+    reused: List[str] = Field(default_factory=list)
+    removed: List[str] = Field(default_factory=list)
+    chunks: int = 0
+
+
+class SearchHit(BaseModel):
+    score: float
+    document: str
+    chunk: int
+    text: str
+
+
+def load_kb(path) -> KnowledgeBaseSpec:
+    """
+    Read a knowledge base YAML and resolve its document paths.
+
+    Paths are relative to the YAML's own directory, as for `orchestrate knowledge-bases import`.
+    """
+    path = Path(path)
+    with open(path, "r") as f:
+        config = yaml.safe_load(f)
+    documents = [path.parent / doc for doc in config.get("documents", [])]
+    return KnowledgeBaseSpec(name=config["name"], documents=documents)
+
+
+def extract_text(path: Path) -> str:
+    if path.suffix.lower() == ".pdf":
+        try:
+            from pypdf import PdfReader
+        except ImportError as e:
+            raise RuntimeError("Indexing PDF documents requires pypdf: pip install pypdf") from e
+        return "\n".join(page.extract_text() or "" for page in PdfReader(str(path)).pages)
+    return path.read_text(encoding="utf-8")
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def chunk_text(text: str, max_words: int = 80, overlap: int = 20) -> List[str]:
+    """Split text into windows of at most `max_words` words, overlapping by `overlap` words."""
+    words = text.split()
+    if not words:
+        return []
+    step = max(1, max_words - overlap)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + max_words]))
+        if start + max_words >= len(words):
+            break
+    return chunks
+
+
+def _relative(path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def build_index(kb_path, index_dir: Optional[Path] = None, max_words: int = 80, overlap: int = 20) -> BuildStats:
+    """
+    Build or incrementally refresh the BM25 index of a knowledge base.
+
+    Args:
+        kb_path: Path to the knowledge base YAML
+        index_dir: Where to keep the index (default: .adk_cache/kb/<name>)
+        max_words: Chunk size in words
+        overlap: Words shared by consecutive chunks
+
+    Returns:
+        BuildStats: Which documents were (re-)indexed, reused or dropped
+    """
+    spec = load_kb(kb_path)
+    index_dir = Path(index_dir or INDEX_ROOT / spec.name)
+    segments_dir = index_dir / "segments"
+    segments_dir.mkdir(parents=True, exist_ok=True)
+
+    stats = BuildStats()
+    documents = {}
+    for doc in spec.documents:
+        name = _relative(doc)
+        digest = hashlib.sha256(doc.read_bytes()).hexdigest()
+        documents[name] = digest
+        segment = segments_dir / f"{digest}.json"
+        if segment.exists():
+            stats.reused.append(name)
+            continue
+        chunks = [{"text": chunk, "terms": Counter(tokenize(chunk))}
+                  for chunk in chunk_text(extract_text(doc), max_words, overlap)]
+        segment.write_text(json.dumps({"document": name, "chunks": chunks}))
+        stats.indexed.append(name)
+
+    index_file = index_dir / "index.json"
+    previous = json.loads(index_file.read_text()) if index_file.exists() else {}
+    stats.removed = sorted(set(previous.get("documents", {})) - set(documents))
+    live = set(documents.values())
+    for segment in segments_dir.glob("*.json"):
+        if segment.stem not in live:
+            segment.unlink()
+
+    if not stats.indexed and not stats.removed and previous.get("documents") == documents:
+        stats.chunks = len(previous.get("chunks", []))
+        return stats
+
+    chunks, postings = [], {}
+    for name, digest in documents.items():
+        segment = json.loads((segments_dir / f"{digest}.json").read_text())
+        for ordinal, chunk in enumerate(segment["chunks"]):
+            chunk_id = len(chunks)
+            chunks.append({"document": name, "chunk": ordinal, "text": chunk["text"],
+                           "length": sum(chunk["terms"].values())})
+            for term, tf in chunk["terms"].items():
+                postings.setdefault(term, []).append([chunk_id, tf])
+
+    index = {
+        "kb": spec.name,
+        "documents": documents,
+        "avgdl": sum(c["length"] for c in chunks) / len(chunks) if chunks else 0.0,
+        "chunks": chunks,
+        "postings": postings,
+    }
+    index_file.write_text(json.dumps(index))
+    stats.chunks = len(chunks)
+    return stats
+
+
+class KnowledgeBaseIndex:
+    """BM25 search over an index written by build_index."""
+
+    def __init__(self, index: Dict, k1: float = 1.5, b: float = 0.75):
+        self.chunks = index["chunks"]
+        self.postings = index["postings"]
+        self.avgdl = index["avgdl"] or 1.0
+        self.k1 = k1
+        self.b = b
+
+    @classmethod
+    def load(cls, name_or_dir, **kwargs) -> "KnowledgeBaseIndex":
+        path = Path(name_or_dir)
+        if not path.is_dir():
+            path = INDEX_ROOT / str(name_or_dir)
+        return cls(json.loads((path / "index.json").read_text()), **kwargs)
+
+    def _idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.chunks) - df + 0.5) / (df + 0.5))
+
+    def scores(self, query: str) -> Dict[int, float]:
+        """BM25 score of every chunk that shares at least one term with the query."""
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self._idf(term)
+            for chunk_id, tf in self.postings.get(term, ()):
+                norm = self.k1 * (1 - self.b + self.b * self.chunks[chunk_id]["length"] / self.avgdl)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def search(self, query: str, top_k: int = 5) -> List[SearchHit]:
+        best = heapq.nlargest(top_k, self.scores(query).items(), key=lambda item: item[1])
+        return [SearchHit(score=round(score, 4), document=self.chunks[i]["document"], chunk=self.chunks[i]["chunk"],
+                          text=self.chunks[i]["text"]) for i, score in best]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query local knowledge base indexes")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Index the documents of a knowledge base YAML")
+    build.add_argument("kb", nargs="+", help="Knowledge base YAML file(s)")
+    query = commands.add_parser("query", help="Return the top-k chunks for a query")
+    query.add_argument("kb", help="Knowledge base name or index directory")
+    query.add_argument("query")
+    query.add_argument("-k", "--top-k", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        for kb in args.kb:
+            print(json.dumps({"kb": kb, **build_index(kb).model_dump()}))
+    else:
+        for hit in KnowledgeBaseIndex.load(args.kb).search(args.query, args.top_k):
+            print(hit.model_dump_json())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
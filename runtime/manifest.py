@@ -0,0 +1,419 @@
+"""
+Compiled registry of the project's agents, tools, connections, flows and knowledge bases.
+
+    python -m runtime.manifest            # compile, validate and cache; exits 1 on errors
+    python -m runtime.manifest --json     # print the registry
+
+Every resource YAML is parsed once and Python tools are discovered by reading
+the `@tool` decorators with `ast`, so nothing is imported. Cross-references
+(agent -> tool / collaborator / knowledge base, guideline -> tool, flow step ->
+tool, tool -> connection, knowledge base -> document) are resolved and every
+broken one is reported together. The result is pickled to
+`.adk_cache/manifest.pickle` with the size, mtime and SHA-256 of each source
+file; `load_manifest` reuses it until a source file's content changes.
+"""
+import argparse
+import ast
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+from pydantic import BaseModel, Field
+
+from runtime.toolbox import PROJECT_ROOT
+
+MANIFEST_VERSION = 1
+SOURCE_GLOBS = {
+    "connection": "connections/*.yaml",
+    "tool_spec": "tools/*.yaml",
+    "python_tool": "tools/*.py",
+    "knowledge_base": "knowledge-bases/*.yaml",
+    "flow": "flows/*.yaml",
+    "agent": "agents/*.yaml",
+}
+
+_loaded: Dict[Path, "Manifest"] = {}
+
+
+class ManifestError(Exception):
+    """Raised when the project has unresolvable references; `errors` lists all of them."""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("Invalid project manifest:\n  " + "\n  ".join(errors))
+
+
+class Resource(BaseModel):
+    name: str
+    path: str
+    config: Dict[str, Any] = Field(default_factory=dict)
+
+
+class ToolEntry(BaseModel):
+    name: str
+    toolkit: str
+    path: str
+    entrypoint: Optional[str] = None
+    permission: str = "read_only"
+    description: str = ""
+    connections: List[str] = Field(default_factory=list)
+    spec: Optional[str] = None
+
+
+class Manifest(BaseModel):
+    root: str
+    connections: Dict[str, Resource] = Field(default_factory=dict)
+    tools: Dict[str, ToolEntry] = Field(default_factory=dict)
+    knowledge_bases: Dict[str, Resource] = Field(default_factory=dict)
+    flows: Dict[str, Resource] = Field(default_factory=dict)
+    agents: Dict[str, Resource] = Field(default_factory=dict)
+    errors: List[str] = Field(default_factory=list)
+    warnings: List[str] = Field(default_factory=list)
+
+    def tool(self, name: str) -> ToolEntry:
+        if name not in self.tools:
+            raise KeyError(f"Unknown tool: {name}")
+        return self.tools[name]
+
+    def agent_order(self) -> List[str]:
+        """Agent names with every collaborator before the agents that use it."""
+        order, visiting = [], set()
+
+        def visit(name):
+            if name in order or name not in self.agents:
+                return
+            if name in visiting:
+                raise ManifestError([f"Agent {name} is part of a collaborator cycle"])
+            visiting.add(name)
+            for collaborator in self.agents[name].config.get("collaborators") or []:
+                visit(collaborator)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in sorted(self.agents):
+            visit(name)
+        return order
+
+
+def _relative(path: Path, root: Path) -> str:
+    try:
+        return path.resolve().relative_to(root).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _read_yaml(path: Path, errors: List[str], root: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r") as f:
+            config = yaml.safe_load(f)
+    except yaml.YAMLError as e:
+        errors.append(f"{_relative(path, root)}: invalid YAML ({e})")
+        return None
+    if not isinstance(config, dict) or not config.get("name") and not config.get("app_id"):
+        errors.append(f"{_relative(path, root)}: missing name")
+        return None
+    return config
+
+
+def _literal(node: Optional[ast.AST], constants: Dict[str, Any]) -> Any:
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        return constants.get(node.id)
+    if isinstance(node, ast.Attribute):
+        # Enum members such as ToolPermission.READ_WRITE and ConnectionType.BASIC_AUTH
+        return node.attr.lower()
+    if isinstance(node, ast.Dict):
+        return {_literal(k, constants): _literal(v, constants) for k, v in zip(node.keys, node.values)}
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [_literal(item, constants) for item in node.elts]
+    return None
+
+
+def _is_tool_decorator(node: ast.AST) -> bool:
+    target = node.func if isinstance(node, ast.Call) else node
+    return (isinstance(target, ast.Name) and target.id == "tool") or \
+        (isinstance(target, ast.Attribute) and target.attr == "tool")
+
+
+def python_tools(path: Path, root: Path) -> List[ToolEntry]:
+    """Read the `@tool` functions of a module without importing it."""
+    tree = ast.parse(path.read_text(encoding="utf-8"), str(path))
+    # Only module-level literals are resolved, so a tool names its connection app_id as a literal
+    # assigned in its own module (`CONNECTION_SNOW = 'service-now'`), not one imported from a helper.
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    constants[target.id] = node.value.value
+
+    tools = []
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        decorator = next((d for d in node.decorator_list if _is_tool_decorator(d)), None)
+        if decorator is None:
+            continue
+        kwargs = {kw.arg: kw.value for kw in decorator.keywords} if isinstance(decorator, ast.Call) else {}
+        description = _literal(kwargs.get("description"), constants) or \
+            (ast.get_docstring(node) or "").strip().split("\n")[0]
+        credentials = _literal(kwargs.get("expected_credentials"), constants) or []
+        tools.append(ToolEntry(
+            name=_literal(kwargs.get("name"), constants) or node.name,
+            toolkit="python",
+            path=_relative(path, root),
+            entrypoint=f"{path.stem}:{node.name}",
+            permission=_literal(kwargs.get("permission"), constants) or "read_only",
+            description=description,
+            connections=[c["app_id"] for c in credentials if isinstance(c, dict) and c.get("app_id")],
+        ))
+    return tools
+
+
+def _resolve_document(doc: str, kb_path: Path) -> Path:
+    # `orchestrate knowledge-bases import` resolves documents against the YAML's directory
+    return kb_path.parent / doc
+
+
+def compile_manifest(root: Path = PROJECT_ROOT) -> Tuple[Manifest, List[Path]]:
+    """
+    Parse and cross-check every resource of a project.
+
+    Args:
+        root: Project directory
+
+    Returns:
+        tuple: The manifest (with `errors` and `warnings` filled in) and every
+        file it was built from, for the cache fingerprint
+    """
+    from runtime.flow_runner import FlowError, parse_flow
+
+    root = Path(root).resolve()
+    manifest = Manifest(root=str(root))
+    errors, warnings = manifest.errors, manifest.warnings
+    sources = {kind: sorted(root.glob(pattern)) for kind, pattern in SOURCE_GLOBS.items()}
+    inputs = [path for paths in sources.values() for path in paths]
+
+    def register(table: Dict[str, Any], name: str, entry: Any, kind: str):
+        if name in table:
+            errors.append(f"{entry.path}: duplicate {kind} {name} (also in {table[name].path})")
+        else:
+            table[name] = entry
+
+    for path in sources["connection"]:
+        config = _read_yaml(path, errors, root)
+        if config is not None:
+            app_id = config.get("app_id") or config["name"]
+            register(manifest.connections, app_id, Resource(name=app_id, path=_relative(path, root), config=config),
+                     "connection")
+
+    for path in sources["python_tool"]:
+        try:
+            entries = python_tools(path, root)
+        except SyntaxError as e:
+            errors.append(f"{_relative(path, root)}: {e}")
+            continue
+        for entry in entries:
+            register(manifest.tools, entry.name, entry, "tool")
+
+    for path in sources["tool_spec"]:
+        config = _read_yaml(path, errors, root)
+        if config is None:
+            continue
+        name, rel = config["name"], _relative(path, root)
+        entry = manifest.tools.get(name)
+        if entry is None or entry.entrypoint != config.get("entrypoint"):
+            errors.append(f"{rel}: entrypoint {config.get('entrypoint')} is not a @tool named {name}")
+            continue
+        entry.spec = rel
+        entry.description = config.get("description") or entry.description
+        if config.get("connection") and config["connection"] not in entry.connections:
+            entry.connections.append(config["connection"])
+
+    for path in sources["knowledge_base"]:
+        config = _read_yaml(path, errors, root)
+        if config is None:
+            continue
+        resource = Resource(name=config["name"], path=_relative(path, root), config=config)
+        for doc in config.get("documents") or []:
+            document = _resolve_document(doc, path)
+            inputs.append(document)
+            if not document.exists():
+                errors.append(f"{resource.path}: document {doc} does not exist")
+        register(manifest.knowledge_bases, resource.name, resource, "knowledge base")
+
+    for path in sources["flow"]:
+        config = _read_yaml(path, errors, root)
+        if config is None:
+            continue
+        resource = Resource(name=config["name"], path=_relative(path, root), config=config)
+        try:
+            spec = parse_flow(config)
+        except (FlowError, ValueError) as e:
+            errors.append(f"{resource.path}: {e}")
+            continue
+        register(manifest.flows, resource.name, resource, "flow")
+        for step in spec.steps:
+            if step.tool not in manifest.tools:
+                errors.append(f"{resource.path}: step {step.id} uses unknown tool {step.tool}")
+        if resource.name not in manifest.tools:
+            # Flows are imported as tools and can be listed in an agent's tools
+            manifest.tools[resource.name] = ToolEntry(name=resource.name, toolkit="flow", path=resource.path,
+                                                      permission="read_write", description=config.get("description", ""))
+
+    for path in sources["agent"]:
+        config = _read_yaml(path, errors, root)
+        if config is not None:
+            register(manifest.agents, config["name"], Resource(name=config["name"], path=_relative(path, root),
+                                                               config=config), "agent")
+
+    for agent in manifest.agents.values():
+        for tool in agent.config.get("tools") or []:
+            if tool not in manifest.tools:
+                errors.append(f"{agent.path}: unknown tool {tool}")
+        for collaborator in agent.config.get("collaborators") or []:
+            if collaborator not in manifest.agents:
+                errors.append(f"{agent.path}: unknown collaborator {collaborator}")
+        for kb in agent.config.get("knowledge_bases") or []:
+            if kb not in manifest.knowledge_bases:
+                errors.append(f"{agent.path}: unknown knowledge base {kb}")
+        for guideline in agent.config.get("guidelines") or []:
+            tool = guideline.get("tool")
+            if tool and tool not in (agent.config.get("tools") or []):
+                errors.append(f"{agent.path}: guideline {guideline.get('display_name')!r} invokes {tool}, "
+                              f"which is not one of the agent's tools")
+        for prompt in (agent.config.get("starter_prompts") or {}).get("prompts") or []:
+            for tool in prompt.get("prefetch") or []:
+                if tool not in (agent.config.get("tools") or []):
+                    errors.append(f"{agent.path}: starter prompt {prompt.get('id')!r} prefetches {tool}, "
+                                  f"which is not one of the agent's tools")
+    try:
+        manifest.agent_order()
+    except ManifestError as e:
+        errors.extend(e.errors)
+
+    for entry in manifest.tools.values():
+        for app_id in entry.connections:
+            if app_id not in manifest.connections:
+                # run-service-now.sh creates its connection with the CLI instead of a YAML file
+                warnings.append(f"{entry.path}: connection {app_id} is not defined in connections/")
+    return manifest, inputs
+
+
+def _fingerprint(path: Path) -> Optional[Tuple[int, int, str]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _unchanged(root: Path, files: Dict[str, Any]) -> Tuple[bool, bool]:
+    """Whether the cached files still have the same content, and whether only their mtimes moved."""
+    current = {_relative(p, root) for pattern in SOURCE_GLOBS.values() for p in root.glob(pattern)}
+    if not current <= set(files):
+        return False, False
+    touched = False
+    for rel, recorded in files.items():
+        path = root / rel
+        if recorded is None:
+            if path.exists():
+                return False, False
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return False, False
+        if (stat.st_mtime_ns, stat.st_size) == tuple(recorded[:2]):
+            continue
+        if stat.st_size != recorded[1] or hashlib.sha256(path.read_bytes()).hexdigest() != recorded[2]:
+            return False, False
+        touched = True
+    return True, touched
+
+
+def _write_cache(cache_path: Path, manifest: Manifest, files: Dict[str, Any]):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump({"version": MANIFEST_VERSION, "files": files, "manifest": manifest}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cache_path)
+
+
+def load_manifest(root: Path = PROJECT_ROOT, strict: bool = True, cache_path: Optional[Path] = None,
+                  use_cache: bool = True) -> Manifest:
+    """
+    Return the project manifest, compiling it only when a source file changed.
+
+    Args:
+        root: Project directory
+        strict: Raise ManifestError if the project has broken references
+        cache_path: Pickle location (default: <root>/.adk_cache/manifest.pickle)
+        use_cache: Set to False to always recompile
+
+    Raises:
+        ManifestError: If `strict` and any reference could not be resolved
+    """
+    root = Path(root).resolve()
+    cache_path = Path(cache_path or root / ".adk_cache" / "manifest.pickle")
+
+    manifest = None
+    if use_cache and cache_path.exists():
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            cached = None
+        if cached and cached.get("version") == MANIFEST_VERSION and cached["manifest"].root == str(root):
+            unchanged, touched = _unchanged(root, cached["files"])
+            if unchanged:
+                manifest = cached["manifest"]
+                if touched:
+                    files = {rel: _fingerprint(root / rel) for rel in cached["files"]}
+                    _write_cache(cache_path, manifest, files)
+
+    if manifest is None:
+        manifest, inputs = compile_manifest(root)
+        if use_cache:
+            _write_cache(cache_path, manifest, {_relative(p, root): _fingerprint(p) for p in inputs})
+
+    if strict and manifest.errors:
+        raise ManifestError(manifest.errors)
+    return manifest
+
+
+def get_manifest() -> Manifest:
+    """The project manifest, loaded at most once per process; broken references are left in `errors`."""
+    if PROJECT_ROOT not in _loaded:
+        _loaded[PROJECT_ROOT] = load_manifest(PROJECT_ROOT, strict=False)
+    return _loaded[PROJECT_ROOT]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile and validate the project manifest")
+    parser.add_argument("--root", default=str(PROJECT_ROOT))
+    parser.add_argument("--json", action="store_true", help="Print the compiled registry")
+    parser.add_argument("--no-cache", action="store_true", help="Recompile even if nothing changed")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest(Path(args.root), strict=False, use_cache=not args.no_cache)
+    if args.json:
+        print(manifest.model_dump_json(indent=2))
+    for warning in manifest.warnings:
+        print(f"warning: {warning}", file=sys.stderr)
+    for error in manifest.errors:
+        print(f"error: {error}", file=sys.stderr)
+    counts = {kind: len(getattr(manifest, kind)) for kind in
+              ("connections", "tools", "knowledge_bases", "flows", "agents")}
+    print(", ".join(f"{count} {kind}" for kind, count in counts.items()), file=sys.stderr)
+    return 1 if manifest.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
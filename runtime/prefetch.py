@@ -0,0 +1,244 @@
+"""
+Background prefetch of the tool results a conversation is likely to need first.
+
+    session = start_session("customer_care_agent", {"plan": "PPO", "location": "Boston"})
+    ...
+    session.cancel()    # the conversation ended before the prefetch did
+
+    prefetch_for_prompt("onboarding_agent", "prompt_onboard", {"email": "alice@example.com"})
+
+Most sessions start the same way: the user's directory entry, their benefits
+plan, their recent incidents. `start_session` calls the cached tools of the
+agent and its collaborators concurrently in the background through
+`resolve_tool`, with the arguments the session context supplies (`PREFETCH`),
+so the results land in the tool cache and the conversation's first real call
+is a hit. A starter prompt in `agents/*.yaml` can list the tools its
+conversation starts with under `prefetch:`; `prefetch_for_prompt` runs those.
+
+Each session has a budget: at most PREFETCH_MAX_CALLS (default 8) calls, started
+within PREFETCH_BUDGET_S (default 2) seconds of the session start, on
+PREFETCH_WORKERS (default 4) threads. Calls that have not started when the
+budget runs out or the session is cancelled are skipped; calls already running
+cannot be interrupted, finish in the background and still fill the cache.
+Prefetch calls run at batch priority, so the user's own ServiceNow calls
+overtake them in the client-side rate limiter. Failures are recorded in the
+session, never raised.
+
+    python -m runtime.prefetch customer_care_agent --context plan=PPO --context location=Boston --mock-services
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from runtime.manifest import get_manifest
+from runtime.toolbox import is_error_result, resolve_tool
+
+# tool -> the calls to prefetch for a session context; none when the context lacks a required argument
+PREFETCH: Dict[str, Callable[[Dict[str, Any]], List[Dict[str, Any]]]] = {
+    "get_directory_tool": lambda context: [{"email": context["email"]}] if context.get("email") else [],
+    "get_healthcare_benefits": lambda context: [{"plan": context["plan"]}] if context.get("plan") else [],
+    "search_healthcare_providers": lambda context: [{"location": context["location"]}]
+    if context.get("location") else [],
+    "get_my_service_now_incidents": lambda context: [{}],
+    "get_my_service_now_incident_stats": lambda context: [{}],
+}
+
+
+class PrefetchCall(BaseModel):
+    tool: str
+    arguments: Dict[str, Any] = Field(default_factory=dict)
+    status: str = "pending"
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+def _setting(name: str, default: str) -> float:
+    return float(os.environ.get(name, default))
+
+
+class PrefetchSession:
+    """
+    The prefetch calls of one conversation, run on their own small thread pool.
+
+    Args:
+        calls: Calls in order of priority; those beyond `max_calls` are skipped
+        max_calls: Most calls to make (PREFETCH_MAX_CALLS)
+        budget: Seconds after `start` in which calls may still be started (PREFETCH_BUDGET_S)
+        workers: Calls run concurrently (PREFETCH_WORKERS)
+        resolver: Tool name -> callable
+    """
+
+    def __init__(self, calls: List[PrefetchCall], max_calls: Optional[int] = None, budget: Optional[float] = None,
+                 workers: Optional[int] = None, resolver: Callable[[str], Callable] = resolve_tool):
+        self.calls = calls
+        self.max_calls = int(_setting("PREFETCH_MAX_CALLS", "8")) if max_calls is None else max_calls
+        self.budget = _setting("PREFETCH_BUDGET_S", "2") if budget is None else budget
+        self.workers = int(_setting("PREFETCH_WORKERS", "4")) if workers is None else workers
+        self.resolver = resolver
+        self.started = 0.0
+        self.deadline = 0.0
+        self._cancelled = threading.Event()
+        self._futures: Dict[Future, PrefetchCall] = {}
+
+    def _run(self, call: PrefetchCall):
+        if self._cancelled.is_set():
+            call.status = "cancelled"
+            return
+        if time.monotonic() > self.deadline:
+            call.status, call.error = "skipped", "time budget exhausted"
+            return
+        call.status = "running"
+        started = time.perf_counter()
+        try:
+            tool = self.resolver(call.tool)
+            # The tools directory is importable once a tool has been resolved
+            from rate_limit import Priority, priority
+
+            with priority(Priority.BATCH):
+                result = tool(**call.arguments)
+            if is_error_result(result):
+                call.status, call.error = "failed", result
+            else:
+                call.status = "succeeded"
+        except Exception as e:
+            call.status, call.error = "failed", str(e)
+        call.elapsed = time.perf_counter() - started
+
+    def start(self) -> "PrefetchSession":
+        """Submit the calls and return at once."""
+        self.started = time.perf_counter()
+        self.deadline = time.monotonic() + self.budget
+        for call in self.calls[self.max_calls:]:
+            call.status, call.error = "skipped", "call budget exhausted"
+        calls = self.calls[:self.max_calls]
+        if not calls:
+            return self
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(calls))),
+                                      thread_name_prefix="prefetch")
+        for call in calls:
+            self._futures[executor.submit(self._run, call)] = call
+        executor.shutdown(wait=False)
+        return self
+
+    def cancel(self):
+        """Skip the calls that have not started yet."""
+        self._cancelled.set()
+        for future, call in self._futures.items():
+            if future.cancel():
+                call.status = "cancelled"
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the running calls; True if all of them have finished."""
+        _, pending = wait(self._futures, timeout=timeout)
+        return not pending
+
+    @property
+    def done(self) -> bool:
+        return all(future.done() for future in self._futures)
+
+    def summary(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for call in self.calls:
+            counts[call.status] = counts.get(call.status, 0) + 1
+        return {"calls": [call.model_dump() for call in self.calls], "status": counts}
+
+
+def plan_calls(tools: List[str], context: Dict[str, Any]) -> List[PrefetchCall]:
+    """The prefetch calls of `tools` for a session context, skipping tools that are not prefetchable."""
+    calls, seen = [], set()
+    for tool in tools:
+        for arguments in PREFETCH.get(tool, lambda _: [])(context):
+            key = (tool, json.dumps(arguments, sort_keys=True, default=str))
+            if key not in seen:
+                seen.add(key)
+                calls.append(PrefetchCall(tool=tool, arguments=arguments))
+    return calls
+
+
+def session_tools(agent: str) -> List[str]:
+    """The agent's tools followed by those of its collaborators, recursively."""
+    manifest = get_manifest()
+    if agent not in manifest.agents:
+        raise KeyError(f"Unknown agent: {agent}")
+    tools, visited, queue = [], set(), [agent]
+    while queue:
+        name = queue.pop(0)
+        if name in visited or name not in manifest.agents:
+            continue
+        visited.add(name)
+        config = manifest.agents[name].config
+        tools.extend(tool for tool in config.get("tools") or [] if tool not in tools)
+        queue.extend(config.get("collaborators") or [])
+    return tools
+
+
+def prompt_tools(agent: str, prompt: str) -> List[str]:
+    """The `prefetch` tools of one of the agent's starter prompts, found by id or by its text."""
+    manifest = get_manifest()
+    if agent not in manifest.agents:
+        raise KeyError(f"Unknown agent: {agent}")
+    prompts = (manifest.agents[agent].config.get("starter_prompts") or {}).get("prompts") or []
+    for entry in prompts:
+        if prompt in (entry.get("id"), entry.get("prompt")):
+            return list(entry.get("prefetch") or [])
+    raise KeyError(f"Agent {agent} has no starter prompt {prompt!r}")
+
+
+def start_session(agent: str, context: Optional[Dict[str, Any]] = None, **options) -> PrefetchSession:
+    """
+    Start prefetching for a new conversation with `agent`.
+
+    Args:
+        agent: Name of the agent the conversation is with
+        context: What is known about the user: `email`, `plan`, `location`
+        **options: `max_calls`, `budget`, `workers` or `resolver` for the PrefetchSession
+
+    Returns:
+        PrefetchSession: The running session, to cancel or wait for
+    """
+    return PrefetchSession(plan_calls(session_tools(agent), context or {}), **options).start()
+
+
+def prefetch_for_prompt(agent: str, prompt: str, context: Optional[Dict[str, Any]] = None,
+                        **options) -> PrefetchSession:
+    """Start prefetching the tools a starter prompt (id or text) of `agent` lists under `prefetch`."""
+    return PrefetchSession(plan_calls(prompt_tools(agent, prompt), context or {}), **options).start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prefetch the tool results a conversation starts with")
+    parser.add_argument("agent", help="Agent the conversation is with, e.g. customer_care_agent")
+    parser.add_argument("--prompt", help="Prefetch for this starter prompt (id or text) instead of the session")
+    parser.add_argument("--context", "-c", action="append", default=[], metavar="KEY=VALUE",
+                        help="What is known about the user (email, plan, location)")
+    parser.add_argument("--max-calls", type=int)
+    parser.add_argument("--budget", type=float, help="Seconds in which calls may be started")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--mock-services", action="store_true", help="Run the tools against in-process mocks")
+    args = parser.parse_args(argv)
+
+    context = dict(pair.partition("=")[::2] for pair in args.context)
+    options = {"max_calls": args.max_calls, "budget": args.budget, "workers": args.workers}
+    if args.mock_services:
+        from mocks.harness import MockServices
+    with MockServices() if args.mock_services else nullcontext():
+        if args.prompt:
+            session = prefetch_for_prompt(args.agent, args.prompt, context, **options)
+        else:
+            session = start_session(args.agent, context, **options)
+        session.wait()
+    print(json.dumps({"agent": args.agent, "elapsed": round(time.perf_counter() - session.started, 3),
+                      **session.summary()}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Deterministic routing for agent guidelines.
+
+Every `query contains "..."` guideline condition in `agents/*.yaml` is compiled
+into a single Aho-Corasick automaton, so a query is matched against all of them
+in one pass over its characters. When exactly one guideline fires and the
+mapped tool's required arguments can be read off the query (emails, ISO
+timestamps), the tool is called directly; otherwise the query goes to the LLM.
+
+    python -m runtime.router "What department is alice@example.com in?" --agent onboarding_agent
+"""
+import argparse
+import inspect
+import json
+import re
+import sys
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import yaml
+from pydantic import BaseModel, Field
+
+from runtime.manifest import get_manifest
+from runtime.toolbox import resolve_tool
+
+CONDITION = re.compile(r'^\s*query\s+contains\s+"([^"]+)"\s*$', re.IGNORECASE)
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+ISO_DATETIME = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(?::\d{2})?")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher; `find` runs in time linear in the text plus the number of matches."""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Any]] = [[]]
+
+    def add(self, pattern: str, value: Any):
+        node = 0
+        for char in pattern:
+            if char not in self._goto[node]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][char] = len(self._goto) - 1
+            node = self._goto[node][char]
+        self._out[node].append(value)
+
+    def build(self) -> "AhoCorasick":
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        return self
+
+    def find(self, text: str) -> Iterator[Tuple[int, Any]]:
+        """Yield `(end_index, value)` for every pattern occurrence in `text`."""
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for value in self._out[node]:
+                yield index, value
+
+
+class Guideline(BaseModel):
+    agent: str
+    display_name: str
+    phrase: str
+    tool: str
+
+
+class RouteDecision(BaseModel):
+    fast_path: bool
+    agent: Optional[str] = None
+    tool: Optional[str] = None
+    guideline: Optional[str] = None
+    arguments: Dict[str, Any] = Field(default_factory=dict)
+    matched: List[str] = Field(default_factory=list)
+    reason: str = ""
+
+
+def guidelines_from_configs(agents: Iterable[Dict[str, Any]]) -> Tuple[List[Guideline], List[str]]:
+    """
+    Collect the guidelines of parsed agent YAML documents.
+
+    Returns:
+        tuple: The compilable guidelines, and the agents that also have guidelines
+        whose condition is not a plain `query contains` (those always use the LLM)
+    """
+    guidelines, inexact = [], []
+    for agent in agents:
+        for guideline in agent.get("guidelines") or []:
+            match = CONDITION.match(guideline.get("condition", ""))
+            if match is None or guideline.get("action") != "invoke" or not guideline.get("tool"):
+                inexact.append(agent["name"])
+                continue
+            guidelines.append(Guideline(agent=agent["name"], display_name=guideline["display_name"],
+                                        phrase=_normalize(match.group(1)), tool=guideline["tool"]))
+    return guidelines, sorted(set(inexact))
+
+
+def load_guidelines(paths: Iterable[Path]) -> Tuple[List[Guideline], List[str]]:
+    """Read guidelines from agent YAML files; see `guidelines_from_configs`."""
+    agents = []
+    for path in paths:
+        with open(path, "r") as f:
+            agents.append(yaml.safe_load(f))
+    return guidelines_from_configs(agents)
+
+
+def extract_arguments(fn: Callable, query: str) -> Tuple[Dict[str, Any], List[str]]:
+    """Fill the tool parameters that can be read off the query; returns the arguments and missing required names."""
+    emails = EMAIL.findall(query)
+    timestamps = ISO_DATETIME.findall(query)
+    arguments, missing = {}, []
+    for name, param in inspect.signature(getattr(fn, "fn", fn)).parameters.items():
+        if name == "participants" and emails:
+            arguments[name] = emails
+        elif "email" in name and len(emails) == 1:
+            arguments[name] = emails[0]
+        elif name.endswith("_time") and len(timestamps) == 1:
+            arguments[name] = timestamps[0]
+        elif param.default is inspect.Parameter.empty:
+            missing.append(name)
+    return arguments, missing
+
+
+class GuidelineRouter:
+    """Routes queries to tools using the compiled guidelines of all agents."""
+
+    def __init__(self, agent_paths: Optional[Iterable[Path]] = None, resolver: Callable[[str], Callable] = resolve_tool):
+        if agent_paths is None:
+            manifest = get_manifest()
+            self.guidelines, self.inexact_agents = guidelines_from_configs(
+                manifest.agents[name].config for name in sorted(manifest.agents))
+        else:
+            self.guidelines, self.inexact_agents = load_guidelines(agent_paths)
+        self.resolver = resolver
+        self.automaton = AhoCorasick()
+        for index, guideline in enumerate(self.guidelines):
+            self.automaton.add(guideline.phrase, index)
+        self.automaton.build()
+        self._lock = threading.Lock()
+        self._stats = {"queries": 0, "fast_path": 0, "fallback": 0}
+
+    def match(self, query: str, agent: Optional[str] = None) -> List[Guideline]:
+        fired = sorted({index for _, index in self.automaton.find(_normalize(query))})
+        return [self.guidelines[i] for i in fired if agent is None or self.guidelines[i].agent == agent]
+
+    def route(self, query: str, agent: Optional[str] = None) -> RouteDecision:
+        """Decide whether a query can skip the LLM, without calling any tool."""
+        matched = self.match(query, agent)
+        names = [g.display_name for g in matched]
+        if agent in self.inexact_agents:
+            return RouteDecision(fast_path=False, agent=agent, matched=names,
+                                 reason="agent has guidelines that cannot be evaluated locally")
+        if len(matched) != 1:
+            reason = "no guideline matched" if not matched else "more than one guideline matched"
+            return RouteDecision(fast_path=False, agent=agent, matched=names, reason=reason)
+
+        guideline = matched[0]
+        decision = RouteDecision(fast_path=False, agent=guideline.agent, tool=guideline.tool,
+                                 guideline=guideline.display_name, matched=names)
+        try:
+            arguments, missing = extract_arguments(self.resolver(guideline.tool), query)
+        except KeyError:
+            decision.reason = f"unknown tool {guideline.tool}"
+            return decision
+        if missing:
+            decision.reason = f"missing arguments: {', '.join(missing)}"
+            return decision
+        decision.fast_path = True
+        decision.arguments = arguments
+        return decision
+
+    def dispatch(self, query: str, llm: Callable[[str], Any], agent: Optional[str] = None) -> Tuple[RouteDecision, Any]:
+        """
+        Answer a query through the fast path when possible, otherwise through `llm`.
+
+        Args:
+            query: The user query
+            llm: Fallback called with the query when the fast path does not apply
+            agent: Restrict matching to this agent's guidelines
+
+        Returns:
+            tuple: The routing decision and the tool or LLM result
+        """
+        decision = self.route(query, agent)
+        with self._lock:
+            self._stats["queries"] += 1
+            self._stats["fast_path" if decision.fast_path else "fallback"] += 1
+        if decision.fast_path:
+            return decision, self.resolver(decision.tool)(**decision.arguments)
+        return decision, llm(query)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["fast_path_rate"] = round(stats["fast_path"] / stats["queries"], 4) if stats["queries"] else 0.0
+        return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show how a query would be routed by the agent guidelines")
+    parser.add_argument("query", nargs="+")
+    parser.add_argument("--agent", help="Only use this agent's guidelines")
+    parser.add_argument("--dispatch", action="store_true", help="Call the tool when the fast path applies")
+    args = parser.parse_args(argv)
+
+    router = GuidelineRouter()
+    for query in args.query:
+        if args.dispatch:
+            decision, result = router.dispatch(query, llm=lambda q: None, agent=args.agent)
+            print(json.dumps({**decision.model_dump(), "result": result}, default=str))
+        else:
+            print(router.route(query, args.agent).model_dump_json())
+    if args.dispatch:
+        print(json.dumps(router.stats()), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
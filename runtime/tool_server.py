@@ -0,0 +1,211 @@
+"""
+Long-lived local server for the Python tools.
+
+    python -m runtime.tool_server --port 8090 --workers 32 --mock-services
+    curl -X POST localhost:8090/tools/get_directory_tool -d '{"email": "alice@example.com"}'
+    curl -X POST localhost:8090/batch -d '{"calls": [{"tool": "get_my_claims"}, {"tool": "get_healthcare_benefits", "arguments": {"plan": "PPO"}}]}'
+
+Running a tool as its own import-and-call pays for the interpreter, the ADK
+and the tool's imports every time, and throws its HTTP connections away. The
+server imports every Python tool in the manifest once at startup through
+`resolve_tool`, opens the shared HTTP session (`http_client.get_session()`)
+and keeps a pool of TOOL_SERVER_WORKERS (default 32) threads the tool calls run
+on, so a call costs about what the tool itself does.
+
+- `GET /tools`: the loaded tools with their permission and description, and
+  the tools that failed to import with the error
+- `POST /tools/{name}`: call one tool with the JSON body as its keyword arguments
+- `POST /batch`: run `calls` concurrently (at most `max_concurrency` at a time)
+  and return one result per call, in the order of the calls
+
+A call's result has `status` `succeeded` or `failed`. A tool that raises or
+reports an error (a ❌ string) fails that call only; the rest of a batch is
+unaffected. Unknown tools are 404 and arguments that do not fit the tool's
+signature 422 for a single call, and failed results in a batch.
+"""
+import argparse
+import asyncio
+import inspect
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import Body, FastAPI, HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field
+
+from runtime.manifest import get_manifest
+from runtime.toolbox import is_error_result, resolve_tool
+
+DEFAULT_WORKERS = 32
+
+
+class ToolCall(BaseModel):
+    tool: str
+    arguments: Dict[str, Any] = Field(default_factory=dict)
+    id: Optional[str] = None
+
+
+class CallResult(BaseModel):
+    tool: str
+    id: Optional[str] = None
+    status: str
+    result: Any = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+
+class BatchRequest(BaseModel):
+    calls: List[ToolCall]
+    max_concurrency: Optional[int] = None
+
+
+class BatchResult(BaseModel):
+    results: List[CallResult]
+    elapsed_ms: float
+
+
+class ToolRegistry:
+    """
+    The Python tools of the project, imported once.
+
+    Args:
+        names: Tools to load; all Python tools in the manifest by default
+        resolver: Tool name -> callable
+    """
+
+    def __init__(self, names: Optional[List[str]] = None, resolver: Callable[[str], Callable] = resolve_tool):
+        manifest = get_manifest()
+        if names is None:
+            names = sorted(name for name, entry in manifest.tools.items() if entry.entrypoint is not None)
+        self.entries = {name: manifest.tools[name] for name in names if name in manifest.tools}
+        self.tools: Dict[str, Callable] = {}
+        self.signatures: Dict[str, inspect.Signature] = {}
+        self.errors: Dict[str, str] = {}
+        for name in names:
+            try:
+                tool = resolver(name)
+            except Exception as e:
+                self.errors[name] = f"{type(e).__name__}: {e}"
+                continue
+            self.tools[name] = tool
+            self.signatures[name] = inspect.signature(getattr(tool, "fn", tool))
+
+    def describe(self) -> Dict[str, Any]:
+        tools = []
+        for name in self.tools:
+            entry = self.entries.get(name)
+            tools.append({"name": name, "permission": entry.permission if entry else None,
+                          "description": entry.description if entry else "",
+                          "parameters": list(self.signatures[name].parameters)})
+        return {"tools": tools, "unavailable": self.errors}
+
+    def check(self, call: ToolCall):
+        """
+        Raises:
+            KeyError: If the tool is not loaded
+            TypeError: If the arguments do not fit the tool's signature
+        """
+        if call.tool not in self.tools:
+            reason = self.errors.get(call.tool)
+            raise KeyError(f"Tool {call.tool} failed to load: {reason}" if reason else f"Unknown tool: {call.tool}")
+        self.signatures[call.tool].bind(**call.arguments)
+
+    def call(self, call: ToolCall) -> CallResult:
+        started = time.perf_counter()
+        try:
+            self.check(call)
+            result = self.tools[call.tool](**call.arguments)
+        except Exception as e:
+            error = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+            return CallResult(tool=call.tool, id=call.id, status="failed", error=error,
+                              elapsed_ms=(time.perf_counter() - started) * 1000)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if is_error_result(result):
+            return CallResult(tool=call.tool, id=call.id, status="failed", error=result, elapsed_ms=elapsed_ms)
+        return CallResult(tool=call.tool, id=call.id, status="succeeded", result=jsonable_encoder(result),
+                          elapsed_ms=elapsed_ms)
+
+
+def create_app(names: Optional[List[str]] = None, workers: Optional[int] = None) -> FastAPI:
+    """
+    Build the tool server; the tools are loaded and the pools created when the app starts.
+
+    Args:
+        names: Tools to serve; all Python tools in the manifest by default
+        workers: Threads tool calls run on (TOOL_SERVER_WORKERS)
+    """
+    workers = workers or int(os.environ.get("TOOL_SERVER_WORKERS", DEFAULT_WORKERS))
+    state: Dict[str, Any] = {}
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        state["registry"] = ToolRegistry(names)
+        # Open the shared HTTP session now rather than in the first call
+        from http_client import get_session
+
+        get_session()
+        state["executor"] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tool-server")
+        try:
+            yield
+        finally:
+            state["executor"].shutdown(wait=True)
+
+    app = FastAPI(title="Tool server", lifespan=lifespan)
+
+    async def run(call: ToolCall) -> CallResult:
+        return await asyncio.get_running_loop().run_in_executor(state["executor"], state["registry"].call, call)
+
+    @app.get("/tools")
+    def list_tools() -> Dict[str, Any]:
+        return state["registry"].describe()
+
+    @app.post("/tools/{name}", response_model=CallResult)
+    async def call_tool(name: str, arguments: Dict[str, Any] = Body(default_factory=dict)) -> CallResult:
+        call = ToolCall(tool=name, arguments=arguments)
+        try:
+            state["registry"].check(call)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=e.args[0])
+        except TypeError as e:
+            raise HTTPException(status_code=422, detail=f"Invalid arguments for {name}: {e}")
+        return await run(call)
+
+    @app.post("/batch", response_model=BatchResult)
+    async def batch(request: BatchRequest) -> BatchResult:
+        started = time.perf_counter()
+        limit = asyncio.Semaphore(max(1, request.max_concurrency or workers))
+
+        async def bounded(call: ToolCall) -> CallResult:
+            async with limit:
+                return await run(call)
+
+        results = await asyncio.gather(*(bounded(call) for call in request.calls))
+        return BatchResult(results=list(results), elapsed_ms=(time.perf_counter() - started) * 1000)
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Python tools over HTTP from one warm process")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--workers", type=int, help=f"Threads tool calls run on (default {DEFAULT_WORKERS})")
+    parser.add_argument("--tools", nargs="+", help="Serve only these tools")
+    parser.add_argument("--mock-services", action="store_true", help="Run the tools against in-process mocks")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    if args.mock_services:
+        from mocks.harness import MockServices
+    with MockServices() if args.mock_services else nullcontext():
+        uvicorn.run(create_app(args.tools, args.workers), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import importlib
+import sys
+from pathlib import Path
+from typing import Callable, Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TOOLS_DIR = PROJECT_ROOT / "tools"
+
+_resolved: Dict[str, Callable] = {}
+
+
+def _ensure_tools_on_path():
+    # Tools are imported with `-p ./tools`, so inside the tool runtime the tools
+    # directory is the package root and sibling modules import as top-level names.
+    tools_dir = str(TOOLS_DIR)
+    if tools_dir not in sys.path:
+        sys.path.insert(0, tools_dir)
+
+
+# Tools report failures as a string starting with ❌ rather than raising; the runtime
+# uses the tools' own check (`tools/results.py`), re-exported here.
+_ensure_tools_on_path()
+from results import is_error_result  # noqa: E402
+
+
+def _load_entrypoint(entrypoint: str) -> Callable:
+    module_name, fn_name = entrypoint.split(":")
+    _ensure_tools_on_path()
+    module = importlib.import_module(module_name)
+    return getattr(module, fn_name)
+
+
+def resolve_tool(name: str) -> Callable:
+    """
+    Resolve a tool name to its callable, the same way the agents reference it.
+
+    The tool's module and function come from the compiled project manifest
+    (see `runtime.manifest`), so only the module that defines the tool is imported.
+
+    Args:
+        name: The agent facing tool name (e.g. `create_profile_tool`)
+
+    Returns:
+        Callable: The `@tool` object, callable with the tool's keyword arguments
+
+    Raises:
+        KeyError: If no Python tool with that name exists in `tools/`
+    """
+    if name in _resolved:
+        return _resolved[name]
+
+    from runtime.manifest import get_manifest
+
+    entry = get_manifest().tool(name)
+    if entry.entrypoint is None:
+        raise KeyError(f"Tool {name} is a {entry.toolkit} tool and cannot be called directly")
+    fn = _load_entrypoint(entry.entrypoint)
+    _resolved[name] = fn
+    return fn
@@ -0,0 +1,263 @@
+"""
+Offline dense retrieval for the knowledge bases indexed by `runtime.kb_index`.
+
+    python -m runtime.vector_store build onboarding_docs
+    python -m runtime.vector_store query onboarding_docs "security training" --hybrid
+
+Chunks are embedded on the CPU, either with a sentence-transformers model (when
+installed) or with a deterministic hashing-trick embedder that needs nothing but
+NumPy. Embeddings are stored as int8 (one scale per row) or float16 in a `.npy`
+file that is memory-mapped at query time, and searched with blocked matrix
+multiplies so memory use does not grow with the number of chunks.
+"""
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from runtime.kb_index import INDEX_ROOT, KnowledgeBaseIndex, SearchHit, tokenize
+
+BLOCK_ROWS = 65536
+
+
+class HashingEmbedder:
+    """
+    Embeds text by hashing unigrams and bigrams into signed buckets.
+
+    Deterministic across processes and machines, so it is suitable for tests
+    and for reproducible benchmarks; it captures lexical, not semantic, overlap.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> Iterable[str]:
+        tokens = tokenize(text)
+        yield from tokens
+        for left, right in zip(tokens, tokens[1:]):
+            yield f"{left} {right}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                vectors[row, digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        return normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """CPU embeddings from a local sentence-transformers model (optional dependency)."""
+
+    def __init__(self, model: str = "all-MiniLM-L6-v2"):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise RuntimeError("sentence-transformers is not installed; use the hashing embedder") from e
+        self.model = SentenceTransformer(model, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"st:{model}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        return normalize(self.model.encode(list(texts), batch_size=64, convert_to_numpy=True).astype(np.float32))
+
+
+def get_embedder(name: str = "hashing"):
+    if name.startswith("st:"):
+        return SentenceTransformerEmbedder(name[3:])
+    if name.startswith("hashing"):
+        _, _, dim = name.partition("-")
+        return HashingEmbedder(int(dim) if dim else 384)
+    raise ValueError(f"Unknown embedder: {name}")
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization; returns the codes and the float32 scale of each row."""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class VectorStore:
+    """
+    A memory-mapped matrix of embeddings searched by inner product.
+
+    `vectors.npy` holds int8 codes or float16 values; for int8, `scales.npy`
+    holds the per-row dequantization scale.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        self.vectors = np.load(self.path / "vectors.npy", mmap_mode="r")
+        self.scales = np.load(self.path / "scales.npy") if self.meta["dtype"] == "int8" else None
+
+    def __len__(self):
+        return self.vectors.shape[0]
+
+    @staticmethod
+    def write(path, batches: Iterable[np.ndarray], count: int, dim: int, dtype: str = "int8",
+              meta: Optional[Dict] = None) -> "VectorStore":
+        """
+        Write embeddings to disk batch by batch, so the full float32 matrix never has to be in memory.
+
+        Args:
+            path: Directory for the store
+            batches: Float32 arrays of shape (n, dim) whose row counts add up to `count`
+            count: Total number of vectors
+            dim: Embedding dimension
+            dtype: `int8` or `float16`
+            meta: Extra metadata to keep in meta.json
+        """
+        if dtype not in ("int8", "float16"):
+            raise ValueError("dtype must be int8 or float16")
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        vectors = np.lib.format.open_memmap(path / "vectors.npy", mode="w+", dtype=dtype, shape=(count, dim))
+        scales = np.empty(count, dtype=np.float32)
+        offset = 0
+        for batch in batches:
+            end = offset + batch.shape[0]
+            if dtype == "int8":
+                vectors[offset:end], scales[offset:end] = quantize_int8(batch)
+            else:
+                vectors[offset:end] = batch.astype(np.float16)
+            offset = end
+        if offset != count:
+            raise ValueError(f"Expected {count} vectors, got {offset}")
+        vectors.flush()
+        del vectors
+        if dtype == "int8":
+            np.save(path / "scales.npy", scales)
+        (path / "meta.json").write_text(json.dumps({**(meta or {}), "dtype": dtype, "dim": dim, "count": count}))
+        return VectorStore(path)
+
+    def search(self, queries: np.ndarray, top_k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Exhaustive inner-product search for a batch of queries.
+
+        Args:
+            queries: Float32 array of shape (m, dim), normally L2-normalized
+            top_k: Results per query
+
+        Returns:
+            tuple: (indices, scores), both of shape (m, top_k), best first
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        top_k = min(top_k, len(self))
+        best_ids = np.empty((queries.shape[0], 0), dtype=np.int64)
+        best_scores = np.empty((queries.shape[0], 0), dtype=np.float32)
+        for start in range(0, len(self), BLOCK_ROWS):
+            block = np.asarray(self.vectors[start:start + BLOCK_ROWS], dtype=np.float32)
+            scores = queries @ block.T
+            if self.scales is not None:
+                scores *= self.scales[start:start + block.shape[0]]
+            k = min(top_k, scores.shape[1])
+            part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_ids = np.concatenate([best_ids, part + start], axis=1)
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, part, axis=1)], axis=1)
+            if best_ids.shape[1] > top_k:
+                keep = np.argpartition(-best_scores, top_k - 1, axis=1)[:, :top_k]
+                best_ids = np.take_along_axis(best_ids, keep, axis=1)
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        return np.take_along_axis(best_ids, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """Fuse several ranked lists of ids; scale-free, so BM25 and cosine scores need no normalization."""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+class DenseIndex:
+    """Dense (and optionally hybrid) search over the chunks of a knowledge base index."""
+
+    def __init__(self, kb_dir: Path):
+        self.kb_dir = Path(kb_dir)
+        self.store = VectorStore(self.kb_dir / "vectors")
+        self.embedder = get_embedder(self.store.meta["embedder"])
+        index = json.loads((self.kb_dir / "index.json").read_text())
+        if index["documents"] != self.store.meta.get("documents"):
+            raise RuntimeError(f"Vectors in {self.kb_dir} are stale; rerun `python -m runtime.vector_store build`")
+        self.chunks = index["chunks"]
+
+    @classmethod
+    def load(cls, name_or_dir) -> "DenseIndex":
+        path = Path(name_or_dir)
+        return cls(path if path.is_dir() else INDEX_ROOT / str(name_or_dir))
+
+    @staticmethod
+    def build(name_or_dir, embedder: str = "hashing", dtype: str = "int8", batch_size: int = 256) -> "DenseIndex":
+        """Embed every chunk of an index built by `runtime.kb_index` into `<index>/vectors`."""
+        path = Path(name_or_dir)
+        kb_dir = path if path.is_dir() else INDEX_ROOT / str(name_or_dir)
+        index = json.loads((kb_dir / "index.json").read_text())
+        chunks = index["chunks"]
+        model = get_embedder(embedder)
+        batches = (model.embed([c["text"] for c in chunks[i:i + batch_size]])
+                   for i in range(0, len(chunks), batch_size))
+        VectorStore.write(kb_dir / "vectors", batches, len(chunks), model.dim, dtype, meta={"embedder": model.name, "documents": index["documents"]})
+        return DenseIndex(kb_dir)
+
+    def _hit(self, chunk_id: int, score: float) -> SearchHit:
+        chunk = self.chunks[chunk_id]
+        return SearchHit(score=round(float(score), 4), document=chunk["document"], chunk=chunk["chunk"],
+                         text=chunk["text"])
+
+    def search(self, query: str, top_k: int = 5, hybrid: bool = False, candidates: int = 50) -> List[SearchHit]:
+        """
+        Return the top-k chunks for a query.
+
+        With `hybrid`, the dense and BM25 rankings of the top `candidates` chunks
+        are combined with reciprocal rank fusion and the fused score is returned.
+        """
+        ids, scores = self.store.search(self.embedder.embed([query]), top_k if not hybrid else candidates)
+        if not hybrid:
+            return [self._hit(i, s) for i, s in zip(ids[0], scores[0])]
+        bm25 = KnowledgeBaseIndex.load(self.kb_dir).scores(query)
+        keyword = [i for i, _ in sorted(bm25.items(), key=lambda item: item[1], reverse=True)[:candidates]]
+        fused = reciprocal_rank_fusion([[int(i) for i in ids[0]], keyword])[:top_k]
+        return [self._hit(i, s) for i, s in fused]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query dense vector indexes for knowledge bases")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Embed the chunks of a built knowledge base index")
+    build.add_argument("kb", help="Knowledge base name or index directory")
+    build.add_argument("--embedder", default="hashing", help="'hashing[-dim]' or 'st:<model>'")
+    build.add_argument("--dtype", choices=["int8", "float16"], default="int8")
+    query = commands.add_parser("query", help="Return the top-k chunks for a query")
+    query.add_argument("kb", help="Knowledge base name or index directory")
+    query.add_argument("query")
+    query.add_argument("-k", "--top-k", type=int, default=5)
+    query.add_argument("--hybrid", action="store_true", help="Fuse dense and BM25 rankings")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = DenseIndex.build(args.kb, args.embedder, args.dtype)
+        print(json.dumps({key: value for key, value in index.store.meta.items() if key != "documents"}))
+    else:
+        for hit in DenseIndex.load(args.kb).search(args.query, args.top_k, hybrid=args.hybrid):
+            print(hit.model_dump_json())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
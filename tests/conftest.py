@@ -0,0 +1,16 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_tool_cache(tmp_path, monkeypatch):
+    """Keep cached tool results from leaking between tests or into the shared temp-dir cache"""
+    monkeypatch.setenv("TOOL_CACHE_PATH", str(tmp_path / "tool_cache.sqlite"))
+
+
+@pytest.fixture(scope="session")
+def mock_services():
+    """Run every mock service in-process on an ephemeral port, with the tools pointed at them"""
+    from mocks.harness import MockServices
+
+    with MockServices() as services:
+        yield services
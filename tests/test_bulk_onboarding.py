@@ -0,0 +1,77 @@
+import io
+import threading
+import time
+
+from runtime.bulk_onboarding import BulkOnboarding, iter_rows
+from runtime.flow_runner import load_flow
+
+
+class SlowTools:
+    """Onboarding tool stand-ins that track how many calls overlap"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, name):
+        def call(**kwargs):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(self.delay)
+            with self.lock:
+                self.active -= 1
+            if name == "create_profile_tool":
+                return f"✅ Successfully created new employee profile for {kwargs['name']}. Employee ID: emp-{kwargs['email'].split('@')[0]}"
+            return "✅ ok"
+        return call
+
+
+def make_rows(count):
+    return [{"name": f"Hire {i}", "email": f"hire{i}@example.com", "title": "Engineer"} for i in range(count)]
+
+
+class TestBulkOnboarding:
+    """Test suite for the streaming cohort onboarding pipeline"""
+
+    def test_iter_rows_reads_csv_and_jsonl(self):
+        """Test that both input formats stream rows and drop empty CSV cells"""
+        csv_rows = list(iter_rows(io.StringIO("name,email,title\nJane,jane@example.com,\n"), "csv"))
+        assert csv_rows == [{"name": "Jane", "email": "jane@example.com"}]
+
+        jsonl_rows = list(iter_rows(io.StringIO('{"name": "Jane"}\n\n{"name": "John"}\n'), "jsonl"))
+        assert [row["name"] for row in jsonl_rows] == ["Jane", "John"]
+
+    def test_every_row_is_emitted(self):
+        """Test that each row produces one result carrying its own employee_id"""
+        results = []
+        bulk = BulkOnboarding(load_flow("flows/onboarding_flow.yaml"), concurrency=4,
+                              defaults={"start_time": "2024-01-15T10:00:00"}, resolver=SlowTools(delay=0))
+        totals = bulk.run(iter(make_rows(25)), results.append)
+
+        assert totals["rows"] == 25 and totals["succeeded"] == 25
+        assert sorted(result["row"] for result in results) == list(range(1, 26))
+        first = next(result for result in results if result["row"] == 1)
+        assert first["steps"]["create_profile"]["outputs"] == {"employee_id": "emp-hire0"}
+
+    def test_concurrency_is_bounded(self):
+        """Test that rows run in parallel but never more than the configured limit"""
+        tools = SlowTools(delay=0.05)
+        bulk = BulkOnboarding(load_flow("flows/onboarding_flow.yaml"), concurrency=3,
+                              defaults={"start_time": "2024-01-15T10:00:00"}, resolver=tools)
+
+        pulled = []
+
+        def rows():
+            for row in make_rows(12):
+                pulled.append(row)
+                yield row
+
+        emitted = []
+        bulk.run(rows(), lambda result: emitted.append(len(pulled)))
+        # Profile creation and directory lookup overlap, so each row has up to two calls in flight
+        assert 2 < tools.peak <= 6
+        # The reader is never more than `concurrency` rows (plus the one waiting for a slot) ahead of the results
+        assert all(pulled_count - index <= 4 for index, pulled_count in enumerate(emitted))
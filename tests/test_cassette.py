@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from runtime.toolbox import resolve_tool
+
+
+@pytest.fixture
+def cassette(tmp_path, monkeypatch):
+    """A fresh cassette file for one test, with tool result caching off so every call reaches HTTP"""
+    monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+    monkeypatch.setenv("TOOL_CASSETTE", str(tmp_path / "cassette.jsonl.gz"))
+    monkeypatch.setenv("TOOL_CASSETTE_MISSES", str(tmp_path / "misses.jsonl"))
+    return tmp_path
+
+
+@pytest.mark.usefixtures("mock_services")
+class TestCassette:
+    """Test suite for recording and replaying the tools' HTTP traffic"""
+
+    def test_record_then_replay_offline(self, cassette, monkeypatch):
+        """Test that recorded responses are served when the service is unreachable"""
+        benefits = resolve_tool("get_healthcare_benefits")
+        monkeypatch.setenv("TOOL_CASSETTE_MODE", "record")
+        recorded = benefits(plan="PPO", in_network=True)
+        assert recorded
+
+        # Port 9 is closed: a request that reached the network would fail
+        monkeypatch.setenv("TOOL_CASSETTE_MODE", "replay")
+        monkeypatch.setenv("HEALTHCARE_BENEFITS_URL", "http://127.0.0.1:9/benefits")
+        assert benefits(plan="PPO", in_network=True) == recorded
+
+    def test_misses_are_attributed_to_the_tool(self, cassette, monkeypatch):
+        """Test that a replay miss fails like a connection error and is logged with the tool name"""
+        import cassette as cassette_module
+
+        monkeypatch.setenv("TOOL_CASSETTE_MODE", "replay")
+        result = resolve_tool("get_directory_tool")(email="alice@example.com")
+        assert result.startswith("❌ Error: Could not connect")
+
+        misses = [json.loads(line) for line in (cassette / "misses.jsonl").read_text().splitlines()]
+        assert [(m["tool"], m["method"]) for m in misses] == [("get_directory_tool", "GET")]
+        assert cassette_module.misses()[-1]["url"].endswith("/directory/alice@example.com")
+
+    def test_new_mode_records_only_misses(self, cassette, monkeypatch):
+        """Test that `new` mode replays what is recorded and records the rest"""
+        providers = resolve_tool("search_healthcare_providers")
+        monkeypatch.setenv("TOOL_CASSETTE_MODE", "new")
+        first = providers(location="Boston")
+        providers(location="Boston")
+        providers(location="Austin")
+
+        import cassette as cassette_module
+
+        misses = [m for m in cassette_module.misses() if m["tool"] == "search_healthcare_providers"]
+        assert [m["url"].split("location=")[1].split("&")[0] for m in misses[-2:]] == ["Boston", "Austin"]
+        assert len(cassette_module.load(str(cassette / "cassette.jsonl.gz")).interactions) == 2
+        assert providers(location="Boston") == first
+
+    def test_credentials_are_not_recorded(self, cassette, monkeypatch):
+        """Test that ServiceNow calls are keyed by user but stored without credentials"""
+        import gzip
+
+        monkeypatch.setenv("TOOL_CASSETTE_MODE", "record")
+        incidents = resolve_tool("get_my_service_now_incidents")()
+        text = gzip.open(cassette / "cassette.jsonl.gz", "rt").read()
+        assert "YWRtaW46YWRtaW4" not in text and "Authorization" not in text
+        record = json.loads(text.splitlines()[0])
+        assert record["tool"] == "get_my_service_now_incidents" and record["status"] == 200
+        assert len(incidents) <= 10
+
+    def test_streamed_responses_replay(self, cassette, monkeypatch):
+        """Test that a tool reading its response as a stream gets the same result from the cassette"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        monkeypatch.setenv("TOOL_CASSETTE_MODE", "record")
+        tool = resolve_tool("get_my_service_now_incidents")
+        recorded = tool()
+        monkeypatch.setenv("TOOL_CASSETTE_MODE", "replay")
+        assert tool() == recorded and recorded
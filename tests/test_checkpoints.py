@@ -0,0 +1,86 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from runtime.checkpoints import CheckpointStore
+from runtime.flow_runner import FlowRunner, load_flow
+
+FLOW_INPUTS = {"name": "Jane Doe", "email": "jane@example.com", "title": "Engineer", "start_time": "2024-01-15T10:00:00"}
+
+
+class CountingTools:
+    """Onboarding tool stand-ins that count calls and can be told to fail"""
+
+    def __init__(self, fail_meetings=False):
+        self.calls = {}
+        self.fail_meetings = fail_meetings
+
+    def __call__(self, name):
+        def call(**kwargs):
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if name == "create_profile_tool":
+                return f"✅ Successfully created new employee profile. Employee ID: emp-{self.calls[name]}"
+            if name == "schedule_meeting_tool" and self.fail_meetings:
+                return "❌ Error: Request to HR service timed out."
+            return "✅ ok"
+        return call
+
+
+class TestCheckpoints:
+    """Test suite for checkpointed, resumable flow runs"""
+
+    def test_resume_skips_completed_steps(self, tmp_path):
+        """Test that rerunning a failed run does not create the profile again"""
+        store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+        flow = load_flow("flows/onboarding_flow.yaml")
+
+        tools = CountingTools(fail_meetings=True)
+        first = FlowRunner(resolver=tools, checkpoints=store).run(flow, FLOW_INPUTS, run_id="run-1")
+        assert first.status == "failed"
+        assert first.steps["schedule_meeting"].status == "failed"
+
+        tools.fail_meetings = False
+        second = FlowRunner(resolver=tools, checkpoints=store).run(flow, FLOW_INPUTS, run_id="run-1")
+        assert second.status == "succeeded"
+        assert tools.calls["create_profile_tool"] == 1
+        assert second.steps["create_profile"].source == "checkpoint"
+        assert second.steps["create_profile"].outputs == {"employee_id": "emp-1"}
+        assert "emp-1" in second.steps["schedule_meeting"].inputs["subject"]
+        assert store.run_inputs("run-1") == FLOW_INPUTS
+
+    def test_changed_inputs_are_not_resumed(self, tmp_path):
+        """Test that a checkpoint only applies when the step inputs are unchanged"""
+        store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+        flow = load_flow("flows/onboarding_flow.yaml")
+        tools = CountingTools()
+
+        FlowRunner(resolver=tools, checkpoints=store).run(flow, FLOW_INPUTS, run_id="run-1")
+        changed = dict(FLOW_INPUTS, title="Manager")
+        FlowRunner(resolver=tools, checkpoints=store).run(flow, changed, run_id="run-1")
+        assert tools.calls["create_profile_tool"] == 2
+
+    def test_memo_window(self, tmp_path):
+        """Test that identical steps from other runs are reused only within the memo window"""
+        store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+        flow = load_flow("flows/onboarding_flow.yaml")
+        tools = CountingTools()
+
+        FlowRunner(resolver=tools, checkpoints=store).run(flow, FLOW_INPUTS, run_id="run-1")
+        FlowRunner(resolver=tools, checkpoints=store).run(flow, FLOW_INPUTS, run_id="run-2")
+        assert tools.calls["create_profile_tool"] == 2
+
+        run = FlowRunner(resolver=tools, checkpoints=store, memo_window=60).run(flow, FLOW_INPUTS, run_id="run-3")
+        assert tools.calls["create_profile_tool"] == 2
+        assert run.steps["create_profile"].source == "memo"
+
+    def test_model_results_are_stored_as_their_fields(self, tmp_path):
+        """Test that a tool returning pydantic models is checkpointed as JSON objects, not their str()"""
+        class Incident(BaseModel):
+            number: str
+            opened_at: datetime
+
+        store = CheckpointStore(tmp_path / "checkpoints.sqlite")
+        opened = datetime(2024, 1, 15, 10, 0)
+        store.save_step("run-1", "list", "get_incidents", {}, [Incident(number="INC1", opened_at=opened)], {})
+        step = store.completed_step("run-1", "list", "get_incidents", {})
+        assert step["result"] == [{"number": "INC1", "opened_at": "2024-01-15T10:00:00"}]
@@ -0,0 +1,95 @@
+import csv
+import gzip
+import json
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from mocks import datagen, directory_service, servicenow_service
+from runtime.toolbox import resolve_tool
+
+
+class TestDatagen:
+    """Test suite for the synthetic dataset generator"""
+
+    def test_records_are_deterministic_and_addressable(self):
+        """Test that a seed always gives the same records, and record i does not depend on the others"""
+        records = list(datagen.employees(50, seed=3))
+        assert records == list(datagen.employees(50, seed=3))
+        assert records != list(datagen.employees(50, seed=4))
+        assert datagen.employee(42, 50, seed=3) == records[42]
+        assert [r["email"] for r in records] == [datagen.employee_email(i, seed=3) for i in range(50)]
+        assert len({r["email"] for r in records}) == len({r["employee_id"] for r in records}) == 50
+
+    def test_references_are_consistent(self):
+        """Test that managers, participants, incident openers and claim members and providers all exist"""
+        counts = datagen.sizes(300)
+        people = {r["email"]: r for r in datagen.generate("employees", counts)}
+        entries = list(datagen.generate("directory", counts))
+        assert [e["email"] for e in entries] == list(people)
+        roots = [e for e in entries if e["manager"] == e["email"]]
+        assert len(roots) == 1 and all(e["manager"] in people for e in entries)
+        assert all(people[e["email"]]["department"] == e["department"] for e in entries)
+        assert all(people[p["manager"]]["department"] == p["department"]
+                   for p in people.values() if p["manager"] and people[p["manager"]]["manager"])
+
+        for meeting in datagen.generate("meetings", counts):
+            assert 2 <= len(meeting["participants"]) <= 5
+            assert len(set(meeting["participants"])) == len(meeting["participants"])
+            assert set(meeting["participants"]) <= set(people)
+        openers = {r["sys_created_by"] for r in datagen.generate("incidents", counts, user="admin", user_share=0.1)}
+        assert "admin" in openers and openers - {"admin"} <= {email.split("@")[0] for email in people}
+        provider_ids = {p["provider_id"] for p in datagen.generate("providers", counts)}
+        for claim in datagen.generate("claims", counts):
+            assert claim["memberEmail"] in people and claim["provider"]["providerId"] in provider_ids
+            assert claim["amountClaimed"] == sum(service["amount"] for service in claim["services"])
+
+    def test_meetings_overlap_within_teams(self):
+        """Test that some people are booked into overlapping meetings, as real calendars are"""
+        booked = defaultdict(list)
+        for meeting in datagen.meetings(400, employees=100):
+            start = datetime.fromisoformat(meeting["start_time"])
+            assert start.weekday() < 5 and 9 <= start.hour < 17
+            for person in meeting["participants"]:
+                booked[person].append((start, start + timedelta(minutes=meeting["duration_minutes"])))
+        overlapping = [person for person, slots in booked.items()
+                       if any(a[0] < b[1] and b[0] < a[1] for i, a in enumerate(slots) for b in slots[i + 1:])]
+        assert 0 < len(overlapping) < len(booked)
+
+    def test_write_and_read_stream_jsonl_and_csv(self, tmp_path):
+        """Test that records round-trip through gzipped JSONL, and CSV cells hold nested values as JSON"""
+        claims = list(datagen.claims(20, employees=10, providers=5))
+        assert datagen.write(iter(claims), tmp_path / "claims.jsonl.gz") == 20
+        assert list(datagen.read(tmp_path / "claims.jsonl.gz")) == claims
+        with gzip.open(tmp_path / "claims.jsonl.gz", "rt") as f:
+            assert json.loads(f.readline()) == claims[0]
+
+        datagen.write(datagen.meetings(5, employees=10), tmp_path / "meetings.csv")
+        with open(tmp_path / "meetings.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 5 and json.loads(rows[0]["participants"])[0].endswith("@example.com")
+
+        datagen.write(iter(claims), tmp_path / "claims.csv.gz")
+        rows = list(datagen.read(tmp_path / "claims.csv.gz"))
+        assert [(row["claimId"], row["provider"], row["services"]) for row in rows] == [
+            (claim["claimId"], claim["provider"], claim["services"]) for claim in claims]
+
+    def test_loaders_feed_the_tools(self, mock_services, monkeypatch):
+        """Test that bulk-loaded directory entries and incidents are what the tools return"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        saved = dict(directory_service.dir_db)
+        try:
+            assert datagen.load_directory(datagen.directory(1000)) == 1000
+            email = datagen.employee_email(500)
+            info = resolve_tool("get_directory_tool")(email=email)
+            assert directory_service.dir_db[email]["manager"] in info
+
+            loaded = datagen.load_servicenow(datagen.incidents(2000, employees=1000, user="admin", user_share=0.05))
+            assert loaded == 2000
+            mine = sorted((row["opened_at"] for row in servicenow_service.incidents_db.values()
+                           if row["sys_created_by"] == "admin"), reverse=True)
+            incidents = resolve_tool("get_my_service_now_incidents")()
+            assert [incident.created_on for incident in incidents] == mine[:10]
+        finally:
+            directory_service.dir_db.clear()
+            directory_service.dir_db.update(saved)
+            servicenow_service.seed()
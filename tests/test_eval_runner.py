@@ -0,0 +1,66 @@
+import io
+import json
+
+import runtime.eval_runner as eval_runner
+from runtime.eval_runner import Answer, EvalCase, check, iter_cases, run_eval
+
+
+def make_cases(count):
+    return [{"query": f"What department is user{i}@example.com in?",
+             "expected": {"action": "get_directory_tool", "department": "HR"}} for i in range(count)]
+
+
+class TestEvalRunner:
+    """Test suite for the offline evaluation runner"""
+
+    def test_streams_json_arrays_in_small_reads(self, monkeypatch):
+        """Test that a JSON array is decoded case by case across read boundaries"""
+        monkeypatch.setattr(eval_runner, "READ_SIZE", 7)
+        cases = list(iter_cases(io.StringIO("  \n" + json.dumps(make_cases(25), indent=2))))
+        assert [c.id for c in cases] == [str(i) for i in range(25)]
+        assert cases[3].query == "What department is user3@example.com in?"
+
+    def test_streams_jsonl_and_shards(self):
+        """Test that shards partition the cases by position"""
+        text = "\n".join(json.dumps(case) for case in make_cases(10)) + "\n"
+        shards = [[c.id for c in iter_cases(io.StringIO(text), (i, 3))] for i in range(3)]
+        assert sorted(sum(shards, []), key=int) == [str(i) for i in range(10)]
+        assert shards[1] == ["1", "4", "7"]
+
+    def test_checks_action_tools_and_fields(self):
+        """Test that tools are checked by containment and fields are found in the output"""
+        case = EvalCase(id="1", query="q", expected={"action": "onboarding_flow", "department": "HR",
+                                                     "tools_invoked": ["create_profile_tool", "schedule_meeting_tool"]})
+        answer = Answer(action="onboarding_flow", output="✅ Department: HR, Manager: bob@example.com",
+                        tools_invoked=["get_directory_tool", "schedule_meeting_tool", "create_profile_tool"])
+        assert check(case, answer) == []
+
+        answer = Answer(action="get_directory_tool", tools_invoked=["create_profile_tool"], output="Department: IT")
+        failures = check(case, answer)
+        assert len(failures) == 3
+        assert "tools_invoked: missing schedule_meeting_tool" in failures
+
+    def test_transcript_backend_in_process_pool(self, tmp_path):
+        """Test a recorded transcript evaluated across worker processes"""
+        transcript = tmp_path / "transcript.jsonl"
+        with open(transcript, "w") as f:
+            for i, case in enumerate(make_cases(40)):
+                department = "HR" if i % 4 else "Sales"
+                f.write(json.dumps({"query": case["query"], "action": "get_directory_tool",
+                                    "tools_invoked": ["get_directory_tool"],
+                                    "output": f"Department: {department}"}) + "\n")
+
+        results = []
+        totals = run_eval(iter_cases(io.StringIO(json.dumps(make_cases(40)))), f"transcript:{transcript}",
+                          results.append, workers=2, chunk_size=3)
+        assert totals["cases"] == 40 and totals["passed"] == 30 and totals["failed"] == 10
+        assert sorted(int(r["id"]) for r in results if not r["passed"]) == list(range(0, 40, 4))
+
+    def test_router_backend_calls_tools(self, mock_services):
+        """Test the bundled evaluation file against the stub router and the mocks"""
+        results = []
+        with open("evaluations/onboarding_tests.json") as f:
+            totals = run_eval(iter_cases(f), "router", results.append, workers=0)
+        by_query = {r["query"]: r for r in results}
+        assert by_query["What department is alice@example.com in?"]["passed"]
+        assert totals["by_action"]["get_directory_tool"] == {"cases": 1, "passed": 1}
@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+from runtime.flow_runner import FlowError, FlowRunner, load_flow, parse_flow
+
+
+def fake_tools(calls, delay=0.0):
+    """Stand-ins for the onboarding tools that return the same string shapes"""
+    def create_profile_tool(name, email, title):
+        calls.append(("create_profile_tool", time.perf_counter()))
+        time.sleep(delay)
+        return f"✅ Successfully created new employee profile for {name} ({email}) with title '{title}'. Employee ID: emp-42"
+
+    def get_directory_tool(email):
+        calls.append(("get_directory_tool", time.perf_counter()))
+        time.sleep(delay)
+        return f"❌ No directory entry found for email: {email}"
+
+    def schedule_meeting_tool(subject, participants, start_time, duration_minutes=60):
+        calls.append(("schedule_meeting_tool", time.perf_counter()))
+        time.sleep(delay)
+        return f"✅ Successfully scheduled meeting '{subject}' for {start_time}. Participants: {', '.join(participants)}"
+
+    tools = {
+        "create_profile_tool": create_profile_tool,
+        "get_directory_tool": get_directory_tool,
+        "schedule_meeting_tool": schedule_meeting_tool,
+    }
+    return tools.__getitem__
+
+
+FLOW_INPUTS = {"name": "Jane Doe", "email": "jane@example.com", "title": "Engineer", "start_time": "2024-01-15T10:00:00"}
+
+
+class TestFlowRunner:
+    """Test suite for the local DAG flow runner"""
+
+    def test_legacy_step_list_is_sequential(self):
+        """Test that a bare list of tool names keeps its original chain semantics"""
+        spec = parse_flow({"name": "legacy", "steps": ["a", "b", "c"]})
+        assert [step.depends_on for step in spec.steps] == [[], ["a"], ["b"]]
+
+    def test_onboarding_flow_passes_employee_id(self):
+        """Test that the employee_id from create_profile reaches the meeting subject"""
+        run = FlowRunner(resolver=fake_tools([])).run(load_flow("flows/onboarding_flow.yaml"), FLOW_INPUTS)
+
+        assert run.status == "succeeded"
+        assert run.steps["create_profile"].outputs == {"employee_id": "emp-42"}
+        meeting_inputs = run.steps["schedule_meeting"].inputs
+        assert "emp-42" in meeting_inputs["subject"]
+        assert meeting_inputs["participants"] == ["jane@example.com"]
+        # The directory lookup is optional, so its failure does not fail the flow
+        assert run.steps["lookup_directory"].status == "failed"
+
+    def test_independent_steps_run_concurrently(self):
+        """Test that a run takes the critical path rather than the sum of all steps"""
+        calls = []
+        run = FlowRunner(resolver=fake_tools(calls, delay=0.2)).run(load_flow("flows/onboarding_flow.yaml"), FLOW_INPUTS)
+
+        started = dict(calls)
+        assert abs(started["create_profile_tool"] - started["get_directory_tool"]) < 0.1
+        assert started["schedule_meeting_tool"] - started["create_profile_tool"] >= 0.2
+        assert run.elapsed < 0.55
+
+    def test_failed_step_skips_dependents(self):
+        """Test that dependents of a failed step are skipped and the run fails"""
+        def resolver(name):
+            if name == "create_profile_tool":
+                return lambda **kwargs: "❌ Error: Could not connect to HR service."
+            return fake_tools([])(name)
+
+        run = FlowRunner(resolver=resolver).run(load_flow("flows/onboarding_flow.yaml"), FLOW_INPUTS)
+        assert run.status == "failed"
+        assert run.steps["create_profile"].status == "failed"
+        assert run.steps["schedule_meeting"].status == "skipped"
+
+    def test_invalid_flows_are_rejected(self):
+        """Test that unknown dependencies and cycles are reported"""
+        with pytest.raises(FlowError):
+            parse_flow({"name": "bad", "steps": [{"tool": "a", "depends_on": ["missing"]}]})
+        with pytest.raises(FlowError):
+            parse_flow({"name": "cycle", "steps": [{"tool": "a", "depends_on": ["b"]},
+                                                   {"tool": "b", "depends_on": ["a"]}]})
@@ -0,0 +1,14 @@
+from fastapi.testclient import TestClient
+from mocks.healthcare_service import app as healthcare_app, seed
+
+client = TestClient(healthcare_app)
+
+def test_benefits_filtered_by_plan_and_network():
+    rows = client.get("/benefits", params={"plan": "PPO", "in_network": True}).json()["benefits"]
+    assert rows and all(set(row) == {"Coverage", "PPO (In-Network)"} for row in rows)
+
+def test_providers_filtered_by_location_and_specialty():
+    seed(120)
+    providers = client.get("/providers", params={"location": "boston", "speciality": "Cardiology"}).json()["providers"]
+    assert providers
+    assert all("Boston" in p["address"] and p["specialty"] == "Cardiology" for p in providers)
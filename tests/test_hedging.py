@@ -0,0 +1,136 @@
+import threading
+import time
+
+import pytest
+
+import hedging
+from hedging import hedged
+from mocks.middleware import set_latency
+from runtime.toolbox import resolve_tool
+
+
+@pytest.fixture(autouse=True)
+def fresh_policies(monkeypatch):
+    monkeypatch.setenv("TOOL_HEDGE_MIN_SAMPLES", "5")
+    hedging.reset()
+    yield
+    hedging.reset()
+
+
+def warm_up(name, seconds=0.001, calls=10):
+    """Fill the endpoint's latency window with fast latencies, without sending (and possibly hedging) requests"""
+    endpoint = hedging.policy(name)
+    for _ in range(calls):
+        endpoint.record(seconds)
+
+
+@pytest.fixture
+def numbered(monkeypatch):
+    """Pass each attempt of a hedged call its number (0 for the first request, 1 for the hedge) as it is sent"""
+    submitted = []
+    submit = hedging._submit
+
+    def numbered_submit(endpoint, send):
+        attempt = len(submitted)
+        submitted.append(attempt)
+        return submit(endpoint, lambda: send(attempt))
+
+    monkeypatch.setattr(hedging, "_submit", numbered_submit)
+    return submitted
+
+
+class Response:
+    def __init__(self, label):
+        self.label = label
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+
+
+class TestHedging:
+    """Test suite for hedged requests"""
+
+    def test_slow_request_is_hedged_and_the_hedge_wins(self, numbered):
+        """Test that a request slower than the recent percentile is sent again and the faster answer is returned"""
+        warm_up("endpoint")
+        release = threading.Event()
+        slow = Response("slow")
+
+        def send(attempt):
+            if attempt == 0:
+                # Held up until the hedge has answered
+                release.wait(5)
+                return slow
+            return Response("fast")
+
+        assert hedged("endpoint", send, enabled=True).label == "fast"
+        assert numbered == [0, 1]
+        release.set()
+        assert slow.closed.wait(5)
+        assert hedging.stats()["endpoint"] == {"calls": 1, "hedges_sent": 1, "hedges_won": 1, "hedges_capped": 0}
+
+    def test_hedges_are_capped(self, monkeypatch):
+        """Test that no more hedges are sent than the allowed fraction of calls"""
+        monkeypatch.setenv("TOOL_HEDGE_PERCENTILE", "50")
+        monkeypatch.setenv("TOOL_HEDGE_MAX_RATE", "0.1")
+        warm_up("endpoint", calls=40)
+        for _ in range(8):
+            # Always slower than the 1ms delay, so every call wants a hedge
+            hedged("endpoint", lambda: time.sleep(0.01), enabled=True)
+        stats = hedging.stats()["endpoint"]
+        assert (stats["calls"], stats["hedges_sent"], stats["hedges_capped"]) == (8, 1, 7)
+
+    def test_failed_request_falls_back_to_the_other(self, numbered):
+        """Test that the first request failing returns the hedge's answer, and both failing raises"""
+        warm_up("endpoint")
+        hedge_sent = threading.Event()
+
+        def send(attempt):
+            if attempt == 0:
+                hedge_sent.wait(5)
+                raise ConnectionError("reset")
+            hedge_sent.set()
+            return "answer"
+
+        assert hedged("endpoint", send, enabled=True) == "answer"
+        assert numbered == [0, 1]
+
+        warm_up("failing")
+        del numbered[:]
+        both_sent = threading.Event()
+
+        def fail(attempt):
+            if attempt == 1:
+                both_sent.set()
+            both_sent.wait(5)
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            hedged("failing", fail, enabled=True)
+        assert numbered == [0, 1]
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Test that requests run once in the calling thread unless TOOL_HEDGE is set"""
+        monkeypatch.delenv("TOOL_HEDGE", raising=False)
+        caller = threading.current_thread()
+        assert hedged("endpoint", threading.current_thread) is caller
+        assert hedging.stats() == {}
+
+    def test_healthcare_tools_hedge_the_latency_tail(self, mock_services, monkeypatch):
+        """Test that the healthcare tools hedge requests the mock holds up and report it in the stats"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        monkeypatch.setenv("TOOL_HEDGE", "1")
+        monkeypatch.setenv("TOOL_HEDGE_MAX_RATE", "1")
+        search = resolve_tool("search_healthcare_providers")
+        set_latency(2)
+        try:
+            for _ in range(10):
+                search(location="Boston")
+            set_latency(2, tail_ms=300, tail_rate=0.5, seed=1)
+            for _ in range(6):
+                assert search(location="Boston")
+        finally:
+            set_latency(0)
+        stats = hedging.stats()["healthcare_providers"]
+        assert stats["calls"] == 16 and stats["hedges_sent"] >= 1 and stats["hedges_won"] >= 1
@@ -0,0 +1,43 @@
+import socket
+import threading
+
+import pytest
+import requests
+
+from http_client import get_session
+
+
+def serve(replies):
+    """Serve one connection per reply on a local port: None closes the connection without answering"""
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def run():
+        for reply in replies:
+            conn, _ = listener.accept()
+            with conn:
+                conn.recv(65536)
+                if reply is not None:
+                    conn.sendall(reply)
+        listener.close()
+
+    threading.Thread(target=run, daemon=True).start()
+    return f"http://127.0.0.1:{listener.getsockname()[1]}"
+
+
+OK = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: close\r\n\r\nok"
+
+
+class TestHttpClient:
+    """Test suite for the shared HTTP session"""
+
+    def test_dropped_connections_are_retried_for_gets(self):
+        """Test that a GET whose connection is closed without an answer is sent again"""
+        url = serve([None, OK])
+        response = get_session().get(url, timeout=5)
+        assert response.status_code == 200 and response.text == "ok"
+
+    def test_dropped_connections_are_not_retried_for_posts(self):
+        """Test that a POST, which may have taken effect, is not sent twice"""
+        url = serve([None, OK])
+        with pytest.raises(requests.exceptions.ConnectionError):
+            get_session().post(url, json={}, timeout=5)
@@ -0,0 +1,29 @@
+import json
+
+from benchmarks.import_time import ALL_TOOLS, BUDGET_PATH, BASELINE_IMPORT, check, import_times, tool_modules
+from runtime.toolbox import TOOLS_DIR
+
+
+class TestImportTime:
+    """Test suite for the tool import-time budget"""
+
+    def test_every_tool_has_a_budget(self):
+        """Test that the checked-in budget covers every Python tool and the whole tool set"""
+        budget = json.loads(BUDGET_PATH.read_text())
+        assert set(budget["tools"]) == set(tool_modules()) | {ALL_TOOLS}
+
+    def test_check_flags_tools_over_budget(self):
+        """Test that tools over their own or the default budget are reported"""
+        results = {"fast": {"extra_ms": 5.0}, "slow": {"extra_ms": 30.0}, "other": {"extra_ms": 60.0}}
+        over = check(results, {"default_ms": 50.0, "tools": {"fast": 10.0, "slow": 20.0}})
+        assert over == ["slow: 30.0ms > 20.0ms", "other: 60.0ms > 50.0ms"]
+        assert check(results, {}) == []
+
+    def test_optional_dependencies_are_not_imported_with_a_tool(self):
+        """Test that caching, cassette, profiling, streaming and hedging dependencies are only loaded when used"""
+        baseline = import_times(f"import {BASELINE_IMPORT}", TOOLS_DIR)
+        loaded = import_times("import get_my_service_now_incidents; import create_service_now_incident; "
+                              "import search_healthcare_providers", TOOLS_DIR)
+        assert "get_my_service_now_incidents" in loaded and "servicenow_models" in loaded
+        assert not {"sqlite3", "gzip", "cProfile", "pstats", "json_stream", "hedging"} & set(loaded)
+        assert "ibm_watsonx_orchestrate.run.connections" not in set(loaded) - set(baseline)
@@ -0,0 +1,141 @@
+import shutil
+import threading
+import time
+
+from runtime.importer import Importer, active_environment, local_imports, plan
+from runtime.manifest import load_manifest
+from runtime.toolbox import PROJECT_ROOT
+
+
+class FakeOrchestrate:
+    """Records orchestrate commands and pretends each takes `delay` seconds"""
+
+    def __init__(self, delay=0.0, existing_kbs="", fail=None):
+        self.commands = []
+        self.delay = delay
+        self.existing_kbs = existing_kbs
+        self.fail = fail
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, command, cwd):
+        with self._lock:
+            self.commands.append(command)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if self.fail and self.fail in command:
+                raise RuntimeError(f"cannot import {self.fail}")
+            return self.existing_kbs if command[1:3] == ["knowledge-bases", "list"] else ""
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def make_project(tmp_path):
+    for directory in ["agents", "connections", "flows", "knowledge-bases", "tools"]:
+        shutil.copytree(PROJECT_ROOT / directory, tmp_path / directory,
+                        ignore=shutil.ignore_patterns("__pycache__"))
+    return tmp_path
+
+
+def make_importer(root, orchestrate, **kwargs):
+    kwargs.setdefault("environment", "local@http://localhost:4321")
+    return Importer(root, root / ".adk_cache/import_state.json", runner=orchestrate, **kwargs)
+
+
+class TestImporter:
+    """Test suite for the incremental resource importer"""
+
+    def test_imports_in_dependency_order_and_in_parallel(self, tmp_path):
+        """Test that kinds stay ordered while imports of one kind overlap"""
+        root = make_project(tmp_path)
+        orchestrate = FakeOrchestrate(delay=0.05)
+        tasks = plan(load_manifest(root), {"HR_API_KEY": "secret"})
+        results = make_importer(root, orchestrate, jobs=4).run(tasks)
+
+        assert all(r.status == "imported" for r in results)
+        kinds = [c[1] for c in orchestrate.commands]
+        last = {kind: max(i for i, k in enumerate(kinds) if k == kind) for kind in set(kinds)}
+        first = {kind: min(i for i, k in enumerate(kinds) if k == kind) for kind in set(kinds)}
+        assert last["connections"] < first["tools"] and last["tools"] < first["knowledge-bases"]
+        assert last["knowledge-bases"] < first["agents"]
+        assert orchestrate.max_active > 1
+        assert ["orchestrate", "connections", "set-credentials", "--app-id", "hr_api_conn", "--env", "draft",
+                "--api-key", "secret"] in orchestrate.commands
+
+        agents = [c[-1] for c in orchestrate.commands if c[1] == "agents"]
+        assert agents.index("agents/hr_specialist_agent.yaml") < agents.index("agents/onboarding_agent.yaml")
+        assert agents.index("agents/service_now_agent.yaml") < agents.index("agents/customer_care_agent.yaml")
+
+    def test_unchanged_resources_are_skipped(self, tmp_path):
+        """Test that a second run only re-imports what changed"""
+        root = make_project(tmp_path)
+        make_importer(root, FakeOrchestrate()).run(plan(load_manifest(root), {}))
+
+        (root / "tools/tool_cache.py").write_text((root / "tools/tool_cache.py").read_text() + "\n# changed\n")
+        orchestrate = FakeOrchestrate(existing_kbs="onboarding_docs")
+        results = make_importer(root, orchestrate).run(plan(load_manifest(root), {}))
+        imported = {r.name for r in results if r.status == "imported"}
+        assert imported == {"create_profile_tool", "get_directory_tool"}
+        assert not any(c[1:3] == ["knowledge-bases", "list"] for c in orchestrate.commands)
+
+    def test_state_is_kept_per_environment(self, tmp_path):
+        """Test that resources imported into one environment are imported again after switching to another"""
+        root = make_project(tmp_path)
+        tasks = plan(load_manifest(root), {})
+        make_importer(root, FakeOrchestrate()).run(tasks)
+        staging = make_importer(root, FakeOrchestrate(), environment="staging@https://staging.example.com")
+        assert all(r.status == "imported" for r in staging.run(tasks))
+        assert all(r.status == "unchanged" for r in make_importer(root, FakeOrchestrate()).run(tasks))
+
+        config = tmp_path / "config.yaml"
+        config.write_text("context:\n  active_environment: staging\nenvironments:\n"
+                          "  local:\n    wxo_url: http://localhost:4321\n"
+                          "  staging:\n    wxo_url: https://staging.example.com\n")
+        assert active_environment(config) == "staging@https://staging.example.com"
+        assert active_environment(tmp_path / "missing.yaml") == ""
+
+    def test_knowledge_bases_are_listed_once(self, tmp_path):
+        """Test that existing knowledge bases are patched using a single list call"""
+        root = make_project(tmp_path)
+        (root / "knowledge-bases/other_docs.yaml").write_text(
+            "spec_version: v1\nkind: knowledge_base\nname: other_docs\ndocuments:\n"
+            "  - \"docs/onboarding_policy.pdf\"\n")
+        orchestrate = FakeOrchestrate(existing_kbs="onboarding_docs")
+        make_importer(root, orchestrate).run(plan(load_manifest(root), {}))
+        kb_commands = [c[2:4] for c in orchestrate.commands if c[1] == "knowledge-bases"]
+        assert kb_commands.count(["list"]) == 1
+        assert ["patch", "-n"] in kb_commands and ["import", "-f"] in kb_commands
+
+    def test_failure_stops_later_kinds(self, tmp_path):
+        """Test that agents are not imported when a tool import fails, and the tool is retried next run"""
+        root = make_project(tmp_path)
+        orchestrate = FakeOrchestrate(fail="tools/get_directory_tool.py")
+        results = make_importer(root, orchestrate).run(plan(load_manifest(root), {}))
+        assert [r.name for r in results if r.status == "failed"] == ["get_directory_tool"]
+        assert not any(c[1] == "agents" for c in orchestrate.commands)
+
+        results = make_importer(root, FakeOrchestrate()).run(plan(load_manifest(root), {}))
+        assert {r.name for r in results if r.status == "imported" and r.kind == "tool"} == {"get_directory_tool"}
+
+    def test_dry_run_estimates_from_previous_durations(self, tmp_path):
+        """Test that the dry run reports what would run and how long it should take"""
+        root = make_project(tmp_path)
+        tasks = plan(load_manifest(root), {})
+        importer = make_importer(root, FakeOrchestrate(), jobs=2)
+        for task in tasks:
+            importer.state[importer.key(task)] = {"digest": "old", "seconds": 4.0}
+        importer.state["agent:onboarding_agent"]["digest"] = next(t.digest for t in tasks if t.name == "onboarding_agent")
+
+        report = importer.dry_run(tasks)
+        assert report["kinds"]["tool"] == {"import": 3, "skip": 0, "sequential_seconds": 12.0, "parallel_seconds": 8.0}
+        assert report["kinds"]["agent"]["skip"] == 1
+        assert report["estimated_seconds"] == sum(k["parallel_seconds"] for k in report["kinds"].values())
+
+    def test_tool_hash_covers_imported_helpers(self):
+        """Test that shared helper modules are part of a tool's content"""
+        helpers = {p.name for p in local_imports(PROJECT_ROOT / "tools/get_directory_tool.py")}
+        assert {"http_client.py", "tool_cache.py"} <= helpers
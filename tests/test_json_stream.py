@@ -0,0 +1,74 @@
+import gzip
+import json
+
+import pytest
+
+from json_stream import iter_result
+from mocks import servicenow_service
+
+DOCUMENT = {"meta": {"rows": [1, 2]}, "result": [{"number": "INC1", "text": "héllo \"quoted\" ✓"}, {}, 12345, -0.5,
+                                                  1e-7, "str", None, True, [1, [2]]], "after": "skipped"}
+
+
+def chunked(body: bytes, size: int):
+    return (body[i:i + size] for i in range(0, len(body), size))
+
+
+class TestJsonStream:
+    """Test suite for incremental parsing of Table API responses"""
+
+    @pytest.mark.parametrize("size", [1, 2, 7, 64, 1 << 20])
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_elements_match_json_loads_for_any_chunking(self, size, indent):
+        """Test that every element is yielded intact however the body is split, including mid-number and mid-UTF-8"""
+        body = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False).encode("utf-8")
+        assert list(iter_result(chunked(body, size))) == DOCUMENT["result"]
+
+    def test_result_shapes(self):
+        """Test empty, missing and single-record results"""
+        assert list(iter_result([b'{"result": []}'])) == []
+        assert list(iter_result([b'{}'])) == []
+        assert list(iter_result([b'{"error": {"message": "No Record found"}}'])) == []
+        assert list(iter_result([b'{"result": {"number": "INC1"}}'])) == [{"number": "INC1"}]
+
+    @pytest.mark.parametrize("body", [b'{"result": [{"a": 1}', b'{"result": [1 2]}', b'[{"a": 1}]',
+                                      b'{"result": [{"a":'])
+    def test_malformed_or_truncated_input_raises(self, body):
+        """Test that a cut-off or malformed body is an error rather than a short result"""
+        with pytest.raises(ValueError):
+            list(iter_result(chunked(body, 3)))
+
+    def test_first_record_before_the_body_is_complete(self):
+        """Test that a record is yielded as soon as its chunk has arrived"""
+        read = []
+
+        def chunks():
+            for chunk in (b'{"result": [{"n": 1},', b'{"n": 2}', b']}'):
+                read.append(chunk)
+                yield chunk
+
+        records = iter_result(chunks())
+        assert next(records) == {"n": 1} and len(read) == 1
+        assert list(records) == [{"n": 2}] and len(read) == 3
+
+    def test_table_api_options_and_gzip(self, mock_services):
+        """Test that the stand-in honours sysparm_fields / display_value / exclude_reference_link and compresses"""
+        import requests
+
+        servicenow_service.seed(50)
+        url = f"{mock_services.url('servicenow')}/api/now/table/incident"
+        auth = ("admin", "admin")
+        params = {"sysparm_fields": "number,state,opened_by", "sysparm_display_value": "true",
+                  "sysparm_exclude_reference_link": "true"}
+        try:
+            with requests.get(url, auth=auth, stream=True) as full:
+                assert full.headers["Content-Encoding"] == "gzip"
+                row = next(iter_result(full.iter_content(1024)))
+            trimmed = requests.get(url, auth=auth, params=params).json()["result"][0]
+            raw = requests.get(url, auth=auth, params=params, headers={"Accept-Encoding": "identity"})
+        finally:
+            servicenow_service.seed()
+        assert set(row["opened_by"]) == {"link", "value"} and "sys_id" in row
+        assert set(trimmed) == {"number", "state", "opened_by"} and trimmed["opened_by"] == "admin"
+        assert trimmed["state"] in servicenow_service.DISPLAY_VALUES["state"].values()
+        assert "Content-Encoding" not in raw.headers and len(gzip.compress(raw.content)) < len(raw.content)
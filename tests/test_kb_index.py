@@ -0,0 +1,63 @@
+import pytest
+
+from runtime.kb_index import KnowledgeBaseIndex, build_index, chunk_text
+
+
+def write_kb(tmp_path, documents):
+    for name, text in documents.items():
+        (tmp_path / name).write_text(text)
+    kb = tmp_path / "kb.yaml"
+    kb.write_text("spec_version: v1\nkind: knowledge_base\nname: test_kb\ndocuments:\n" +
+                  "".join(f'  - "{name}"\n' for name in documents))
+    return kb
+
+
+class TestKnowledgeBaseIndex:
+    """Test suite for offline knowledge base ingestion and BM25 search"""
+
+    def test_chunks_overlap(self):
+        """Test that chunks are bounded in size and share the configured overlap"""
+        chunks = chunk_text(" ".join(f"w{i}" for i in range(25)), max_words=10, overlap=3)
+        assert all(len(chunk.split()) <= 10 for chunk in chunks)
+        assert chunks[0].split()[-3:] == chunks[1].split()[:3]
+        assert chunks[-1].split()[-1] == "w24"
+
+    def test_search_ranks_matching_chunk_first(self, tmp_path):
+        """Test that the most relevant chunk is returned first with a score"""
+        kb = write_kb(tmp_path, {
+            "security.txt": "Configure two-factor authentication before accessing company systems.",
+            "benefits.txt": "Complete benefits enrollment during your first week.",
+        })
+        build_index(kb, tmp_path / "index")
+
+        hits = KnowledgeBaseIndex.load(tmp_path / "index").search("two-factor authentication", top_k=2)
+        assert hits[0].document.endswith("security.txt")
+        assert hits[0].score > 0
+        assert len(hits) == 1
+
+    def test_only_changed_documents_are_reindexed(self, tmp_path):
+        """Test that a rebuild reuses unchanged documents and drops stale ones"""
+        kb = write_kb(tmp_path, {"a.txt": "orientation with HR", "b.txt": "meet your onboarding buddy"})
+        first = build_index(kb, tmp_path / "index")
+        assert len(first.indexed) == 2
+
+        second = build_index(kb, tmp_path / "index")
+        assert second.indexed == [] and len(second.reused) == 2
+
+        (tmp_path / "b.txt").write_text("meet your manager in the first week")
+        third = build_index(kb, tmp_path / "index")
+        assert [name.rsplit("/", 1)[-1] for name in third.indexed] == ["b.txt"]
+        assert len(list((tmp_path / "index" / "segments").glob("*.json"))) == 2
+
+        hits = KnowledgeBaseIndex.load(tmp_path / "index").search("manager week")
+        assert hits and hits[0].document.endswith("b.txt")
+        assert KnowledgeBaseIndex.load(tmp_path / "index").search("buddy") == []
+
+    def test_onboarding_policy_pdf(self, tmp_path):
+        """Test that the shipped onboarding policy PDF is extracted and searchable"""
+        pytest.importorskip("pypdf")
+        build_index("knowledge-bases/onboarding_docs.yaml", tmp_path / "index")
+
+        hits = KnowledgeBaseIndex.load(tmp_path / "index").search("two-factor authentication")
+        assert "two-factor authentication" in hits[0].text
+        assert hits[0].document == "knowledge-bases/docs/onboarding_policy.pdf"
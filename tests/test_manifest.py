@@ -0,0 +1,95 @@
+import os
+import shutil
+
+import pytest
+
+from runtime.manifest import ManifestError, compile_manifest, load_manifest
+from runtime.toolbox import PROJECT_ROOT
+
+
+def copy_project(tmp_path):
+    """Copy the resource directories of the project into tmp_path"""
+    for directory in ["agents", "connections", "flows", "knowledge-bases", "tools"]:
+        shutil.copytree(PROJECT_ROOT / directory, tmp_path / directory,
+                        ignore=shutil.ignore_patterns("__pycache__"))
+    return tmp_path
+
+
+class TestManifest:
+    """Test suite for the compiled project manifest"""
+
+    def test_project_compiles_without_errors(self, tmp_path):
+        """Test that every reference in the project resolves"""
+        manifest, inputs = compile_manifest(copy_project(tmp_path))
+        assert manifest.errors == []
+        assert set(manifest.agents) == {"onboarding_agent", "hr_specialist_agent", "customer_care_agent",
+                                        "service_now_agent"}
+        assert manifest.tools["create_profile_tool"].entrypoint == "create_profile_tool:create_profile"
+        assert manifest.tools["create_profile_tool"].permission == "read_write"
+        assert manifest.tools["create_profile_tool"].connections == ["hr_api_conn"]
+        assert manifest.tools["get_my_service_now_incidents"].connections == ["service-now"]
+        assert manifest.tools["onboarding_flow"].toolkit == "flow"
+        assert tmp_path / "knowledge-bases/docs/onboarding_policy.pdf" in inputs
+
+    def test_collaborators_come_first(self, tmp_path):
+        """Test that agents are ordered after the collaborators they use"""
+        order = compile_manifest(copy_project(tmp_path))[0].agent_order()
+        assert order.index("hr_specialist_agent") < order.index("onboarding_agent")
+        assert order.index("service_now_agent") < order.index("customer_care_agent")
+
+    def test_broken_references_are_all_reported(self, tmp_path):
+        """Test that one ManifestError lists every unresolvable reference"""
+        root = copy_project(tmp_path)
+        agent = root / "agents/onboarding_agent.yaml"
+        agent.write_text(agent.read_text()
+                         .replace("prefetch:\n        - get_directory_tool", "prefetch:\n        - get_my_claims")
+                         .replace("- get_directory_tool", "- get_directory_tol")
+                         .replace("- hr_specialist_agent", "- hr_expert_agent"))
+        flow = root / "flows/onboarding_flow.yaml"
+        flow.write_text(flow.read_text().replace("tool: schedule_meeting_tool", "tool: book_meeting_tool"))
+        (root / "knowledge-bases/docs/onboarding_policy.pdf").unlink()
+
+        with pytest.raises(ManifestError) as excinfo:
+            load_manifest(root)
+        errors = "\n".join(excinfo.value.errors)
+        assert "unknown tool get_directory_tol" in errors
+        assert "invokes get_directory_tool, which is not one of the agent's tools" in errors
+        assert "prefetches get_my_claims, which is not one of the agent's tools" in errors
+        assert "unknown collaborator hr_expert_agent" in errors
+        assert "step schedule_meeting uses unknown tool book_meeting_tool" in errors
+        assert "onboarding_policy.pdf does not exist" in errors
+
+    def test_documents_are_relative_to_the_knowledge_base(self, tmp_path):
+        """Test that a document path written from the project root is reported, as the ADK would not find it"""
+        root = copy_project(tmp_path)
+        kb = root / "knowledge-bases/onboarding_docs.yaml"
+        kb.write_text(kb.read_text().replace('"docs/', '"knowledge-bases/docs/'))
+        manifest, _ = compile_manifest(root)
+        assert manifest.errors == ["knowledge-bases/onboarding_docs.yaml: document "
+                                   "knowledge-bases/docs/onboarding_policy.pdf does not exist"]
+
+    def test_cache_is_reused_until_content_changes(self, tmp_path, monkeypatch):
+        """Test that only a content change triggers a recompile"""
+        root = copy_project(tmp_path)
+        compiles = []
+        import runtime.manifest as manifest_module
+        original = manifest_module.compile_manifest
+        monkeypatch.setattr(manifest_module, "compile_manifest", lambda r: compiles.append(r) or original(r))
+
+        load_manifest(root)
+        load_manifest(root)
+        assert len(compiles) == 1
+
+        agent = root / "agents/hr_specialist_agent.yaml"
+        stat = agent.stat()
+        os.utime(agent, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        load_manifest(root)
+        assert len(compiles) == 1
+
+        agent.write_text(agent.read_text().replace("style: default", "style: react"))
+        assert load_manifest(root).agents["hr_specialist_agent"].config["style"] == "react"
+        assert len(compiles) == 2
+
+        (root / "agents/extra_agent.yaml").write_text("spec_version: v1\nname: extra_agent\n")
+        assert "extra_agent" in load_manifest(root).agents
+        assert len(compiles) == 3
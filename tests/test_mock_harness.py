@@ -0,0 +1,38 @@
+import os
+
+import requests
+
+from mocks.harness import MockServer, MockServices
+
+
+class TestMockHarness:
+    """Test suite for the in-process mock service harness"""
+
+    def test_tools_reach_the_harness_mocks(self, mock_services):
+        """Test that the tools use the service URLs exported by the harness"""
+        from create_profile_tool import create_profile
+        from get_directory_tool import get_directory_info
+
+        assert os.environ["HR_SERVICE_URL"] == mock_services.url("hr")
+        assert create_profile("Jane Doe", "jane@example.com", "Engineer").startswith("✅")
+        assert "Department: HR" in get_directory_info("alice@example.com")
+
+    def test_servers_get_distinct_ephemeral_ports(self):
+        """Test that several harnesses can run side by side and restore the environment"""
+        before = os.environ.get("DIRECTORY_SERVICE_URL")
+        with MockServices(["directory"]) as first, MockServices(["directory"]) as second:
+            assert first.url("directory") != second.url("directory")
+            for services in (first, second):
+                assert requests.get(f"{services.url('directory')}/directory/alice@example.com", timeout=5).ok
+        assert os.environ.get("DIRECTORY_SERVICE_URL") == before
+
+    def test_stop_releases_the_port(self):
+        """Test that a stopped server no longer accepts connections"""
+        server = MockServer("mocks.hr_service:app").start()
+        url = server.url
+        server.stop()
+        try:
+            requests.get(f"{url}/openapi.json", timeout=1)
+        except requests.exceptions.ConnectionError:
+            return
+        raise AssertionError("server still answering after stop()")
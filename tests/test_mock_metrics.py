@@ -0,0 +1,60 @@
+import re
+
+from fastapi.testclient import TestClient
+
+from mocks import directory_service, hr_service
+from mocks.middleware import registry
+
+
+def sample(text, name, **labels):
+    """Value of the sample `name` whose labels include `labels`, or None"""
+    for line in text.splitlines():
+        match = re.match(r"^(\w+)\{(.*)\} (\S+)$", line)
+        if match and match.group(1) == name:
+            found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(2)))
+            if all(found.get(key) == value for key, value in labels.items()):
+                return float(match.group(3))
+    return None
+
+
+class TestMockMetrics:
+    """Test suite for the /metrics endpoint of the mock services"""
+
+    def test_requests_are_timed_by_route(self):
+        """Test that latency is recorded per route template, not per path"""
+        client = TestClient(hr_service.app)
+        before = sample(client.get("/metrics").text, "mock_http_request_duration_seconds_count",
+                        route="/employees/{emp_id}", status="404") or 0
+        for emp_id in ("a", "b", "c"):
+            assert client.get(f"/employees/{emp_id}").status_code == 404
+
+        text = client.get("/metrics").text
+        assert "# TYPE mock_http_request_duration_seconds histogram" in text
+        assert sample(text, "mock_http_request_duration_seconds_count", service="hr",
+                      route="/employees/{emp_id}", status="404") == before + 3
+        assert sample(text, "mock_http_request_duration_seconds_bucket", route="/employees/{emp_id}",
+                      status="404", le="+Inf") == before + 3
+        assert "/employees/a" not in text and 'route="/metrics"' not in text
+
+    def test_store_sizes_and_render_time(self):
+        """Test that store gauges follow the stores and JSON serialization is timed"""
+        client = TestClient(hr_service.app)
+        client.post("/meetings", json={"subject": "Sync", "participants": ["a@example.com"],
+                                       "start_time": "2025-01-15T10:00:00"})
+        client.get("/meetings")
+
+        text = client.get("/metrics").text
+        assert sample(text, "mock_store_size", service="hr", store="meetings") == len(hr_service.meetings_db)
+        assert sample(text, "mock_store_size", service="hr", store="employees") == len(hr_service.db)
+        assert sample(text, "mock_http_response_render_seconds_count", route="/meetings", method="GET") >= 1
+        assert sample(text, "mock_http_requests_in_flight", service="hr") == 0
+
+    def test_each_service_has_its_own_metrics(self):
+        """Test that the directory mock reports its own stores under its own label"""
+        client = TestClient(directory_service.app)
+        client.get("/directory/alice@example.com")
+        text = client.get("/metrics").text
+        assert sample(text, "mock_store_size", service="directory", store="directory_entries") == \
+            len(directory_service.dir_db)
+        assert 'service="hr"' not in text
+        assert registry["directory"].in_flight == 0
@@ -1,50 +1,12 @@
 import pytest
 import requests
-import subprocess
-import time
 import os
 from pathlib import Path
 
+@pytest.mark.usefixtures("mock_services")
 class TestOnboardingAgent:
     """Test suite for the onboarding agent functionality"""
     
-    def setup_method(self):
-        """Setup method to start mock services before each test"""
-        self.hr_process = None
-        self.dir_process = None
-        
-        # Start mock HR service
-        try:
-            self.hr_process = subprocess.Popen(
-                ["python", "-m", "uvicorn", "mocks.hr_service:app", "--host", "0.0.0.0", "--port", "8001"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            time.sleep(2)  # Wait for service to start
-        except Exception as e:
-            print(f"Warning: Could not start HR service: {e}")
-        
-        # Start mock Directory service
-        try:
-            self.dir_process = subprocess.Popen(
-                ["python", "-m", "uvicorn", "mocks.directory_service:app", "--host", "0.0.0.0", "--port", "8002"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            time.sleep(2)  # Wait for service to start
-        except Exception as e:
-            print(f"Warning: Could not start Directory service: {e}")
-    
-    def teardown_method(self):
-        """Teardown method to stop mock services after each test"""
-        if self.hr_process:
-            self.hr_process.terminate()
-            self.hr_process.wait()
-        
-        if self.dir_process:
-            self.dir_process.terminate()
-            self.dir_process.wait()
-    
     def test_agent_configuration_files_exist(self):
         """Test that all required configuration files exist"""
         required_files = [
@@ -134,24 +96,18 @@ class TestOnboardingAgent:
         assert "documents" in kb_config
         
         # Check that the referenced document exists
-        doc_path = kb_config["documents"][0]
-        assert Path(doc_path).exists(), f"Referenced document {doc_path} does not exist"
+        doc_path = Path("knowledge-bases") / kb_config["documents"][0]
+        assert doc_path.exists(), f"Referenced document {doc_path} does not exist"
     
-    def test_mock_hr_service_connectivity(self):
+    def test_mock_hr_service_connectivity(self, mock_services):
         """Test that the mock HR service is accessible"""
-        try:
-            response = requests.get("http://localhost:8001/docs", timeout=5)
-            assert response.status_code == 200, "HR service should be accessible"
-        except requests.exceptions.ConnectionError:
-            pytest.skip("HR service not running - skipping connectivity test")
+        response = requests.get(f"{mock_services.url('hr')}/docs", timeout=5)
+        assert response.status_code == 200, "HR service should be accessible"
     
-    def test_mock_directory_service_connectivity(self):
+    def test_mock_directory_service_connectivity(self, mock_services):
         """Test that the mock Directory service is accessible"""
-        try:
-            response = requests.get("http://localhost:8002/docs", timeout=5)
-            assert response.status_code == 200, "Directory service should be accessible"
-        except requests.exceptions.ConnectionError:
-            pytest.skip("Directory service not running - skipping connectivity test")
+        response = requests.get(f"{mock_services.url('directory')}/docs", timeout=5)
+        assert response.status_code == 200, "Directory service should be accessible"
     
     def test_create_profile_tool_functionality(self):
         """Test that the create profile tool can be imported and called"""
@@ -96,11 +96,12 @@ class TestOnboardingAgentIssue:
             kb_config = yaml.safe_load(f)
         
         # This was another issue - the document path was incorrect
+        # Document paths are resolved against the YAML's directory
         doc_path = kb_config["documents"][0]
-        assert Path(doc_path).exists(), f"Knowledge base document {doc_path} does not exist"
+        assert (Path("knowledge-bases") / doc_path).exists(), f"Knowledge base document {doc_path} does not exist"
         
         # Verify it's pointing to the correct location
-        expected_path = "knowledge-bases/docs/onboarding_policy.pdf"
+        expected_path = "docs/onboarding_policy.pdf"
         assert doc_path == expected_path, f"Document path should be {expected_path}, got {doc_path}"
     
     def test_connections_have_proper_app_ids(self):
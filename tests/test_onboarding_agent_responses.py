@@ -102,7 +102,7 @@ class TestOnboardingAgentResponses:
         assert len(documents) > 0, "Knowledge base should reference at least one document"
         
         for doc_path in documents:
-            assert Path(doc_path).exists(), f"Referenced document {doc_path} should exist"
+            assert (Path(kb_file).parent / doc_path).exists(), f"Referenced document {doc_path} should exist"
     
     def test_agent_tools_are_functional(self):
         """Test that all agent tools are functional and can be called"""
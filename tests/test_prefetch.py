@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+import tool_cache
+from runtime.prefetch import PrefetchCall, PrefetchSession, prefetch_for_prompt, start_session
+from runtime.toolbox import resolve_tool
+
+
+def hits(tool):
+    return tool_cache.cache_stats().get(tool, {}).get("hits", 0)
+
+
+class TestPrefetch:
+    """Test suite for the conversation-start prefetcher"""
+
+    def test_session_start_fills_the_cache(self, mock_services):
+        """Test that the agent's and its collaborators' first calls are cache hits after the prefetch"""
+        session = start_session("customer_care_agent", {"plan": "PPO", "location": "Boston"})
+        assert session.wait(timeout=10)
+        calls = {call.tool: call for call in session.calls}
+        assert list(calls) == ["search_healthcare_providers", "get_healthcare_benefits",
+                               "get_my_service_now_incidents", "get_my_service_now_incident_stats"]
+        assert all(call.status == "succeeded" for call in session.calls), session.summary()
+
+        before = hits("search_healthcare_providers"), hits("get_healthcare_benefits")
+        resolve_tool("search_healthcare_providers")(location="Boston")
+        resolve_tool("get_healthcare_benefits")(plan="PPO")
+        assert (hits("search_healthcare_providers"), hits("get_healthcare_benefits")) == (before[0] + 1,
+                                                                                          before[1] + 1)
+
+    def test_starter_prompt_prefetches_its_tools(self, mock_services):
+        """Test that a starter prompt, by id or text, prefetches the tools it lists"""
+        session = prefetch_for_prompt("onboarding_agent", "Hello, I just joined. Please help me start the "
+                                      "onboarding process.", {"email": "alice@example.com"})
+        assert session.wait(timeout=10)
+        assert [(call.tool, call.arguments, call.status) for call in session.calls] == [
+            ("get_directory_tool", {"email": "alice@example.com"}, "succeeded")]
+        assert prefetch_for_prompt("onboarding_agent", "prompt_onboard").calls == []
+        with pytest.raises(KeyError):
+            prefetch_for_prompt("onboarding_agent", "prompt_missing")
+
+    def test_budget_and_failures(self):
+        """Test that calls over the budget are skipped and failing calls are recorded, not raised"""
+        def resolver(name):
+            def call(**kwargs):
+                if name == "broken":
+                    raise ConnectionError("unreachable")
+                return "❌ not found" if name == "missing" else "ok"
+            return call
+
+        calls = [PrefetchCall(tool=name) for name in ("fine", "broken", "missing", "extra")]
+        session = PrefetchSession(calls, max_calls=3, resolver=resolver).start()
+        assert session.wait(timeout=5)
+        assert [call.status for call in calls] == ["succeeded", "failed", "failed", "skipped"]
+        assert calls[1].error == "unreachable" and calls[2].error == "❌ not found"
+
+        late = [PrefetchCall(tool="fine")]
+        assert PrefetchSession(late, budget=-1, resolver=resolver).start().wait(timeout=5)
+        assert late[0].status == "skipped" and late[0].error == "time budget exhausted"
+
+    def test_cancel_skips_calls_not_started(self):
+        """Test that cancelling lets the running call finish and skips the rest"""
+        started, release = threading.Event(), threading.Event()
+
+        def resolver(name):
+            def call(**kwargs):
+                started.set()
+                release.wait(5)
+                return "ok"
+            return call
+
+        calls = [PrefetchCall(tool=f"tool{i}") for i in range(4)]
+        session = PrefetchSession(calls, workers=1, resolver=resolver).start()
+        assert started.wait(5)
+        session.cancel()
+        release.set()
+        assert session.wait(timeout=5) and session.done
+        assert [call.status for call in calls] == ["succeeded", "cancelled", "cancelled", "cancelled"]
+        assert session.summary()["status"] == {"succeeded": 1, "cancelled": 3}
@@ -0,0 +1,61 @@
+import pstats
+
+import pytest
+
+import profiling
+from mocks import servicenow_service
+from runtime.toolbox import resolve_tool
+
+
+@pytest.fixture
+def profiles(tmp_path, monkeypatch):
+    """Profile every call into a temporary directory, and switch profiling off afterwards"""
+    monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+    profiling.reset()
+    yield tmp_path
+    profiling.configure(rate=0, mode="sample")
+    servicenow_service.seed()
+
+
+@pytest.mark.usefixtures("mock_services")
+class TestProfiling:
+    """Test suite for on-demand profiling of tool calls"""
+
+    def test_sampled_stacks_are_collapsed_per_tool(self, profiles):
+        """Test that the stack sampler writes flamegraph-ready stacks rooted at the tool"""
+        servicenow_service.seed(3000)
+        profiling.configure(rate=1, mode="sample", directory=str(profiles), interval_ms=0.5)
+        tool = resolve_tool("get_my_service_now_incidents")
+        for _ in range(3):
+            tool()
+
+        assert profiling.summary()["get_my_service_now_incidents"]["calls"] == 3
+        files = list(profiles.glob("get_my_service_now_incidents.*.collapsed"))
+        assert len(files) == 1
+        lines = files[0].read_text().splitlines()
+        assert lines and all(line.startswith("get_my_service_now_incidents;") for line in lines)
+        assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+        assert any("get_my_service_now_incidents.py" in line for line in lines)
+
+    def test_cprofile_stats_are_aggregated(self, profiles):
+        """Test that cProfile statistics of several calls are merged into one file"""
+        profiling.configure(rate=1, mode="cprofile", directory=str(profiles))
+        tool = resolve_tool("get_directory_tool")
+        tool(email="alice@example.com")
+        tool(email="alice@example.com")
+
+        [path] = profiles.glob("get_directory_tool.*.pstats")
+        stats = pstats.Stats(str(path))
+        calls = {func[2]: stat[1] for func, stat in stats.stats.items()}
+        assert calls["get_directory_info"] == 2
+
+    def test_off_by_default(self, profiles):
+        """Test that nothing is profiled or written at rate 0"""
+        profiling.configure(rate=0, directory=str(profiles))
+        resolve_tool("get_my_claims")()
+        assert profiling.summary() == {} and not list(profiles.iterdir())
+
+    def test_unknown_mode(self):
+        """Test that an unknown mode is rejected"""
+        with pytest.raises(ValueError):
+            profiling.configure(mode="perf")
@@ -0,0 +1,112 @@
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+
+import rate_limit
+from mocks import servicenow_service
+from rate_limit import Priority, RateLimitTimeout, TokenBucket, priority
+from runtime.toolbox import resolve_tool
+
+
+@pytest.fixture(autouse=True)
+def fresh_buckets():
+    rate_limit.reset()
+    yield
+    rate_limit.reset()
+
+
+class TestTokenBucket:
+    """Test suite for the client-side token bucket"""
+
+    def test_bursts_then_smooths(self):
+        """Test that a burst goes through at once and the rest at the refill rate"""
+        bucket = TokenBucket(rate=50, burst=5)
+        started = time.monotonic()
+        waits = [bucket.acquire() for _ in range(15)]
+        assert all(wait < 0.01 for wait in waits[:5])
+        assert time.monotonic() - started == pytest.approx(10 / 50, abs=0.05)
+
+    def test_interactive_calls_overtake_batch_calls(self):
+        """Test that waiting interactive calls are served before batch calls queued earlier"""
+        bucket = TokenBucket(rate=20, burst=1)
+        bucket.acquire()
+        order, threads = [], []
+
+        def call(level, label):
+            bucket.acquire(level)
+            order.append(label)
+
+        for i in range(3):
+            threads.append(threading.Thread(target=call, args=(Priority.BATCH, f"batch{i}")))
+            threads[-1].start()
+        time.sleep(0.01)
+        assert bucket.estimate(Priority.BATCH) > bucket.estimate(Priority.INTERACTIVE) > 0
+        for i in range(2):
+            threads.append(threading.Thread(target=call, args=(Priority.INTERACTIVE, f"interactive{i}")))
+            threads[-1].start()
+        for thread in threads:
+            thread.join()
+        assert order[:2] == ["interactive0", "interactive1"]
+        assert sorted(order[2:]) == ["batch0", "batch1", "batch2"]
+
+    def test_wait_beyond_limit_fails_fast(self):
+        """Test that a call is refused when its estimated wait is above the limit"""
+        bucket = TokenBucket(rate=1, burst=1)
+        bucket.acquire()
+        with pytest.raises(RateLimitTimeout) as raised:
+            bucket.acquire(max_wait=0.1)
+        assert raised.value.wait == pytest.approx(1, abs=0.05)
+
+    def test_block_delays_the_next_token(self):
+        """Test that a server back-off holds every caller until it is over"""
+        bucket = TokenBucket(rate=100, burst=10)
+        bucket.block(0.2)
+        assert bucket.estimate() == pytest.approx(0.2, abs=0.02)
+        assert bucket.acquire() == pytest.approx(0.2, abs=0.05)
+
+    def test_retry_after_formats(self):
+        """Test that Retry-After is read as seconds or as an HTTP date"""
+        response = requests.Response()
+        response.headers["Retry-After"] = "3"
+        assert rate_limit.retry_after(response) == 3
+        response.headers["Retry-After"] = formatdate(time.time() + 10, usegmt=True)
+        assert rate_limit.retry_after(response) == pytest.approx(10, abs=1.5)
+        response.headers["Retry-After"] = "soon"
+        assert rate_limit.retry_after(response) is None
+
+
+@pytest.mark.usefixtures("mock_services")
+class TestServiceNowRateLimit:
+    """Test suite for rate limiting of the ServiceNow tools against the stand-in"""
+
+    def test_retry_after_is_honoured(self, monkeypatch):
+        """Test that a 429 from the instance is waited out and retried instead of failing the call"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        monkeypatch.setenv("TOOL_RATE_LIMIT", "100/100")
+        servicenow_service.set_rate_limit(per_second=2, retry_after=1)
+        try:
+            tool = resolve_tool("get_service_now_incident_by_number")
+            started = time.monotonic()
+            results = [tool(incident_number="INC0010001") for _ in range(3)]
+        finally:
+            servicenow_service.set_rate_limit(None)
+        assert all("INC0010001" in result for result in results)
+        assert time.monotonic() - started >= 0.9
+        assert rate_limit.stats()["service-now/admin"]["throttled"] == 1
+
+    def test_batch_priority_and_wait_estimates(self, monkeypatch):
+        """Test that calls are limited per connection user and report queue estimates"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        monkeypatch.setenv("RATE_LIMIT_service_now", "5/2")
+        tool = resolve_tool("get_my_service_now_incidents")
+        with priority(Priority.BATCH):
+            for _ in range(3):
+                tool()
+        assert rate_limit.estimate_wait("service-now", "admin") > 0
+        assert rate_limit.stats()["service-now/admin"]["waited"] == 1
+
+        monkeypatch.setenv("RATE_LIMIT_service_now", "off")
+        assert rate_limit.estimate_wait("service-now", "someone-else") == 0
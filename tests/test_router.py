@@ -0,0 +1,68 @@
+from runtime.router import AhoCorasick, GuidelineRouter
+
+
+def get_directory_info(email: str) -> str:
+    return f"✅ Found directory entry for {email}: Department: HR, Manager: bob@example.com"
+
+
+def create_profile(name: str, email: str, title: str) -> str:
+    return "✅ created"
+
+
+def schedule_meeting(subject: str, participants: list, start_time: str, duration_minutes: int = 60) -> str:
+    return "✅ scheduled"
+
+
+TOOLS = {
+    "get_directory_tool": get_directory_info,
+    "create_profile_tool": create_profile,
+    "schedule_meeting_tool": schedule_meeting,
+}
+
+
+def make_router():
+    return GuidelineRouter(resolver=TOOLS.__getitem__)
+
+
+class TestGuidelineRouter:
+    """Test suite for the compiled guideline router"""
+
+    def test_automaton_finds_overlapping_patterns(self):
+        """Test the classic Aho-Corasick example with overlapping patterns"""
+        automaton = AhoCorasick()
+        for pattern in ["he", "she", "his", "hers"]:
+            automaton.add(pattern, pattern)
+        automaton.build()
+        assert sorted(value for _, value in automaton.find("ushers")) == ["he", "hers", "she"]
+
+    def test_guidelines_are_compiled_from_agent_yaml(self):
+        """Test that the onboarding agent's guidelines are loaded"""
+        router = make_router()
+        tools = {g.tool for g in router.guidelines if g.agent == "onboarding_agent"}
+        assert tools == {"create_profile_tool", "schedule_meeting_tool", "get_directory_tool"}
+
+    def test_single_guideline_with_arguments_takes_fast_path(self):
+        """Test that a directory question is answered without the LLM"""
+        router = make_router()
+        decision, result = router.dispatch("What DEPARTMENT is alice@example.com in?", llm=lambda q: "llm",
+                                           agent="onboarding_agent")
+        assert decision.fast_path
+        assert decision.tool == "get_directory_tool"
+        assert decision.arguments == {"email": "alice@example.com"}
+        assert "Department: HR" in result
+
+    def test_ambiguous_or_incomplete_queries_fall_back(self):
+        """Test that the LLM is used when zero or several guidelines fire or arguments are missing"""
+        router = make_router()
+        queries = [
+            "Hello, I just joined.",
+            "Schedule meeting with my department lead",
+            "Please create profile for me",
+        ]
+        for query in queries:
+            decision, result = router.dispatch(query, llm=lambda q: "llm", agent="onboarding_agent")
+            assert not decision.fast_path and result == "llm"
+        assert "missing arguments" in router.route("Please create profile for me").reason
+
+        stats = router.stats()
+        assert stats == {"queries": 3, "fast_path": 0, "fallback": 3, "fast_path_rate": 0.0}
@@ -0,0 +1,41 @@
+from fastapi.testclient import TestClient
+from mocks.servicenow_service import app as snow_app, seed
+
+client = TestClient(snow_app)
+AUTH = ("admin", "admin")
+
+def test_create_and_get_incident():
+    seed(5)
+    resp = client.post("/api/now/table/incident", json={"short_description": "Cannot log in", "urgency": 1}, auth=AUTH)
+    assert resp.status_code == 200
+    created = resp.json()["result"]
+    assert created["number"] == "INC0010006"
+    assert created["sys_created_by"] == "admin"
+
+    resp2 = client.get(f"/api/now/table/incident/{created['sys_id']}", auth=AUTH)
+    assert resp2.json()["result"]["short_description"] == "Cannot log in"
+
+    resp3 = client.get("/api/now/table/incident", params={"number": "INC0010006"}, auth=AUTH)
+    assert [r["sys_id"] for r in resp3.json()["result"]] == [created["sys_id"]]
+
+def test_list_filters_by_creator():
+    seed(3, created_by="someone")
+    client.post("/api/now/table/incident", json={"short_description": "Mine"}, auth=AUTH)
+    rows = client.get("/api/now/table/incident", params={"sys_created_by": "admin"}, auth=AUTH).json()["result"]
+    assert [r["short_description"] for r in rows] == ["Mine"]
+
+def test_requires_basic_auth():
+    assert client.get("/api/now/table/incident").status_code == 401
+
+def test_stats_counts_matching_incidents_by_group():
+    seed(40)
+    client.post("/api/now/table/incident", json={"short_description": "Mine", "urgency": 1}, auth=AUTH)
+    params = {"sysparm_count": "true", "sysparm_group_by": "state,urgency", "sysparm_query": "stateIN1,2,3"}
+    groups = client.get("/api/now/stats/incident", params=params, auth=AUTH).json()["result"]
+    open_rows = [r for r in client.get("/api/now/table/incident", auth=AUTH).json()["result"] if r["state"] in "123"]
+    assert sum(int(g["stats"]["count"]) for g in groups) == len(open_rows)
+    assert {g["groupby_fields"][0]["value"] for g in groups} <= {"1", "2", "3"}
+
+    recent = {"sysparm_count": "true", "sysparm_query": "opened_at>=javascript:gs.daysAgoStart(1)"}
+    assert client.get("/api/now/stats/incident", params=recent, auth=AUTH).json()["result"]["stats"]["count"] == "1"
+    assert client.get("/api/now/stats/incident", params={"sysparm_group_by": "description"}, auth=AUTH).status_code == 400
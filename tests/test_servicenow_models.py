@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from mocks import servicenow_service
+from runtime.toolbox import resolve_tool
+from servicenow_models import ServiceNowIncident, incidents_from_rows, incidents_json
+
+ROW = {"sys_id": "abc", "number": "INC0010001", "short_description": "Password reset", "description": "Locked out",
+       "state": "New", "urgency": "2", "opened_at": "2025-03-01 09:00:00", "sys_created_by": "admin"}
+
+
+class TestServiceNowModels:
+    """Test suite for the shared ServiceNow incident model"""
+
+    def test_table_rows_validate_into_incidents(self):
+        """Test that Table API rows and field dicts both validate, and the schema keeps the field names"""
+        incident = ServiceNowIncident.model_validate(ROW)
+        assert incident.incident_number == "INC0010001" and incident.created_on == "2025-03-01 09:00:00"
+        assert ServiceNowIncident(**incident.model_dump()) == incident
+        assert list(ServiceNowIncident.model_json_schema()["properties"]) == [
+            "incident_number", "short_description", "description", "state", "urgency", "created_on"]
+        with pytest.raises(ValidationError):
+            incidents_from_rows([ROW, {**ROW, "urgency": None}])
+
+    def test_rows_without_a_description_have_an_empty_one(self):
+        """Test that a row with no description field validates to an empty description, as before batching"""
+        row = {key: value for key, value in ROW.items() if key != "description"}
+        assert ServiceNowIncident.model_validate(row).description == ""
+        assert [incident.description for incident in incidents_from_rows([row, ROW])] == ["", "Locked out"]
+
+    def test_batch_json_matches_per_model_json(self):
+        """Test that a result set serializes to the same JSON in one call as incident by incident"""
+        incidents = incidents_from_rows({**ROW, "number": f"INC{i:07d}"} for i in range(3))
+        assert json.loads(incidents_json(incidents)) == [json.loads(i.model_dump_json()) for i in incidents]
+
+    def test_only_the_most_recent_incidents_are_returned(self, mock_services, monkeypatch):
+        """Test that the tool returns the 10 newest of a large result set, newest first"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        servicenow_service.seed(500)
+        newest = sorted((row["opened_at"] for row in servicenow_service.incidents_db.values()), reverse=True)
+        try:
+            incidents = resolve_tool("get_my_service_now_incidents")()
+        finally:
+            servicenow_service.seed()
+        assert [incident.created_on for incident in incidents] == newest[:10]
+
+    def test_incident_stats_are_counted_by_the_server(self, mock_services, monkeypatch):
+        """Test that the stats tool reports the same counts as the incidents themselves"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        servicenow_service.seed(200)
+        rows = list(servicenow_service.incidents_db.values())
+        try:
+            stats = resolve_tool("get_my_service_now_incident_stats")()
+        finally:
+            servicenow_service.seed()
+        assert stats.total == len(rows) == sum(group.count for group in stats.groups)
+        assert stats.open == sum(1 for row in rows if row["state"] in ("1", "2", "3")) == sum(
+            stats.open_by_urgency.values())
+        assert stats.by_urgency["High"] == sum(1 for row in rows if row["urgency"] == "1")
+        assert set(stats.by_state) <= {"New", "In Progress", "On Hold", "Resolved", "Closed"}
+
+    def test_list_and_stats_count_the_connection_users_incidents(self, mock_services, monkeypatch):
+        """Test that both "my incidents" tools filter on the connection's user, whoever it is"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        monkeypatch.setenv("WXO_CONNECTION_service_now_username", "jdoe")
+        servicenow_service.seed(30, created_by="admin")
+        servicenow_service.load([{**row, "sys_id": f"j{i}", "number": f"INC{9000 + i:07d}", "sys_created_by": "jdoe"}
+                                 for i, row in enumerate(list(servicenow_service.incidents_db.values())[:12])],
+                                clear=False)
+        mine = sorted((row["opened_at"] for row in servicenow_service.incidents_db.values()
+                       if row["sys_created_by"] == "jdoe"), reverse=True)
+        try:
+            incidents = resolve_tool("get_my_service_now_incidents")()
+            stats = resolve_tool("get_my_service_now_incident_stats")()
+        finally:
+            servicenow_service.seed()
+        assert [incident.created_on for incident in incidents] == mine[:10]
+        assert stats.total == len(mine) == 12
@@ -0,0 +1,78 @@
+from benchmarks.tools import CASES, bench_tool, compare, median_result, seed_datasets
+from mocks.middleware import latency, set_latency
+from runtime.toolbox import resolve_tool
+
+
+def result(p50=10.0, alloc=100.0, throughput=100.0):
+    return {"tool": "get_directory_tool", "latency_ms": 0.0, "size": 100, "p50_ms": p50, "p95_ms": p50,
+            "p99_ms": p50, "alloc_kib_per_call": alloc, "throughput_per_s": {"8": throughput}}
+
+
+class TestToolBenchmarks:
+    """Test suite for the tool benchmark suite"""
+
+    def test_every_tool_has_a_case(self):
+        """Test that the suite covers every tool in the manifest"""
+        from runtime.manifest import get_manifest
+
+        python_tools = {name for name, tool in get_manifest().tools.items() if tool.toolkit == "python"}
+        assert set(CASES) == python_tools
+
+    def test_bench_tool_against_mocks(self, mock_services, monkeypatch):
+        """Test that a tool can be measured against the in-process mocks with injected latency"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        seed_datasets(20)
+        set_latency(5)
+        try:
+            measured = bench_tool("get_directory_tool", 20, calls=10, concurrency=[1, 4], warmup=1)
+        finally:
+            set_latency(0)
+        assert measured["p50_ms"] >= 5
+        assert measured["throughput_per_s"]["4"] > measured["throughput_per_s"]["1"]
+        assert measured["alloc_kib_per_call"] > 0
+        assert latency.mean_ms == 0
+
+    def test_failed_calls_are_counted(self, monkeypatch):
+        """Test that calls that raise or report an error are counted instead of ending the run"""
+        calls = []
+
+        def flaky(**kwargs):
+            calls.append(kwargs)
+            if len(calls) % 4 == 0:
+                raise ConnectionError("Connection aborted.")
+            return "❌ Error: not found" if len(calls) % 4 == 1 else "✅ ok"
+
+        monkeypatch.setattr(resolve_tool("get_my_claims"), "fn", flaky)
+        measured = bench_tool("get_my_claims", 20, calls=8, concurrency=[2], warmup=2)
+        assert measured["errors"] == 12 and len(calls) == 2 + 8 * 3
+        assert measured["first_error"] in ("❌ Error: not found", "ConnectionError: Connection aborted.")
+        flagged = compare([{**result(), "errors": 1}], {"results": [result()]}, 0.25, 0.5)
+        assert [r["metric"] for r in flagged] == ["errors"]
+
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        """Test that slower, hungrier or lower-throughput results are flagged"""
+        baseline = {"results": [result()]}
+        assert compare([result(p50=11.0)], baseline, tolerance=0.25, min_delta_ms=0.5) == []
+        flagged = compare([result(p50=20.0, alloc=200.0, throughput=50.0)], baseline, 0.25, 0.5)
+        assert {r["metric"] for r in flagged} == {"p50_ms", "p95_ms", "p99_ms", "alloc_kib_per_call",
+                                                  "throughput_per_s[8]"}
+
+    def test_compare_ignores_small_absolute_latency_changes(self):
+        """Test that sub-millisecond tools do not flap"""
+        baseline = {"results": [result(p50=0.01)]}
+        assert compare([result(p50=0.05)], baseline, tolerance=0.25, min_delta_ms=0.5) == []
+
+    def test_compare_ignores_small_changes_in_time_per_call(self):
+        """Test that throughput of very fast tools is held to the same absolute floor as latency"""
+        baseline = {"results": [result(throughput=20000.0)]}
+        assert compare([result(throughput=3000.0)], baseline, tolerance=0.25, min_delta_ms=0.5) == []
+        slow = {"results": [result(throughput=300.0)]}
+        assert [r["metric"] for r in compare([result(throughput=150.0)], slow, 0.25, 0.5)] == ["throughput_per_s[8]"]
+
+    def test_repeats_are_reduced_to_their_medians(self):
+        """Test that each metric is the median of the runs, so one noisy run does not move the result"""
+        runs = [{**result(p50=p50, throughput=tp), "mean_ms": p50, "errors": errors, "first_error": None}
+                for p50, tp, errors in [(10.0, 100.0, 0), (50.0, 20.0, 1), (11.0, 90.0, 0)]]
+        merged = median_result(runs)
+        assert (merged["p50_ms"], merged["throughput_per_s"], merged["errors"], merged["repeats"]) == (
+            11.0, {"8": 90.0}, 1, 3)
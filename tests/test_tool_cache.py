@@ -0,0 +1,157 @@
+import json
+
+import pytest
+from pydantic import BaseModel
+from ibm_watsonx_orchestrate.agent_builder.tools import tool, ToolPermission
+
+import tool_cache
+from runtime.toolbox import resolve_tool
+from tool_cache import cache_stats, cached, invalidates
+
+
+def make_lookup(calls, ttl=300, maxsize=1024, vary=None):
+    @cached(ttl=ttl, maxsize=maxsize, vary=vary)
+    @tool(name="lookup_tool", permission=ToolPermission.READ_ONLY)
+    def lookup(email: str, detailed: bool = False) -> str:
+        """Look up an email"""
+        calls.append(email)
+        if email.startswith("missing"):
+            return f"❌ Error: {email} not found"
+        return f"✅ {email} detailed={detailed}"
+    return lookup
+
+
+class TestToolCache:
+    """Test suite for the READ_ONLY tool result cache"""
+
+    def test_read_write_tools_are_rejected(self):
+        """Test that caching a tool that changes state is refused at decoration time"""
+        with pytest.raises(ValueError, match="read_only"):
+            @cached()
+            @tool(name="writer_tool", permission=ToolPermission.READ_WRITE)
+            def writer(name: str) -> str:
+                """Write something"""
+                return name
+
+    def test_repeated_calls_hit_the_cache(self):
+        """Test that equivalent argument spellings share one entry"""
+        calls = []
+        lookup = make_lookup(calls)
+        assert lookup("alice@example.com") == lookup(email=" alice@example.com ", detailed=False)
+        assert lookup("alice@example.com", True).endswith("detailed=True")
+        assert calls == ["alice@example.com", "alice@example.com"]
+        assert cache_stats()["lookup_tool"]["hits"] >= 1
+
+    def test_entries_expire(self, monkeypatch):
+        """Test that results are recomputed once the TTL has passed"""
+        calls = []
+        lookup = make_lookup(calls, ttl=10)
+        now = [1000.0]
+        monkeypatch.setattr(tool_cache.time, "time", lambda: now[0])
+        lookup("alice@example.com")
+        now[0] += 5
+        lookup("alice@example.com")
+        now[0] += 10
+        lookup("alice@example.com")
+        assert len(calls) == 2
+
+    def test_errors_are_not_cached(self):
+        """Test that error results are retried on the next call"""
+        calls = []
+        lookup = make_lookup(calls)
+        assert lookup("missing@example.com").startswith("❌")
+        lookup("missing@example.com")
+        assert len(calls) == 2
+
+    def test_maxsize_evicts_oldest(self):
+        """Test that each tool keeps at most `maxsize` entries"""
+        calls = []
+        lookup = make_lookup(calls, maxsize=2)
+        for email in ["a@example.com", "b@example.com", "c@example.com", "a@example.com"]:
+            lookup(email)
+        assert calls.count("a@example.com") == 2
+
+    def test_vary_separates_callers(self):
+        """Test that the vary value is part of the key"""
+        calls, user = [], ["alice"]
+        lookup = make_lookup(calls, vary=lambda: user[0])
+        lookup("x@example.com")
+        user[0] = "bob"
+        lookup("x@example.com")
+        assert len(calls) == 2
+
+    def test_write_tool_invalidates(self):
+        """Test that a successful write clears the cached reads it affects"""
+        calls = []
+        lookup = make_lookup(calls)
+
+        @invalidates("lookup_tool")
+        @tool(name="update_tool", permission=ToolPermission.READ_WRITE)
+        def update(email: str) -> str:
+            """Update an email"""
+            return "✅ updated"
+
+        lookup("alice@example.com")
+        update("alice@example.com")
+        lookup("alice@example.com")
+        assert len(calls) == 2
+
+    def test_cache_is_shared_through_the_file(self, tmp_path, monkeypatch):
+        """Test that a second tool instance (another worker) reads what the first stored"""
+        first_calls, second_calls = [], []
+        make_lookup(first_calls)("alice@example.com")
+        make_lookup(second_calls)("alice@example.com")
+        assert second_calls == []
+
+        monkeypatch.setenv("TOOL_CACHE_PATH", str(tmp_path / "other.sqlite"))
+        make_lookup(second_calls)("alice@example.com")
+        assert second_calls == ["alice@example.com"]
+
+    def test_disabled(self, monkeypatch):
+        """Test that TOOL_CACHE_DISABLED bypasses the cache"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        calls = []
+        lookup = make_lookup(calls)
+        lookup("alice@example.com")
+        lookup("alice@example.com")
+        assert len(calls) == 2
+
+    def test_results_are_stored_as_json_in_a_private_file(self, tmp_path, monkeypatch):
+        """Test that model results come back as models from JSON entries in a file only the user can read"""
+        import sqlite3
+        from typing import List
+
+        class Entry(BaseModel):
+            email: str
+            reports: List[str]
+
+        calls = []
+
+        @cached()
+        @tool(name="entries_tool", permission=ToolPermission.READ_ONLY)
+        def entries(email: str) -> List[Entry]:
+            """List entries"""
+            calls.append(email)
+            return [Entry(email=email, reports=["bob@example.com"])]
+
+        path = tmp_path / "private" / "cache.sqlite"
+        monkeypatch.setenv("TOOL_CACHE_PATH", str(path))
+        assert entries("alice@example.com") == entries("alice@example.com") == [
+            Entry(email="alice@example.com", reports=["bob@example.com"])]
+        assert len(calls) == 1
+        assert (path.parent.stat().st_mode & 0o777, path.stat().st_mode & 0o777) == (0o700, 0o600)
+        value = sqlite3.connect(path).execute("SELECT value FROM entries WHERE namespace = 'entries_tool'").fetchone()[0]
+        assert json.loads(value)["value"] == [{"email": "alice@example.com", "reports": ["bob@example.com"]}]
+
+    def test_hits_return_what_misses_did(self, mock_services):
+        """Test that a cached result has the same type as the tool's own, models and plain dicts alike"""
+        for name, kwargs in [("search_healthcare_providers", {"location": "Boston"}),
+                             ("get_my_service_now_incidents", {})]:
+            tool = resolve_tool(name)
+            before = cache_stats().get(name, {"hits": 0})["hits"]
+            miss, hit = tool(**kwargs), tool(**kwargs)
+            assert cache_stats()[name]["hits"] == before + 1
+            assert hit == miss and [type(item) for item in hit] == [type(item) for item in miss]
+        assert isinstance(miss[0], BaseModel) and isinstance(hit[0], BaseModel)
+        assert all(isinstance(provider, dict) for provider in resolve_tool("search_healthcare_providers")(
+            location="Boston"))
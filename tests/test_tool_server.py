@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from runtime.tool_server import create_app
+from runtime.toolbox import resolve_tool
+
+
+@pytest.fixture(scope="module")
+def client(mock_services):
+    with TestClient(create_app()) as client:
+        yield client
+
+
+class TestToolServer:
+    """Test suite for the warm local tool server"""
+
+    def test_lists_the_loaded_tools(self, client):
+        """Test that every Python tool is loaded once at startup and described"""
+        described = client.get("/tools").json()
+        tools = {tool["name"]: tool for tool in described["tools"]}
+        assert described["unavailable"] == {}
+        assert {"get_directory_tool", "get_healthcare_benefits", "get_my_service_now_incidents"} <= set(tools)
+        assert "onboarding_flow" not in tools
+        assert tools["get_directory_tool"]["parameters"] == ["email"]
+        assert tools["create_profile_tool"]["permission"] == "read_write"
+
+    def test_single_call(self, client, monkeypatch):
+        """Test that a tool is called with the JSON body as its arguments"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        response = client.post("/tools/get_healthcare_benefits", json={"plan": "PPO", "in_network": True})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "succeeded"
+        assert body["result"] and all(set(row) == {"Coverage", "PPO (In-Network)"} for row in body["result"])
+
+        assert client.post("/tools/get_directory_tol", json={}).status_code == 404
+        assert client.post("/tools/get_directory_tool", json={"mail": "a@example.com"}).status_code == 422
+
+    def test_batch_runs_calls_concurrently(self, client, monkeypatch):
+        """Test that a batch returns one result per call in order, failures included"""
+        monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+        calls = [{"id": "incidents", "tool": "get_my_service_now_incidents"},
+                 {"id": "providers", "tool": "search_healthcare_providers", "arguments": {"location": "Boston"}},
+                 {"id": "unknown", "tool": "get_everything"},
+                 {"id": "bad", "tool": "get_directory_tool"},
+                 {"id": "claims", "tool": "get_my_claims"}]
+        body = client.post("/batch", json={"calls": calls}).json()
+        results = {result["id"]: result for result in body["results"]}
+        assert [result["id"] for result in body["results"]] == [call["id"] for call in calls]
+        assert results["incidents"]["status"] == results["providers"]["status"] == "succeeded"
+        assert results["providers"]["result"][0]["provider_id"]
+        assert results["unknown"] == {**results["unknown"], "status": "failed", "error": "Unknown tool: get_everything"}
+        assert results["bad"]["status"] == "failed" and "email" in results["bad"]["error"]
+        assert results["claims"]["status"] == "succeeded"
+
+    def test_batch_concurrency_is_bounded(self, mock_services):
+        """Test that batch calls overlap on the worker pool, up to max_concurrency"""
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def slow(**kwargs):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return "ok"
+
+        with TestClient(create_app(["get_my_claims"], workers=8)) as client:
+            assert [tool["name"] for tool in client.get("/tools").json()["tools"]] == ["get_my_claims"]
+            tool = resolve_tool("get_my_claims")
+            original, tool.fn = tool.fn, slow
+            try:
+                started = time.perf_counter()
+                body = client.post("/batch", json={"calls": [{"tool": "get_my_claims"}] * 8,
+                                                   "max_concurrency": 4}).json()
+                elapsed = time.perf_counter() - started
+            finally:
+                tool.fn = original
+        assert [result["result"] for result in body["results"]] == ["ok"] * 8
+        assert peak[0] == 4 and elapsed < 0.35
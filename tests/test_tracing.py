@@ -0,0 +1,93 @@
+import json
+import random
+
+import pytest
+
+import tracing
+from runtime.toolbox import resolve_tool
+from tracing import LatencyHistogram
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    """Export spans to a file and start from empty histograms"""
+    monkeypatch.setenv("TOOL_CACHE_DISABLED", "1")
+    monkeypatch.setenv("TOOL_TRACE_EXPORT", str(tmp_path / "spans.jsonl"))
+    tracing.reset()
+    return tmp_path / "spans.jsonl"
+
+
+def exported_spans(path):
+    tracing.flush()
+    spans = []
+    for line in path.read_text().splitlines():
+        for resource in json.loads(line)["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                spans.extend(scope["spans"])
+    return spans
+
+
+def attributes(span):
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+class TestLatencyHistogram:
+    """Test suite for the log-linear latency histogram"""
+
+    def test_percentiles_within_relative_error(self):
+        """Test that percentiles stay within the bucket precision across magnitudes"""
+        rng = random.Random(0)
+        samples = sorted(rng.lognormvariate(0, 2) / 1000 for _ in range(20000))
+        histogram = LatencyHistogram()
+        for sample in samples:
+            histogram.record(sample)
+        for q in (50, 90, 99):
+            exact = samples[int(q / 100 * len(samples)) - 1] * 1000
+            assert histogram.percentile(q) == pytest.approx(exact, rel=0.04, abs=0.002)
+        assert len(histogram.counts) < 500
+
+    def test_merge(self):
+        """Test that merged histograms count every sample"""
+        a, b = LatencyHistogram(), LatencyHistogram()
+        for i in range(100):
+            a.record(0.001)
+            b.record(0.1)
+        a.merge(b)
+        assert a.count == 200 and a.percentile(25) == pytest.approx(1, rel=0.04)
+        assert a.summary()["max_ms"] == 100
+
+
+@pytest.mark.usefixtures("mock_services")
+class TestInstrument:
+    """Test suite for tool spans, phases and the OTLP/JSON export"""
+
+    def test_phases_and_http_spans(self, trace_file):
+        """Test that a ServiceNow call records credential, HTTP, parse and validate phases"""
+        resolve_tool("get_my_service_now_incidents")()
+        summary = tracing.latency_summary()
+        for phase in ("credentials", "http", "parse", "validate"):
+            assert summary[f"get_my_service_now_incidents/{phase}"]["count"] == 1
+
+        spans = exported_spans(trace_file)
+        root = next(s for s in spans if s["name"] == "get_my_service_now_incidents")
+        http = next(s for s in spans if s["name"] == "http")
+        assert "parentSpanId" not in root and http["parentSpanId"] == root["spanId"]
+        assert {s["traceId"] for s in spans} == {root["traceId"]}
+        assert http["kind"] == tracing.KIND_CLIENT
+        assert attributes(http)["http.response.status_code"] == "200"
+        assert int(attributes(http)["http.response.body.size"]) > 0
+        assert int(root["endTimeUnixNano"]) >= int(http["endTimeUnixNano"])
+
+    def test_error_results_set_error_status(self, trace_file):
+        """Test that a ❌ result marks the span as failed"""
+        result = resolve_tool("get_directory_tool")(email="nobody@example.com")
+        assert result.startswith("❌")
+        root = next(s for s in exported_spans(trace_file) if s["name"] == "get_directory_tool")
+        assert root["status"]["code"] == tracing.STATUS_ERROR
+
+    def test_histograms_without_export(self, trace_file, monkeypatch):
+        """Test that histograms are kept when no spans are exported"""
+        monkeypatch.delenv("TOOL_TRACE_EXPORT")
+        resolve_tool("get_my_claims")()
+        assert tracing.latency_summary()["get_my_claims"]["count"] == 1
+        assert not trace_file.exists()
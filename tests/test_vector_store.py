@@ -0,0 +1,48 @@
+import numpy as np
+
+from runtime.kb_index import build_index
+from runtime.vector_store import DenseIndex, HashingEmbedder, VectorStore, normalize, reciprocal_rank_fusion
+
+
+class TestVectorStore:
+    """Test suite for the offline quantized vector store"""
+
+    def test_hashing_embedder_is_deterministic(self):
+        """Test that the fallback embedder gives identical unit vectors on every call"""
+        embedder = HashingEmbedder(dim=64)
+        first, second = embedder.embed(["new hire orientation"]), embedder.embed(["new hire orientation"])
+        assert np.array_equal(first, second)
+        assert np.isclose(np.linalg.norm(first[0]), 1.0)
+
+    def test_quantized_search_matches_exact_search(self, tmp_path):
+        """Test that int8 and float16 stores find the same nearest neighbours as float32"""
+        rng = np.random.default_rng(0)
+        vectors = normalize(rng.standard_normal((1000, 32)).astype(np.float32))
+        queries = vectors[:20] + 0.01
+        exact = np.argsort(-(queries @ vectors.T), axis=1)[:, 0]
+
+        for dtype in ("int8", "float16"):
+            batches = (vectors[i:i + 300] for i in range(0, 1000, 300))
+            store = VectorStore.write(tmp_path / dtype, batches, 1000, 32, dtype)
+            ids, scores = store.search(queries, top_k=5)
+            assert ids.shape == (20, 5)
+            assert np.array_equal(ids[:, 0], exact)
+            assert np.all(np.diff(scores, axis=1) <= 0)
+
+    def test_reciprocal_rank_fusion(self):
+        """Test that items ranked well by both lists win the fused ranking"""
+        fused = reciprocal_rank_fusion([[1, 2, 3], [2, 3, 1]])
+        assert [item for item, _ in fused] == [2, 1, 3]
+
+    def test_dense_and_hybrid_search_over_kb(self, tmp_path):
+        """Test that dense and hybrid search return the relevant knowledge base chunk"""
+        (tmp_path / "security.txt").write_text("Configure two-factor authentication for your account.")
+        (tmp_path / "meetings.txt").write_text("Schedule your manager one-on-one within the first week.")
+        kb = tmp_path / "kb.yaml"
+        kb.write_text('name: test_kb\ndocuments:\n  - "security.txt"\n  - "meetings.txt"\n')
+        build_index(kb, tmp_path / "index")
+        DenseIndex.build(tmp_path / "index")
+
+        index = DenseIndex.load(tmp_path / "index")
+        assert index.search("manager one-on-one", top_k=1)[0].document.endswith("meetings.txt")
+        assert index.search("two-factor authentication", top_k=1, hybrid=True)[0].document.endswith("security.txt")
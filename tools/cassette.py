@@ -0,0 +1,219 @@
+"""
+Record/replay of the tools' HTTP traffic.
+
+    TOOL_CASSETTE=cassettes/healthcare.jsonl.gz TOOL_CASSETTE_MODE=record python -m runtime.eval_runner ...
+    TOOL_CASSETTE=cassettes/healthcare.jsonl.gz python -m benchmarks.tools --tools get_healthcare_benefits
+
+`CassetteAdapter` is mounted on the shared session from `http_client`, so every
+tool that sends its requests through `get_session()` is covered. The cassette
+is read from the environment on each request:
+
+- TOOL_CASSETTE: cassette file (JSONL, gzip-compressed when it ends in `.gz`);
+  unset, requests go to the network as usual
+- TOOL_CASSETTE_MODE: `replay` (default) serves recorded responses and fails a
+  request that is not in the cassette; `record` sends every request and saves
+  its response; `new` replays what is recorded and records the rest
+- TOOL_CASSETTE_LATENCY: replay each response after its recorded latency
+  times this factor (default 0, no delay)
+- TOOL_CASSETTE_MISSES: JSONL file to which every miss is appended, with the
+  tool that sent the request
+
+Requests are keyed by method, URL with sorted query parameters, JSON body with
+sorted keys and the basic-auth user. Loopback hosts are keyed without their
+port, so traffic recorded against mocks on ephemeral ports replays on any
+other port. Credentials and cookies are never written to the cassette.
+"""
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from http_client import current_tool
+
+MODES = ("replay", "record", "new")
+LOOPBACK = {"localhost", "127.0.0.1", "::1"}
+# Response headers worth keeping; the body is stored decoded, so encoding and length headers are dropped
+KEPT_HEADERS = ("content-type", "retry-after", "location", "link", "x-total-count")
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """A request in replay mode that is not in the cassette; tools handle it like an unreachable service."""
+
+
+def _basic_auth_user(request: requests.PreparedRequest) -> Optional[str]:
+    header = request.headers.get("Authorization", "")
+    if not header.startswith("Basic "):
+        return None
+    try:
+        return base64.b64decode(header[6:]).decode("utf-8").partition(":")[0]
+    except ValueError:
+        return None
+
+
+def _normalized_body(request: requests.PreparedRequest) -> Any:
+    body = request.body
+    if not body:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """Stable key of a request: the same call from any process, port or argument order maps to the same key."""
+    url = urlsplit(request.url)
+    host = (url.hostname or "").lower()
+    netloc = host if host in LOOPBACK else url.netloc.lower()
+    query = urlencode(sorted(parse_qsl(url.query, keep_blank_values=True)))
+    payload = [request.method.upper(), f"{url.scheme}://{netloc}{url.path.rstrip('/')}?{query}",
+               _normalized_body(request), _basic_auth_user(request)]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def _open(path: str, mode: str):
+    if not path.endswith(".gz"):
+        return open(path, mode, encoding="utf-8")
+    import gzip
+
+    return gzip.open(path, mode + "t", encoding="utf-8")
+
+
+class Cassette:
+    """The recorded interactions of one cassette file, loaded once and appended to as they are recorded."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.interactions: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with _open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.interactions[record["key"]] = record  # the latest recording of a key wins
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.interactions.get(key)
+
+    def record(self, key: str, request: requests.PreparedRequest, response: requests.Response, elapsed: float):
+        content = response.content
+        try:
+            body = {"body": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"body_b64": base64.b64encode(content).decode("ascii")}
+        record = {
+            "key": key,
+            "tool": current_tool.get(),
+            "method": request.method,
+            "url": request.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {name: value for name, value in response.headers.items() if name.lower() in KEPT_HEADERS},
+            **body,
+            "elapsed_ms": round(elapsed * 1000, 3),
+        }
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self.lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with _open(self.path, "a") as f:
+                f.write(line)
+            self.interactions[key] = record
+
+    def compact(self):
+        """Rewrite the file with only the latest recording of each key."""
+        with self.lock:
+            tmp = f"{self.path}.tmp"
+            with _open(tmp, "w") as f:
+                for record in self.interactions.values():
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            os.replace(tmp, self.path)
+
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+_misses: deque = deque(maxlen=1000)
+
+
+def load(path: str) -> Cassette:
+    if path not in _cassettes:
+        with _cassettes_lock:
+            if path not in _cassettes:
+                _cassettes[path] = Cassette(path)
+    return _cassettes[path]
+
+
+def misses() -> List[Dict[str, Any]]:
+    """The latest (up to 1000) requests of this process that were not in the cassette, oldest first."""
+    with _cassettes_lock:
+        return list(_misses)
+
+
+def _log_miss(key: str, request: requests.PreparedRequest, mode: str):
+    miss = {"tool": current_tool.get(), "method": request.method, "url": request.url, "key": key, "mode": mode,
+            "at": time.time()}
+    with _cassettes_lock:
+        _misses.append(miss)
+        path = os.environ.get("TOOL_CASSETTE_MISSES")
+        if path:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(miss) + "\n")
+
+
+def _replay(record: Dict[str, Any], request: requests.PreparedRequest, adapter: HTTPAdapter) -> requests.Response:
+    factor = float(os.environ.get("TOOL_CASSETTE_LATENCY", "0"))
+    if factor > 0:
+        time.sleep(record["elapsed_ms"] * factor / 1000)
+    response = requests.Response()
+    response.status_code = record["status"]
+    response.reason = record.get("reason")
+    response.headers = CaseInsensitiveDict(record["headers"])
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = (record["body"].encode("utf-8") if "body" in record
+                         else base64.b64decode(record["body_b64"]))
+    response._content_consumed = True  # iter_content() serves the body instead of reading a connection
+    response.url = request.url
+    response.request = request
+    response.connection = adapter
+    return response
+
+
+class CassetteAdapter(HTTPAdapter):
+    """HTTPAdapter that serves and records requests through the cassette named by TOOL_CASSETTE."""
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        path = os.environ.get("TOOL_CASSETTE")
+        if not path:
+            return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        mode = os.environ.get("TOOL_CASSETTE_MODE", "replay")
+        if mode not in MODES:
+            raise ValueError(f"TOOL_CASSETTE_MODE must be one of {', '.join(MODES)}, got {mode}")
+
+        cassette = load(path)
+        key = request_key(request)
+        if mode != "record":
+            record = cassette.get(key)
+            if record is not None:
+                return _replay(record, request, self)
+            _log_miss(key, request, mode)
+            if mode == "replay":
+                raise CassetteMiss(f"{request.method} {request.url} is not in cassette {path}", request=request)
+
+        started = time.perf_counter()
+        response = super().send(request, stream=False, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        cassette.record(key, request, response, time.perf_counter() - started)
+        return response
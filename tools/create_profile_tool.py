@@ -1,6 +1,12 @@
 import requests
 from ibm_watsonx_orchestrate.agent_builder.tools import tool, ToolPermission
 
+from http_client import get_session, service_url
+from tool_cache import invalidates
+from tracing import instrument
+
+@instrument
+@invalidates("get_directory_tool")
 @tool(name="create_profile_tool", description="Create a new profile", permission=ToolPermission.READ_WRITE)
 def create_profile(name: str, email: str, title: str) -> str:
 
@@ -14,12 +20,12 @@ def create_profile(name: str, email: str, title: str) -> str:
         "title": title
     }
 
-    # Call the mock HR system running on port 8001
-    url = "http://localhost:8001/employees"
+    # Call the mock HR system (port 8001 unless HR_SERVICE_URL is set)
+    url = f"{service_url('HR_SERVICE_URL', 'http://localhost:8001')}/employees"
     headers = {"Authorization": "Bearer TBD"}
 
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=5)
+        response = get_session().post(url, json=payload, headers=headers, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
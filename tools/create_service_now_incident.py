@@ -1,39 +1,20 @@
-import base64
-import json
-from typing import Optional
-
-import requests
 from requests.auth import HTTPBasicAuth
 
-from pydantic import Field, BaseModel
-
 from ibm_watsonx_orchestrate.agent_builder.tools import tool, ToolPermission
-from ibm_watsonx_orchestrate.run import connections
 
 from ibm_watsonx_orchestrate.agent_builder.connections import ConnectionType
 
-CONNECTION_SNOW = 'service-now'
-
-class ServiceNowIncidentResponse(BaseModel):
-    """
-    Represents the response received after creating a ServiceNow incident.
-    """
-    incident_number: str = Field(..., description='The incident number assigned by ServiceNow')
-    sys_id: str = Field(..., description='The system ID of the created incident')
+from http_client import get_session
+from rate_limit import rate_limited
+from servicenow_models import ServiceNowIncident, snow_credentials, table_params
+from tool_cache import invalidates
+from tracing import instrument, phase
 
-
-class ServiceNowIncident(BaseModel):
-    """
-    Represents the details of a ServiceNow incident.
-    """
-    incident_number: str = Field(..., description='The incident number assigned by ServiceNow')
-    short_description: str = Field(..., description='A brief summary of the incident')
-    description: Optional[str] = Field(None, description='Detailed information about the incident')
-    state: str = Field(..., description='Current state of the incident')
-    urgency: str = Field(..., description='Urgency level of the incident')
-    created_on: str = Field(..., description='The date and time the incident was created')
+CONNECTION_SNOW = 'service-now'
 
 
+@instrument
+@invalidates('get_my_service_now_incidents', 'get_service_now_incident_by_number', 'get_my_service_now_incident_stats')
 @tool(
     permission=ToolPermission.READ_WRITE,
     expected_credentials=[
@@ -53,7 +34,8 @@ def create_service_now_incident(
     :param urgency: Urgency level (1 - High, 2 - Medium, 3 - Low, default is 3).
     :returns: The created incident details including incident number and system ID.
     """
-    creds = connections.basic_auth(CONNECTION_SNOW)
+    with phase("credentials"):
+        creds = snow_credentials()
     base_url = creds.url
     url = f"{base_url}/api/now/table/incident"
 
@@ -67,36 +49,33 @@ def create_service_now_incident(
         'urgency': urgency
     }
 
-    response = requests.post(
+    response = rate_limited(CONNECTION_SNOW, creds.username, lambda: get_session().post(
         url,
         headers=headers,
         json=payload,
         auth=HTTPBasicAuth(creds.username, creds.password)
-    )
+    ))
     response.raise_for_status()
     data = response.json()['result']
 
     number, sys_id = data['number'], data['sys_id']
 
     url = f"{base_url}/api/now/table/incident/{sys_id}"
-    response = requests.get(
+    response = rate_limited(CONNECTION_SNOW, creds.username, lambda: get_session().get(
         url,
         headers=headers,
+        params=table_params(),
         json=payload,
         auth=HTTPBasicAuth(creds.username, creds.password)
-    )
+    ))
     response.raise_for_status()
-    data = response.json()['result']
+    with phase("parse"):
+        data = response.json()['result']
 
-    return ServiceNowIncident(
-        incident_number=data['number'],
-        sys_id=data['sys_id'],
-        short_description=data['short_description'],
-        description=data.get('description', ''),
-        state=data['state'],
-        urgency=data['urgency'],
-        created_on=data['opened_at']
-    ).model_dump_json()
+    with phase("validate"):
+        incident = ServiceNowIncident.model_validate(data)
+    with phase("format"):
+        return incident.model_dump_json()
 
 # if __name__ == '__main__':
 #     incident = create_service_now_incident(short_description='Test Incident', description='This is a test incident')
@@ -1,6 +1,12 @@
 import requests
 from ibm_watsonx_orchestrate.agent_builder.tools import tool, ToolPermission
 
+from http_client import get_session, service_url
+from tool_cache import cached
+from tracing import instrument
+
+@instrument
+@cached(ttl=300)
 @tool(name="get_directory_tool", description="Get directory information for an employee", permission=ToolPermission.READ_ONLY)
 def get_directory_info(email: str) -> str:
     """
@@ -16,12 +22,12 @@ def get_directory_info(email: str) -> str:
     if not email:
         return "Missing required parameter: email"
     
-    # Call the mock Directory service running on port 8002
-    url = f"http://localhost:8002/directory/{email}"
+    # Call the mock Directory service (port 8002 unless DIRECTORY_SERVICE_URL is set)
+    url = f"{service_url('DIRECTORY_SERVICE_URL', 'http://localhost:8002')}/directory/{email}"
     headers = {"Authorization": "Bearer TBD"}
     
     try:
-        response = requests.get(url, headers=headers, timeout=5)
+        response = get_session().get(url, headers=headers, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
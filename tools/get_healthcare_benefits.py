@@ -1,7 +1,10 @@
 from enum import Enum
 
 from ibm_watsonx_orchestrate.agent_builder.tools import tool, ToolPermission
-import requests
+
+from http_client import get_session, service_url
+from tool_cache import cached
+from tracing import instrument, phase
 
 class Plan(str, Enum):
     HDHP = 'HDHP'
@@ -9,6 +12,8 @@ class Plan(str, Enum):
     PPO = 'PPO'
 
 
+@instrument
+@cached(ttl=3600)
 @tool
 def get_healthcare_benefits(plan: Plan, in_network: bool = None):
     """
@@ -27,12 +32,16 @@ def get_healthcare_benefits(plan: Plan, in_network: bool = None):
             - 'PPO (In-Network)': The cost/percentage coverage for an in-network PPO plan
             - 'PPO (Out-of-Network)': The cost/percentage coverage for an out-of-network PPO plan
     """
-    resp = requests.get(
-        'https://get-benefits-data.1sqnxi8zv3dh.us-east.codeengine.appdomain.cloud/',
+    # Imported on first use, like the hedging pool itself, to keep it off the tool's import path
+    from hedging import hedged
+
+    resp = hedged("healthcare_benefits", lambda: get_session().get(
+        service_url('HEALTHCARE_BENEFITS_URL', 'https://get-benefits-data.1sqnxi8zv3dh.us-east.codeengine.appdomain.cloud/'),
         params={
             'plan': plan,
             'in_network': in_network
         }
-    )
+    ))
     resp.raise_for_status()
-    return resp.json()['benefits']
\ No newline at end of file
+    with phase("parse"):
+        return resp.json()['benefits']
\ No newline at end of file
@@ -1,6 +1,9 @@
 from ibm_watsonx_orchestrate.agent_builder.tools import tool
 
+from tracing import instrument
 
+
+@instrument
 @tool
 def get_my_claims():
     """
@@ -0,0 +1,83 @@
+from collections import Counter
+
+from requests.auth import HTTPBasicAuth
+
+from ibm_watsonx_orchestrate.agent_builder.tools import tool
+
+from ibm_watsonx_orchestrate.agent_builder.connections import ConnectionType
+
+from http_client import get_session
+from rate_limit import rate_limited
+from servicenow_models import (OPEN_STATES, STATE_LABELS, URGENCY_LABELS, IncidentCount, ServiceNowIncidentStats,
+                               snow_credentials, snow_identity)
+from tool_cache import cached
+from tracing import instrument, phase
+
+CONNECTION_SNOW = 'service-now'
+
+
+@instrument
+@cached(ttl=60, vary=snow_identity)
+@tool(
+    expected_credentials=[
+        {"app_id": CONNECTION_SNOW, "type": ConnectionType.BASIC_AUTH}
+    ]
+)
+def get_my_service_now_incident_stats(opened_within_days: int = None) -> ServiceNowIncidentStats:
+    """
+    Count the ServiceNow incidents that the user was the author of, by state and urgency.
+
+    :param opened_within_days: Only count incidents opened in the last this many days (optional, default all).
+    :returns: The number of incidents in total, still open, per state, per urgency and per state and urgency.
+    """
+    with phase("credentials"):
+        creds = snow_credentials()
+    url = f"{creds.url}/api/now/stats/incident"
+
+    headers = {
+        'Content-Type': 'application/json',
+        'Accept': 'application/json'
+    }
+
+    # The Aggregate API counts on the server, so only one row per (state, urgency) comes back
+    query = [f'sys_created_by={creds.username}']
+    if opened_within_days:
+        query.append(f'opened_at>=javascript:gs.daysAgoStart({int(opened_within_days)})')
+    query_params = {
+        'sysparm_count': 'true',
+        'sysparm_group_by': 'state,urgency',
+        'sysparm_query': '^'.join(query)
+    }
+
+    response = rate_limited(CONNECTION_SNOW, creds.username, lambda: get_session().get(
+        url,
+        headers=headers,
+        params=query_params,
+        auth=HTTPBasicAuth(creds.username, creds.password)
+    ))
+    response.raise_for_status()
+    with phase("parse"):
+        result = response.json()['result']
+
+    groups = []
+    for row in result:
+        fields = {f['field']: f['value'] for f in row['groupby_fields']}
+        groups.append((fields['state'], fields['urgency'], int(row['stats']['count'])))
+
+    by_state, by_urgency, open_by_urgency = Counter(), Counter(), Counter()
+    for state, urgency, count in groups:
+        by_state[STATE_LABELS.get(state, state)] += count
+        by_urgency[URGENCY_LABELS.get(urgency, urgency)] += count
+        if state in OPEN_STATES:
+            open_by_urgency[URGENCY_LABELS.get(urgency, urgency)] += count
+
+    return ServiceNowIncidentStats(
+        total=sum(by_state.values()),
+        open=sum(open_by_urgency.values()),
+        opened_within_days=opened_within_days or None,
+        by_state=dict(by_state),
+        by_urgency=dict(by_urgency),
+        open_by_urgency=dict(open_by_urgency),
+        groups=[IncidentCount(state=STATE_LABELS.get(state, state), urgency=URGENCY_LABELS.get(urgency, urgency),
+                              count=count) for state, urgency, count in groups]
+    )
@@ -1,32 +1,23 @@
-import json
-from typing import Optional, List
-
-import requests
-from pydantic import Field, BaseModel
-import base64
+import heapq
+from typing import List
 
 from requests.auth import HTTPBasicAuth
 
-from ibm_watsonx_orchestrate.agent_builder.tools import tool, ToolPermission
-from ibm_watsonx_orchestrate.run import connections
+from ibm_watsonx_orchestrate.agent_builder.tools import tool
 
 from ibm_watsonx_orchestrate.agent_builder.connections import ConnectionType
 
-CONNECTION_SNOW = 'service-now'
-
+from http_client import get_session
+from rate_limit import rate_limited
+from servicenow_models import ServiceNowIncident, incidents_from_rows, snow_credentials, snow_identity, table_params
+from tool_cache import cached
+from tracing import instrument, phase
 
-class ServiceNowIncident(BaseModel):
-    """
-    Represents the details of a ServiceNow incident.
-    """
-    incident_number: str = Field(..., description='The incident number assigned by ServiceNow')
-    short_description: str = Field(..., description='A brief summary of the incident')
-    description: Optional[str] = Field(None, description='Detailed information about the incident')
-    state: str = Field(..., description='Current state of the incident')
-    urgency: str = Field(..., description='Urgency level of the incident')
-    created_on: str = Field(..., description='The date and time the incident was created')
+CONNECTION_SNOW = 'service-now'
 
 
+@instrument
+@cached(ttl=60, vary=snow_identity)
 @tool(
     expected_credentials=[
         {"app_id": CONNECTION_SNOW, "type": ConnectionType.BASIC_AUTH}
@@ -38,7 +29,8 @@ def get_my_service_now_incidents() -> List[ServiceNowIncident]:
 
     :returns: The incident details including number, system ID, description, state, and urgency.
     """
-    creds = connections.basic_auth(CONNECTION_SNOW)
+    with phase("credentials"):
+        creds = snow_credentials()
     base_url = creds.url
     url = f"{base_url}/api/now/table/incident"
 
@@ -47,29 +39,27 @@ def get_my_service_now_incidents() -> List[ServiceNowIncident]:
         'Accept': 'application/json'
     }
 
-    query_params = {}
-    query_params['sys_created_by'] = 'admin'
+    query_params = table_params()
+    query_params['sys_created_by'] = creds.username
 
-    response = requests.get(
+    response = rate_limited(CONNECTION_SNOW, creds.username, lambda: get_session().get(
         url,
         headers=headers,
         params=query_params,
-        auth=HTTPBasicAuth(creds.username, creds.password)
-    )
-    response.raise_for_status()
-    data = response.json()['result']
+        auth=HTTPBasicAuth(creds.username, creds.password),
+        stream=True
+    ))
+    with response:
+        response.raise_for_status()
+        # Rows are parsed as the (gzip-compressed) body arrives and only the 10 most recent are kept,
+        # so memory does not grow with the number of incidents; only those 10 are validated
+        with phase("parse"):
+            # Imported on first use, so the streaming parser stays off the tool's import path
+            from json_stream import iter_records
 
-    lst = [ServiceNowIncident(
-        incident_number=d['number'],
-        short_description=d['short_description'],
-        description=d.get('description', ''),
-        state=d['state'],
-        urgency=d['urgency'],
-        created_on=d['opened_at']
-    ) for d in data]
-    lst.sort(key=lambda o: o.created_on, reverse=True)
-    lst = lst[:min(len(lst), 10)]
-    return lst
+            recent = heapq.nlargest(10, iter_records(response), key=lambda d: d['opened_at'])
+    with phase("validate", rows=len(recent)):
+        return incidents_from_rows(recent)
 
 # if __name__ == '__main__':
 #     incidents = get_my_service_now_incidents()
@@ -0,0 +1,202 @@
+"""
+Hedged requests to endpoints with a long latency tail.
+
+    resp = hedged("healthcare_benefits", lambda: get_session().get(url, params=params))
+
+With hedging on (TOOL_HEDGE=1), a call whose request has not answered within
+the TOOL_HEDGE_PERCENTILE (default 95) percentile of the endpoint's recent
+latencies sends the same request again, and whichever answers first is
+returned; the other is left to finish in the background and discarded. Only
+use it for idempotent requests such as GETs.
+
+Hedges are capped at TOOL_HEDGE_MAX_RATE (default 0.1) of the calls to an
+endpoint: each call earns that fraction of a hedge, and a hedge is only sent
+while a whole one has been earned, so a slow backend sees at most ~10% extra
+load rather than twice as many requests. No hedge is sent before an endpoint
+has TOOL_HEDGE_MIN_SAMPLES (default 20) latencies in its window of the last
+TOOL_HEDGE_WINDOW (default 200). `stats()` has the calls, hedges sent, hedges
+that won and hedges skipped because of the cap per endpoint.
+
+Hedged calls run their requests on a shared pool of TOOL_HEDGE_WORKERS
+(default 64) threads, with the caller's context (tool name, trace span, ...);
+calls that cannot be hedged run in the calling thread as before.
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Dict, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+T = TypeVar("T")
+
+
+def _enabled() -> bool:
+    return os.environ.get("TOOL_HEDGE", "").lower() in ("1", "true", "yes", "on")
+
+
+def _setting(name: str, default: str) -> float:
+    return float(os.environ.get(name, default))
+
+
+class HedgePolicy:
+    """
+    Recent latencies, hedge budget and counters of one endpoint.
+
+    Args:
+        window: Number of recent request latencies the hedge delay is computed from
+    """
+
+    def __init__(self, window: int = 200):
+        self.lock = threading.Lock()
+        self.latencies: deque = deque(maxlen=window)
+        self.budget = 1.0
+        self.stats = {"calls": 0, "hedges_sent": 0, "hedges_won": 0, "hedges_capped": 0}
+
+    def record(self, seconds: float):
+        with self.lock:
+            self.latencies.append(seconds)
+
+    def delay(self, percentile: float, min_samples: int) -> Optional[float]:
+        """Seconds to wait for the first request before hedging, None while there are too few samples."""
+        with self.lock:
+            if len(self.latencies) < max(1, min_samples):
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+    def start_call(self, max_rate: float):
+        with self.lock:
+            self.stats["calls"] += 1
+            # Earned hedges are capped, so a quiet period does not allow a burst of hedges later
+            self.budget = min(self.budget + max_rate, max(1.0, max_rate * 10))
+
+    def capped(self):
+        with self.lock:
+            self.stats["hedges_capped"] += 1
+
+    def take_hedge(self) -> bool:
+        with self.lock:
+            if self.budget < 1:
+                self.stats["hedges_capped"] += 1
+                return False
+            self.budget -= 1
+            self.stats["hedges_sent"] += 1
+            return True
+
+    def hedge_won(self):
+        with self.lock:
+            self.stats["hedges_won"] += 1
+
+
+_policies: Dict[str, HedgePolicy] = {}
+_policies_lock = threading.Lock()
+_pool: Optional["ThreadPoolExecutor"] = None
+
+
+def policy(name: str) -> HedgePolicy:
+    found = _policies.get(name)
+    if found is None:
+        with _policies_lock:
+            found = _policies.get(name)
+            if found is None:
+                found = _policies[name] = HedgePolicy(int(_setting("TOOL_HEDGE_WINDOW", "200")))
+    return found
+
+
+def _executor() -> "ThreadPoolExecutor":
+    global _pool
+    if _pool is None:
+        with _policies_lock:
+            if _pool is None:
+                # Imported on the first hedgeable call, so tools that never hedge do not pay for it
+                from concurrent.futures import ThreadPoolExecutor
+                _pool = ThreadPoolExecutor(max_workers=int(_setting("TOOL_HEDGE_WORKERS", "64")),
+                                           thread_name_prefix="hedge")
+    return _pool
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """Calls, hedges sent, hedges won and hedges skipped by the rate cap per endpoint in this process."""
+    with _policies_lock:
+        return {name: dict(p.stats) for name, p in _policies.items()}
+
+
+def reset():
+    with _policies_lock:
+        _policies.clear()
+
+
+def _submit(endpoint: HedgePolicy, send: Callable[[], T]) -> "Future":
+    started = time.perf_counter()
+    context = contextvars.copy_context()
+    future = _executor().submit(context.run, send)
+    # Every attempt's latency counts, including those that lost or were abandoned, so the tail stays visible
+    future.add_done_callback(lambda _: endpoint.record(time.perf_counter() - started))
+    return future
+
+
+def _discard(future: "Future"):
+    """Close the response of an attempt that lost, once it arrives."""
+    def close(done: "Future"):
+        if not done.cancelled() and done.exception() is None:
+            close_response = getattr(done.result(), "close", None)
+            if close_response is not None:
+                close_response()
+
+    future.add_done_callback(close)
+
+
+def hedged(name: str, send: Callable[[], T], enabled: Optional[bool] = None) -> T:
+    """
+    Send an idempotent request, and a second copy of it if the first is slower than usual.
+
+    Args:
+        name: Endpoint the request goes to; latencies and hedge budgets are kept per name
+        send: Sends the request and returns its response
+        enabled: Hedge regardless of TOOL_HEDGE (True) or never (False)
+
+    Returns:
+        The response of whichever request answered first (or of the other one, if the first failed)
+
+    Raises:
+        Exception: What `send` raised, if every request that was sent failed
+    """
+    if not (_enabled() if enabled is None else enabled):
+        return send()
+    endpoint = policy(name)
+    endpoint.start_call(_setting("TOOL_HEDGE_MAX_RATE", "0.1"))
+    delay = endpoint.delay(_setting("TOOL_HEDGE_PERCENTILE", "95"), int(_setting("TOOL_HEDGE_MIN_SAMPLES", "20")))
+    if delay is None or endpoint.budget < 1:
+        # Not hedgeable right now: no thread hop, but the latency still feeds the window
+        started = time.perf_counter()
+        try:
+            return send()
+        finally:
+            elapsed = time.perf_counter() - started
+            endpoint.record(elapsed)
+            if delay is not None and elapsed > delay:
+                endpoint.capped()
+
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    first = _submit(endpoint, send)
+    done, _ = wait([first], timeout=delay)
+    if done or not endpoint.take_hedge():
+        return first.result()
+
+    second = _submit(endpoint, send)
+    pending = {first, second}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        winner = next((f for f in (first, second) if f in done and f.exception() is None), None)
+        if winner is not None:
+            if winner is second:
+                endpoint.hedge_won()
+            for loser in pending:
+                _discard(loser)
+            return winner.result()
+    return first.result()  # both failed: raise the first request's error
@@ -0,0 +1,72 @@
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional
+
+import requests
+from urllib3.util.retry import Retry
+
+# Sized for the bulk pipeline's default concurrency; keep-alive connections are
+# reused across tool calls instead of opening a new socket per request.
+POOL_SIZE = int(os.environ.get("TOOL_HTTP_POOL_SIZE", "32"))
+
+# A pooled connection the server has already closed fails with a reset on reuse; idempotent
+# requests are sent again on a new connection. Statuses (including 429s, which `rate_limit`
+# handles) are returned as they are.
+RETRIES = Retry(total=2, allowed_methods={"GET", "HEAD"}, backoff_factor=0.05, status_forcelist=(),
+                respect_retry_after_header=False, raise_on_status=False)
+
+_session = None
+_lock = threading.Lock()
+
+# Name of the tool whose call is in progress, for attributing HTTP traffic (see `cassette`)
+current_tool: ContextVar[Optional[str]] = ContextVar("current_tool", default=None)
+
+
+@contextmanager
+def calling_tool(name: str):
+    """Attribute the requests sent inside the block to the tool `name`."""
+    token = current_tool.set(name)
+    try:
+        yield
+    finally:
+        current_tool.reset(token)
+
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session shared by the Python tools.
+
+    Returns:
+        requests.Session: A session with a connection pool of TOOL_HTTP_POOL_SIZE per host
+            that retries GET/HEAD requests on connection errors (RETRIES), recording or replaying through the cassette named by TOOL_CASSETTE and timing
+            the requests of instrumented tools
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                from tracing import TracedAdapter
+
+                session = requests.Session()
+                # The session is shared by every tool call in the process, whoever the caller, so
+                # cookies (e.g. a ServiceNow session) must not carry over from one call to the next
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = TracedAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=RETRIES)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def service_url(env_var: str, default: str) -> str:
+    """
+    Base URL of a backing service, read on every call so tests can point tools at their own mocks.
+
+    Args:
+        env_var: Environment variable holding the URL (e.g. HR_SERVICE_URL)
+        default: URL used when the variable is not set
+    """
+    return os.environ.get(env_var, default).rstrip("/")
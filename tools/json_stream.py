@@ -0,0 +1,146 @@
+"""
+Incremental parsing of Table API responses.
+
+    response = get_session().get(url, params=params, stream=True)
+    with response:
+        for row in iter_records(response):
+            ...
+
+`iter_result` reads a JSON document such as `{"result": [{...}, {...}]}` from
+an iterable of byte chunks and yields the elements of its `result` array as
+soon as each one is complete, so the first row is available before the body
+has finished arriving and the rows never have to be held in memory at once.
+Each element is decoded with the standard library's C scanner; only the
+framing of the document is handled here. A `result` that is an object (a
+single record) is yielded as one element; other top-level keys are skipped.
+"""
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+import requests
+
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+_separator = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class _Buffer:
+    """Decoded text of the chunks read so far, of which everything before `pos` has been consumed."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read another chunk; False at the end of the input."""
+        if self.eof:
+            return False
+        for chunk in self.chunks:
+            if chunk:
+                # Drop the consumed text, so the buffer holds about one element and one chunk
+                self.text = self.text[self.pos:] + self.decoder.decode(chunk)
+                self.pos = 0
+                return True
+        self.text = self.text[self.pos:] + self.decoder.decode(b"", final=True)
+        self.pos = 0
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """The next character after whitespace, or '' at the end of the input."""
+        while True:
+            self.pos = _whitespace.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        found = self.peek()
+        if not found or found not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON response, found {found or 'end of input'!r}")
+        self.pos += 1
+        return found
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more chunks until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                self.peek()
+                continue
+            # A number cut at the end of the buffer (`12` of `123`, `-0` of `-0.5`) continues in the next chunk
+            if not isinstance(value, (dict, list, str)) and \
+                    (end == len(self.text) or self.text[end] in _NUMBER_CHARS) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def elements(self) -> Iterator[Any]:
+        """Yield the elements of the array whose `[` has just been consumed, and consume its `]`."""
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        scan, separator = _decoder.scan_once, _separator.match
+        while True:
+            # Fast path for an element that is complete in the buffer and followed by its separator;
+            # anything else (an element cut by the end of a chunk, malformed input) goes through value()
+            try:
+                value, end = scan(self.text, self.pos)
+            except (StopIteration, json.JSONDecodeError):
+                end = -1
+            if end < 0 or type(value) is not dict and (end == len(self.text) or self.text[end] in _NUMBER_CHARS):
+                value = self.value()
+                end = self.pos
+            match = separator(self.text, end)
+            if match is not None:
+                self.pos = match.end()
+                found = match.group(1)
+            else:
+                self.pos = end
+                found = self.expect(",]")
+            yield value
+            if found == "]":
+                return
+
+
+def iter_result(chunks: Iterable[bytes], key: str = "result") -> Iterator[Any]:
+    """
+    Yield the elements of the `key` array of a JSON object read from byte chunks.
+
+    Raises:
+        ValueError: If the input is not a JSON object or is truncated
+    """
+    buffer = _Buffer(chunks)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        name = buffer.value()
+        buffer.expect(":")
+        if name == key and buffer.peek() == "[":
+            buffer.expect("[")
+            yield from buffer.elements()
+        elif name == key:
+            yield buffer.value()
+        else:
+            buffer.value()
+        if buffer.expect(",}") == "}":
+            return
+
+
+def iter_records(response: requests.Response, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the `result` records of a Table API response as its (decompressed) body arrives."""
+    return iter_result(response.iter_content(chunk_size))
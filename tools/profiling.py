@@ -0,0 +1,220 @@
+"""
+On-demand profiling of tool calls.
+
+    TOOL_PROFILE_RATE=0.05 TOOL_PROFILE_DIR=/tmp/profiles python -m benchmarks.tools
+    flamegraph.pl /tmp/profiles/get_my_service_now_incidents.*.collapsed > incidents.svg
+
+`tracing.instrument` hands a sampled fraction of the calls of every tool to
+`profile()`. Two modes are supported:
+
+- `sample` (default): a background thread snapshots the stacks of the threads
+  running profiled calls every TOOL_PROFILE_INTERVAL_MS (default 2) and counts
+  them per tool. The calls themselves run unmodified, so this is cheap enough
+  for production. Stacks are written as `<tool>.<pid>.collapsed`, the
+  collapsed-stack format read by flamegraph.pl, speedscope and similar tools.
+- `cprofile`: each profiled call runs under cProfile, and the statistics are
+  aggregated per tool into `<tool>.<pid>.pstats` (for pstats, snakeviz, ...).
+  A call that starts while another is being profiled with cProfile is not
+  profiled.
+
+The settings are read from TOOL_PROFILE_RATE (fraction of calls, default 0:
+off), TOOL_PROFILE_MODE and TOOL_PROFILE_DIR when the module is imported, and
+can be changed at runtime with `configure()`. Switched off, a tool call costs
+one attribute check.
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import pstats
+
+MODES = ("sample", "cprofile")
+
+
+class _Settings:
+    def __init__(self):
+        self.rate = float(os.environ.get("TOOL_PROFILE_RATE", "0"))
+        self.mode = os.environ.get("TOOL_PROFILE_MODE", "sample")
+        self.directory = os.environ.get("TOOL_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "tool_profiles"))
+        self.interval = float(os.environ.get("TOOL_PROFILE_INTERVAL_MS", "2")) / 1000
+
+
+settings = _Settings()
+
+
+def configure(rate: Optional[float] = None, mode: Optional[str] = None, directory: Optional[str] = None,
+              interval_ms: Optional[float] = None):
+    """
+    Change the profiling settings of this process.
+
+    Args:
+        rate: Fraction of tool calls to profile, 0 to switch profiling off
+        mode: `sample` or `cprofile`
+        directory: Where profile files are written
+        interval_ms: Sampling interval of the `sample` mode
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode is not None:
+        if mode not in MODES:
+            raise ValueError(f"Profiling mode must be one of {', '.join(MODES)}, got {mode}")
+        settings.mode = mode
+    if rate is not None:
+        settings.rate = rate
+    if directory is not None:
+        settings.directory = directory
+    if interval_ms is not None:
+        settings.interval = interval_ms / 1000
+
+
+def sampled() -> bool:
+    return settings.rate >= 1 or random.random() < settings.rate
+
+
+class _ToolProfile:
+    def __init__(self):
+        self.calls = 0
+        self.stacks: Counter = Counter()
+        self.stats: Optional["pstats.Stats"] = None
+
+
+_lock = threading.Lock()
+_profiles: Dict[str, _ToolProfile] = {}
+
+
+def _tool_profile(tool: str) -> _ToolProfile:
+    if tool not in _profiles:
+        _profiles[tool] = _ToolProfile()
+    return _profiles[tool]
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _Sampler:
+    """Periodically records the stacks of the threads that are running profiled calls."""
+
+    def __init__(self):
+        self.active: Dict[int, tuple] = {}  # thread id -> (tool, frame the profiled call started in)
+        self.wakeup = threading.Condition(_lock)
+        self.thread: Optional[threading.Thread] = None
+
+    def register(self, tool: str, frame):
+        with _lock:
+            self.active[threading.get_ident()] = (tool, frame)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="tool-profiler", daemon=True)
+                self.thread.start()
+            self.wakeup.notify()
+
+    def unregister(self):
+        with _lock:
+            self.active.pop(threading.get_ident(), None)
+
+    def _run(self):
+        while True:
+            with _lock:
+                while not self.active:
+                    self.wakeup.wait()  # idle until a profiled call starts
+                active = dict(self.active)
+            frames = sys._current_frames()
+            samples = []
+            for thread_id, (tool, root) in active.items():
+                frame = frames.get(thread_id)
+                stack = []
+                # Walk up to the frame the profiled call started in, so stacks begin at the tool
+                while frame is not None and frame is not root:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if frame is root and stack:
+                    samples.append((tool, ";".join([tool] + stack[::-1])))
+            del frames
+            if samples:
+                with _lock:
+                    for tool, stack in samples:
+                        _tool_profile(tool).stacks[stack] += 1
+            time.sleep(settings.interval)
+
+
+_sampler = _Sampler()
+
+
+def _path(tool: str, suffix: str) -> str:
+    os.makedirs(settings.directory, exist_ok=True)
+    return os.path.join(settings.directory, f"{tool}.{os.getpid()}.{suffix}")
+
+
+def collapsed(tool: str) -> str:
+    """The stacks sampled for `tool`, in collapsed-stack format."""
+    with _lock:
+        stacks = dict(_tool_profile(tool).stacks)
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+def summary() -> Dict[str, Dict[str, int]]:
+    """Profiled calls and stack samples per tool in this process."""
+    with _lock:
+        return {tool: {"calls": p.calls, "samples": sum(p.stacks.values())} for tool, p in _profiles.items()}
+
+
+def reset():
+    with _lock:
+        _profiles.clear()
+
+
+def _write_collapsed(tool: str):
+    text = collapsed(tool)
+    if text:
+        tmp = _path(tool, "collapsed.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, _path(tool, "collapsed"))
+
+
+@contextmanager
+def profile(tool: str):
+    """Profile the call running inside the block with the configured mode, and write the tool's aggregate."""
+    if settings.mode == "cprofile":
+        # Imported when first needed, so tools that are never profiled with cProfile do not load it
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows a single active cProfile per process
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            with _lock:
+                profile_ = _tool_profile(tool)
+                profile_.calls += 1
+                if profile_.stats is None:
+                    profile_.stats = pstats.Stats(profiler)
+                else:
+                    profile_.stats.add(profiler)
+                profile_.stats.dump_stats(_path(tool, "pstats"))
+        return
+
+    _sampler.register(tool, sys._getframe(2))  # the frame of the function that entered this block
+    try:
+        yield
+    finally:
+        _sampler.unregister()
+        with _lock:
+            _tool_profile(tool).calls += 1
+        _write_collapsed(tool)
@@ -0,0 +1,253 @@
+"""
+Client-side rate limiting of calls to rate-limited backends such as ServiceNow.
+
+    response = rate_limited(CONNECTION_SNOW, creds.username, lambda: get_session().get(url, ...))
+
+    with priority(Priority.BATCH):      # background sync: yields to interactive calls
+        get_my_service_now_incidents()
+
+Each (connection app_id, user) pair has a token bucket shared by all threads of
+the process. A call takes a token, waiting if the bucket is empty; waiting calls
+are served by priority (interactive before batch), then in arrival order. A 429
+response blocks the bucket for the `Retry-After` the server asked for (or an
+exponential backoff without one), after which the call is retried and traffic
+ramps up again from a single token. `estimate_wait()` tells a caller how long
+a call would queue.
+
+Rates are `<per second>/<burst>`, from RATE_LIMIT_<app_id> (non-alphanumerics
+replaced by `_`, e.g. RATE_LIMIT_service_now) or TOOL_RATE_LIMIT (default
+10/20); `off` disables limiting. A call that would wait more than TOOL_RATE_LIMIT_MAX_WAIT seconds
+(default 30) fails with RateLimitTimeout instead.
+"""
+import heapq
+import itertools
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+DEFAULT_LIMIT = "10/20"
+MAX_RETRIES = 3
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class RateLimitTimeout(requests.exceptions.RequestException):
+    """The call would have waited longer than allowed for a token."""
+
+    def __init__(self, message: str, wait: float):
+        super().__init__(message)
+        self.wait = wait
+
+
+current_priority: ContextVar[Priority] = ContextVar("current_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def priority(value: Priority):
+    """Run the calls made inside the block with priority `value`."""
+    token = current_priority.set(value)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+def _max_wait() -> float:
+    return float(os.environ.get("TOOL_RATE_LIMIT_MAX_WAIT", "30"))
+
+
+def _limit(app_id: str) -> Optional[Tuple[float, float]]:
+    value = os.environ.get(f"RATE_LIMIT_{re.sub(r'[^A-Za-z0-9]', '_', app_id)}",
+                           os.environ.get("TOOL_RATE_LIMIT", DEFAULT_LIMIT))
+    if value.strip().lower() in ("off", "0", ""):
+        return None
+    rate, _, burst = value.partition("/")
+    return float(rate), float(burst or rate)
+
+
+class TokenBucket:
+    """
+    Token bucket whose waiters are served by (priority, arrival).
+
+    Args:
+        rate: Tokens added per second
+        burst: Most tokens held, i.e. the largest burst let through at once
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.condition = threading.Condition()
+        self.waiters = []  # heap of (priority, arrival)
+        self.arrivals = itertools.count()
+        self.stats = {"granted": 0, "waited": 0, "wait_seconds": 0.0, "throttled": 0, "timeouts": 0}
+
+    def _refill(self, now: float):
+        # After a 429 `updated` is in the future: nothing refills until the block is over
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def _wait_for(self, ahead: int, now: float) -> float:
+        """Seconds until a token is free for a caller with `ahead` waiters in front of it."""
+        start = max(now, self.blocked_until)
+        return (start - now) + max(0.0, ahead + 1 - self.tokens) / self.rate
+
+    def estimate(self, priority: Priority = Priority.INTERACTIVE) -> float:
+        """Seconds a call of `priority` made now would wait for its token."""
+        with self.condition:
+            now = time.monotonic()
+            self._refill(now)
+            ahead = sum(1 for waiter in self.waiters if waiter[0] <= priority)
+            return self._wait_for(ahead, now)
+
+    def acquire(self, priority: Priority = Priority.INTERACTIVE, max_wait: Optional[float] = None) -> float:
+        """
+        Take a token, waiting behind calls of the same or higher priority.
+
+        Returns:
+            float: Seconds waited
+
+        Raises:
+            RateLimitTimeout: If the token would not be available within `max_wait` seconds
+        """
+        started = time.monotonic()
+        with self.condition:
+            ticket = (priority, next(self.arrivals))
+            ahead = sum(1 for waiter in self.waiters if waiter < ticket)
+            self._refill(started)
+            estimate = self._wait_for(ahead, started)
+            if max_wait is not None and estimate > max_wait:
+                self.stats["timeouts"] += 1
+                raise RateLimitTimeout(f"Rate limited: a token would take {estimate:.1f}s", estimate)
+            heapq.heappush(self.waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self.waiters[0] == ticket and now >= self.blocked_until and self.tokens >= 1:
+                        heapq.heappop(self.waiters)
+                        self.tokens -= 1
+                        waited = now - started
+                        self.stats["granted"] += 1
+                        if waited > 0.001:
+                            self.stats["waited"] += 1
+                            self.stats["wait_seconds"] += waited
+                        return waited
+                    position = sum(1 for waiter in self.waiters if waiter < ticket)
+                    self.condition.wait(max(0.001, self._wait_for(position, now)))
+            finally:
+                if ticket in self.waiters:
+                    self.waiters.remove(ticket)
+                    heapq.heapify(self.waiters)
+                # The next waiter may be able to go now
+                self.condition.notify_all()
+
+    def block(self, seconds: float):
+        """Stop granting tokens for `seconds` (the server asked us to back off), then resume with a single token."""
+        with self.condition:
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + seconds)
+            self.tokens = 1.0
+            self.updated = self.blocked_until
+            self.stats["throttled"] += 1
+            self.condition.notify_all()
+
+
+_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket(app_id: str, user: Optional[str]) -> Optional[TokenBucket]:
+    """The bucket of (app_id, user), or None when limiting is off for the app."""
+    key = (app_id, user or "")
+    found = _buckets.get(key)
+    if found is None:
+        limit = _limit(app_id)
+        if limit is None:
+            return None
+        with _buckets_lock:
+            found = _buckets.get(key)
+            if found is None:
+                found = _buckets[key] = TokenBucket(*limit)
+    return found
+
+
+def estimate_wait(app_id: str, user: Optional[str], priority: Optional[Priority] = None) -> float:
+    """Seconds a call to `app_id` as `user` would currently queue for (0 when it would go immediately)."""
+    limiter = bucket(app_id, user)
+    if limiter is None:
+        return 0.0
+    return limiter.estimate(current_priority.get() if priority is None else priority)
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """Granted calls, waits, 429s and timeouts per `app_id/user` in this process."""
+    with _buckets_lock:
+        return {f"{app_id}/{user}": dict(b.stats) for (app_id, user), b in _buckets.items()}
+
+
+def reset():
+    with _buckets_lock:
+        _buckets.clear()
+
+
+def retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds to wait according to the response's Retry-After header (delta-seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def rate_limited(app_id: str, user: Optional[str], send: Callable[[], requests.Response],
+                 max_retries: int = MAX_RETRIES) -> requests.Response:
+    """
+    Send a request through the (app_id, user) bucket, retrying after 429 responses.
+
+    Args:
+        app_id: Connection the request is made with, e.g. `service-now`
+        user: User the connection authenticates as
+        send: Sends the request and returns its response
+        max_retries: 429 responses retried before the last one is returned
+
+    Returns:
+        requests.Response: The first response that is not a 429, or the last 429
+
+    Raises:
+        RateLimitTimeout: If a token would take longer than TOOL_RATE_LIMIT_MAX_WAIT
+    """
+    limiter = bucket(app_id, user)
+    if limiter is None:
+        return send()
+    level = current_priority.get()
+    for attempt in range(max_retries + 1):
+        limiter.acquire(level, _max_wait())
+        response = send()
+        if response.status_code != 429 or attempt == max_retries:
+            return response
+        delay = retry_after(response)
+        response.close()  # a streamed 429 would otherwise hold its connection until collected
+        limiter.block(delay if delay is not None else min(2.0 ** attempt, 30.0))
+    return response
@@ -0,0 +1,14 @@
+"""
+Conventions for tool results shared by the tool helpers and the runtime.
+
+Tools in this repo report failures as a string starting with ❌ rather than
+raising; tracing marks those calls as errors, the cache does not store them,
+and the runtime (flows, prefetch, the tool server, the benchmarks) treats them
+as failed calls.
+"""
+from typing import Any
+
+
+def is_error_result(result: Any) -> bool:
+    """Whether a tool returned a failure message (a string starting with ❌)."""
+    return isinstance(result, str) and result.lstrip().startswith("❌")
@@ -2,6 +2,9 @@ import uuid
 from datetime import datetime
 from ibm_watsonx_orchestrate.agent_builder.tools import tool, ToolPermission
 
+from tracing import instrument
+
+@instrument
 @tool(name="schedule_meeting_tool", description="Schedule a meeting with specified participants", permission=ToolPermission.READ_WRITE)
 def schedule_meeting(subject: str, participants: list, start_time: str, duration_minutes: int = 60) -> str:
     """
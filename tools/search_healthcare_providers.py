@@ -1,11 +1,14 @@
 from typing import List
 
-import requests
 from pydantic import BaseModel, Field
 from enum import Enum
 
 from ibm_watsonx_orchestrate.agent_builder.tools import tool, ToolPermission
 
+from http_client import get_session, service_url
+from tool_cache import cached
+from tracing import instrument, phase
+
 
 class ContactInformation(BaseModel):
     phone: str
@@ -30,6 +33,8 @@ class HealthcareProvider(BaseModel):
     contact: ContactInformation = Field(None, description="The contact information of the provider")
 
 
+@instrument
+@cached(ttl=3600)
 @tool
 def search_healthcare_providers(
         location: str,
@@ -45,12 +50,16 @@ def search_healthcare_providers(
 
     :returns: A list of healthcare providers near a particular location for a given speciality
     """
-    resp = requests.get(
-        'https://find-provider.1sqnxi8zv3dh.us-east.codeengine.appdomain.cloud',
+    # Imported on first use, like the hedging pool itself, to keep it off the tool's import path
+    from hedging import hedged
+
+    resp = hedged("healthcare_providers", lambda: get_session().get(
+        service_url('HEALTHCARE_PROVIDERS_URL', 'https://find-provider.1sqnxi8zv3dh.us-east.codeengine.appdomain.cloud'),
         params={
             'location': location,
             'speciality': specialty
         }
-    )
+    ))
     resp.raise_for_status()
-    return resp.json()['providers']
\ No newline at end of file
+    with phase("parse"):
+        return resp.json()['providers']
\ No newline at end of file
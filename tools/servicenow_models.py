@@ -0,0 +1,122 @@
+"""
+Models and connection helpers shared by the ServiceNow tools.
+
+The models are defined here once, so a process that loads several ServiceNow
+tools (the tool server, the benchmarks, an agent runtime) builds each pydantic
+model a single time instead of once per tool module.
+
+Table API rows are validated straight into `ServiceNowIncident`: the row keys
+(`number`, `opened_at`) are accepted as aliases, and `incidents_from_rows` /
+`incidents_json` validate and serialize a whole result set in one call into
+pydantic-core instead of one call per row. With pydantic 2 this is also faster
+than skipping validation with `model_construct`, which runs in Python; see
+`python -m benchmarks.incident_model`.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydantic import AliasChoices, BaseModel, Field, TypeAdapter
+
+# The tools repeat this app_id as a literal of their own: the manifest reads `@tool` arguments
+# without importing anything (see `runtime.manifest.python_tools`).
+CONNECTION_SNOW = 'service-now'
+
+STATE_LABELS = {'1': 'New', '2': 'In Progress', '3': 'On Hold', '6': 'Resolved', '7': 'Closed'}
+OPEN_STATES = ('1', '2', '3')
+URGENCY_LABELS = {'1': 'High', '2': 'Medium', '3': 'Low'}
+# The Table API fields ServiceNowIncident is built from
+INCIDENT_FIELDS = ('number', 'short_description', 'description', 'state', 'urgency', 'opened_at')
+
+
+class ServiceNowIncident(BaseModel):
+    """
+    Represents the details of a ServiceNow incident.
+    """
+    incident_number: str = Field(..., validation_alias=AliasChoices('incident_number', 'number'),
+                                 description='The incident number assigned by ServiceNow')
+    short_description: str = Field(..., description='A brief summary of the incident')
+    description: Optional[str] = Field('', description='Detailed information about the incident')
+    state: str = Field(..., description='Current state of the incident')
+    urgency: str = Field(..., description='Urgency level of the incident')
+    created_on: str = Field(..., validation_alias=AliasChoices('created_on', 'opened_at'),
+                            description='The date and time the incident was created')
+
+
+class ServiceNowIncidentResponse(BaseModel):
+    """
+    Represents the response received after creating a ServiceNow incident.
+    """
+    incident_number: str = Field(..., description='The incident number assigned by ServiceNow')
+    sys_id: str = Field(..., description='The system ID of the created incident')
+
+
+class IncidentCount(BaseModel):
+    """
+    Represents the number of incidents with one state and urgency.
+    """
+    state: str = Field(..., description='State of the incidents, e.g. New or Resolved')
+    urgency: str = Field(..., description='Urgency of the incidents: High, Medium or Low')
+    count: int = Field(..., description='Number of incidents with this state and urgency')
+
+
+class ServiceNowIncidentStats(BaseModel):
+    """
+    Represents incident counts grouped by state and urgency.
+    """
+    total: int = Field(..., description='Number of incidents counted')
+    open: int = Field(..., description='Incidents that are New, In Progress or On Hold')
+    opened_within_days: Optional[int] = Field(None, description='Only incidents opened in this many days were counted')
+    by_state: Dict[str, int] = Field(..., description='Incident count per state')
+    by_urgency: Dict[str, int] = Field(..., description='Incident count per urgency')
+    open_by_urgency: Dict[str, int] = Field(..., description='Open incident count per urgency')
+    groups: List[IncidentCount] = Field(..., description='Incident count per state and urgency')
+
+
+_incident_list = TypeAdapter(List[ServiceNowIncident])
+
+
+def incidents_from_rows(rows: Iterable[Dict[str, Any]]) -> List[ServiceNowIncident]:
+    """
+    Validate Table API incident rows (or incident field dicts) into incidents in a single call.
+
+    Raises:
+        pydantic.ValidationError: If a row lacks a required field or has a value of the wrong type
+    """
+    return _incident_list.validate_python(rows if isinstance(rows, list) else list(rows))
+
+
+def incidents_json(incidents: List[ServiceNowIncident]) -> str:
+    """Serialize incidents to a JSON array in a single call."""
+    return _incident_list.dump_json(incidents).decode("utf-8")
+
+
+def table_params(fields: Iterable[str] = INCIDENT_FIELDS, display_value: str = 'false',
+                 exclude_reference_link: bool = True) -> Dict[str, str]:
+    """
+    Table API query parameters that keep responses small.
+
+    Args:
+        fields: Fields to return (`sysparm_fields`); every field of the record when empty
+        display_value: `false` for stored values (state `1`), `true` for display values (state `New`), or `all`
+        exclude_reference_link: Return reference fields as their sys_id instead of a `{link, value}` object
+    """
+    params = {
+        'sysparm_display_value': display_value,
+        'sysparm_exclude_reference_link': 'true' if exclude_reference_link else 'false'
+    }
+    if fields:
+        params['sysparm_fields'] = ','.join(fields)
+    return params
+
+
+def snow_credentials():
+    """The basic-auth credentials of the ServiceNow connection."""
+    # Imported on first use: only calls need the runtime's connection resolver, not importing a tool
+    from ibm_watsonx_orchestrate.run import connections
+
+    return connections.basic_auth(CONNECTION_SNOW)
+
+
+def snow_identity() -> List[str]:
+    """Cache key part of the ServiceNow tools: results depend on the user and instance the connection resolves to."""
+    creds = snow_credentials()
+    return [creds.url, creds.username]
@@ -0,0 +1,236 @@
+"""
+Result caching for READ_ONLY tools.
+
+    @cached(ttl=300)
+    @tool(name="get_directory_tool", permission=ToolPermission.READ_ONLY)
+    def get_directory_info(email: str) -> str: ...
+
+    @invalidates("get_directory_tool")
+    @tool(name="create_profile_tool", permission=ToolPermission.READ_WRITE)
+    def create_profile(name: str, email: str, title: str) -> str: ...
+
+Results are keyed by the tool's normalized arguments and kept as JSON in a
+SQLite file (TOOL_CACHE_PATH, default ~/.cache/adk_tools/tool_cache.sqlite in a
+directory only the user can read) so every tool process of the user shares
+them. A hit returns what the miss did: results that fit the tool's return
+annotation (e.g. models) are validated back into it, and others (e.g. dicts
+from a tool annotated with a model) come back as the plain JSON they were. Tools declared with any permission other than READ_ONLY are
+rejected by `cached`. Error results (strings starting with ❌) and exceptions
+are never cached. Set TOOL_CACHE_DISABLED=1 to bypass the cache entirely.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, get_type_hints
+
+from pydantic import TypeAdapter
+from pydantic_core import PydanticSerializationError
+
+from results import is_error_result
+
+if TYPE_CHECKING:
+    import sqlite3
+
+DEFAULT_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "adk_tools",
+                            "tool_cache.sqlite")
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _path() -> str:
+    return os.environ.get("TOOL_CACHE_PATH", DEFAULT_PATH)
+
+
+def _enabled() -> bool:
+    return os.environ.get("TOOL_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+
+def _conn() -> "sqlite3.Connection":
+    # One connection per thread and cache file; WAL lets readers in other processes proceed during writes.
+    # sqlite3 is imported here rather than with the tool, which only needs it once it is called
+    import sqlite3
+
+    path = _path()
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    if path not in conns:
+        _create_private(path)
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+            "stored_at REAL NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+        conns[path] = conn
+    return conns[path]
+
+
+def _create_private(path: str):
+    # Cached results are the user's data: the directory is 0700 when created here and the file 0600
+    # (SQLite gives its WAL and shared-memory files the same mode)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+
+
+def _count(namespace: str, outcome: str):
+    with _stats_lock:
+        counts = _stats.setdefault(namespace, {"hits": 0, "misses": 0, "invalidations": 0})
+        counts[outcome] += 1
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Per-tool hit, miss and invalidation counts for this process."""
+    with _stats_lock:
+        return {namespace: dict(counts) for namespace, counts in _stats.items()}
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return _normalize(value.value)
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if hasattr(value, "model_dump"):
+        return _normalize(value.model_dump())
+    return value
+
+
+def cache_key(signature: inspect.Signature, args: tuple, kwargs: dict, vary: Any = None) -> str:
+    """Hash of the call's arguments after binding them to the tool's signature and applying defaults."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    payload = json.dumps([_normalize(bound.arguments), _normalize(vary)], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+_ANY = TypeAdapter(Any)
+
+
+def _dump(value: Any, adapter: TypeAdapter) -> str:
+    try:
+        return json.dumps({"typed": True, "value": adapter.dump_python(value, mode="json", warnings="error")})
+    except (PydanticSerializationError, ValueError, TypeError):
+        # Not of the annotated type: stored, and returned on a hit, as plain JSON
+        return json.dumps({"typed": False, "value": _ANY.dump_python(value, mode="json")})
+
+
+def get(namespace: str, key: str, adapter: TypeAdapter = _ANY):
+    """Look up an entry; `adapter` validates values stored from the tool's return type back into it."""
+    row = _conn().execute(
+        "SELECT value FROM entries WHERE namespace = ? AND key = ? AND expires_at > ?", (namespace, key, time.time())
+    ).fetchone()
+    if not row:
+        return False, None
+    entry = json.loads(row[0])
+    if not isinstance(entry, dict) or "typed" not in entry:
+        return False, None  # written by an older version of the cache
+    return True, adapter.validate_python(entry["value"]) if entry["typed"] else entry["value"]
+
+
+def put(namespace: str, key: str, value: Any, ttl: float, maxsize: int, adapter: TypeAdapter = _ANY):
+    now = time.time()
+    conn = _conn()
+    conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                 (namespace, key, _dump(value, adapter), now, now + ttl))
+    # Bound each tool's share of the cache: expired entries first, then the oldest
+    conn.execute("DELETE FROM entries WHERE namespace = ? AND expires_at <= ?", (namespace, now))
+    conn.execute(
+        "DELETE FROM entries WHERE namespace = ? AND key IN "
+        "(SELECT key FROM entries WHERE namespace = ? ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+        (namespace, namespace, maxsize),
+    )
+
+
+def invalidate(namespace: str):
+    _conn().execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+    _count(namespace, "invalidations")
+
+
+def _tool_spec(tool):
+    spec = getattr(tool, "__tool_spec__", None)
+    if spec is None or not hasattr(tool, "fn"):
+        raise TypeError("cached/invalidates must be applied on top of @tool")
+    return spec
+
+
+def _result_adapter(fn: Callable) -> TypeAdapter:
+    try:
+        return TypeAdapter(get_type_hints(fn).get("return", Any))
+    except Exception:
+        return _ANY
+
+
+def cached(ttl: float = 300, maxsize: int = 1024, vary: Optional[Callable[[], Any]] = None):
+    """
+    Memoize a READ_ONLY tool.
+
+    Args:
+        ttl: Seconds a result stays valid
+        maxsize: Most entries kept for this tool
+        vary: Optional callable whose return value is added to the key, e.g. the
+              connection's user for tools whose results depend on who is asking
+
+    Raises:
+        ValueError: If the tool's permission is not READ_ONLY
+    """
+    def decorator(tool):
+        spec = _tool_spec(tool)
+        permission = getattr(spec.permission, "value", spec.permission)
+        if permission != "read_only":
+            raise ValueError(f"Tool {spec.name} has permission {permission}; only read_only tools can be cached")
+        fn = tool.fn
+        namespace = spec.name
+        signature = inspect.signature(fn)
+        adapter = _result_adapter(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled():
+                return fn(*args, **kwargs)
+            key = cache_key(signature, args, kwargs, vary() if vary else None)
+            hit, value = get(namespace, key, adapter)
+            if hit:
+                _count(namespace, "hits")
+                return value
+            _count(namespace, "misses")
+            result = fn(*args, **kwargs)
+            if not is_error_result(result):
+                put(namespace, key, result, ttl, maxsize, adapter)
+            return result
+
+        tool.fn = wrapper
+        return tool
+    return decorator
+
+
+def invalidates(*tool_names: str):
+    """Clear the cached results of `tool_names` after each successful call of the decorated write tool."""
+    def decorator(tool):
+        _tool_spec(tool)
+        fn = tool.fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            result = fn(*args, **kwargs)
+            if _enabled() and not is_error_result(result):
+                for name in tool_names:
+                    invalidate(name)
+            return result
+
+        tool.fn = wrapper
+        return tool
+    return decorator
@@ -0,0 +1,414 @@
+"""
+Tracing and latency histograms for the tools.
+
+    @instrument
+    @cached(ttl=60)
+    @tool(...)
+    def get_my_service_now_incidents():
+        with phase("credentials"):
+            creds = snow_credentials()
+        ...
+
+Each call of an instrumented tool is a span; `phase()` blocks and every HTTP
+request sent through the shared session (timed in `TracedAdapter`) become child
+spans with their duration, payload sizes and status. Durations are recorded in
+per-tool and per-phase log-linear histograms (`latency_summary()`), which are
+always on and cost a few microseconds per call.
+
+Spans are exported as OTLP/JSON when TOOL_TRACE_EXPORT is set: a path appends
+one ExportTraceServiceRequest per line, an http(s) URL posts to an OTLP/HTTP
+collector (`/v1/traces` is added when missing). Export runs in batches on a
+background thread with a bounded queue; spans are dropped rather than slowing
+a tool down. TOOL_TRACE_SAMPLE (default 1.0) is the fraction of tool calls
+exported, and TOOL_TRACE_DISABLED=1 turns instrumentation off.
+"""
+import atexit
+import functools
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+import profiling
+from cassette import CassetteAdapter
+from http_client import calling_tool, current_tool
+from results import is_error_result
+
+SERVICE_NAME = os.environ.get("OTEL_SERVICE_NAME", "adk-dev-tools")
+BATCH_SIZE = 512
+FLUSH_SECONDS = float(os.environ.get("TOOL_TRACE_FLUSH_SECONDS", "5"))
+QUEUE_SIZE = 10_000
+
+# OTLP span kinds and status codes
+KIND_INTERNAL, KIND_CLIENT = 1, 3
+STATUS_OK, STATUS_ERROR = 1, 2
+
+
+class LatencyHistogram:
+    """
+    Log-linear (HDR style) histogram of latencies in microseconds.
+
+    Values below 2**precision get a bucket each; every power-of-two range above
+    is split into 2**precision buckets, so the relative error of a percentile is
+    below 2**-precision (3% at the default) from microseconds to hours, in a few
+    hundred buckets.
+    """
+
+    def __init__(self, precision: int = 5):
+        self.precision = precision
+        self.sub_buckets = 1 << precision
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+        self.lock = threading.Lock()
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_buckets:
+            return value
+        shift = value.bit_length() - self.precision - 1
+        return ((shift + 1) << self.precision) + (value >> shift) - self.sub_buckets
+
+    def _bounds(self, index: int):
+        shift = (index >> self.precision) - 1
+        if shift <= 0:
+            return index, index
+        lower = ((index & (self.sub_buckets - 1)) + self.sub_buckets) << shift
+        return lower, lower + (1 << shift) - 1
+
+    def record(self, seconds: float):
+        value = max(0, int(seconds * 1_000_000))
+        index = self._index(value)
+        with self.lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.count += 1
+            self.total_us += value
+            if value > self.max_us:
+                self.max_us = value
+
+    def merge(self, other: "LatencyHistogram"):
+        with other.lock:
+            counts, count, total, maximum = dict(other.counts), other.count, other.total_us, other.max_us
+        with self.lock:
+            for index, n in counts.items():
+                self.counts[index] = self.counts.get(index, 0) + n
+            self.count += count
+            self.total_us += total
+            self.max_us = max(self.max_us, maximum)
+
+    def percentile(self, q: float) -> float:
+        """The q-th percentile in milliseconds (midpoint of its bucket)."""
+        with self.lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, int(round(q / 100 * self.count)))
+            seen = 0
+            for index in sorted(self.counts):
+                seen += self.counts[index]
+                if seen >= rank:
+                    lower, upper = self._bounds(index)
+                    return min((lower + upper) / 2, self.max_us) / 1000
+        return self.max_us / 1000
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_us / self.count / 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 3),
+            "p90_ms": round(self.percentile(90), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "max_ms": round(self.max_us / 1000, 3),
+        }
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def histogram(name: str) -> LatencyHistogram:
+    """The histogram of `name`: a tool, or `tool/phase` for a phase of it."""
+    found = _histograms.get(name)
+    if found is None:
+        with _histograms_lock:
+            found = _histograms.setdefault(name, LatencyHistogram())
+    return found
+
+
+def latency_summary() -> Dict[str, Dict[str, float]]:
+    """Count, mean, p50/p90/p99 and max latency of every tool and phase seen by this process."""
+    with _histograms_lock:
+        names = sorted(_histograms)
+    return {name: _histograms[name].summary() for name in names}
+
+
+def reset():
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def _enabled() -> bool:
+    return os.environ.get("TOOL_TRACE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "status",
+                 "message", "children", "sampled", "_started")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int, sampled: bool):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self._started = time.perf_counter_ns()
+        self.attributes: Dict[str, Any] = {}
+        self.status = STATUS_OK
+        self.message = ""
+        self.children: List["Span"] = []
+        self.sampled = sampled
+
+    def child(self, name: str, kind: int = KIND_INTERNAL) -> "Span":
+        span = Span(name, self.trace_id, self.span_id, kind, self.sampled)
+        if self.sampled:
+            self.children.append(span)
+        return span
+
+    def finish(self, status: int = STATUS_OK, message: str = ""):
+        # Durations come from the monotonic clock; only the start is wall-clock time
+        self.end_ns = self.start_ns + time.perf_counter_ns() - self._started
+        if status == STATUS_ERROR:
+            self.status, self.message = status, message
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": self.status, **({"message": self.message} if self.message else {})},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class _Exporter:
+    """Batches finished spans on a daemon thread and writes them to TOOL_TRACE_EXPORT."""
+
+    def __init__(self):
+        self.queue: "queue.Queue[Span]" = queue.Queue(QUEUE_SIZE)
+        self.dropped = 0
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def submit(self, span: Span):
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                    self.thread.start()
+                    atexit.register(self.flush)
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self) -> List[Span]:
+        spans = []
+        while len(spans) < BATCH_SIZE:
+            try:
+                spans.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return spans
+
+    def _run(self):
+        while True:
+            time.sleep(FLUSH_SECONDS)
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            while True:
+                spans = self._drain()
+                if not spans:
+                    return
+                try:
+                    export(spans, os.environ.get("TOOL_TRACE_EXPORT", ""))
+                except Exception:
+                    self.dropped += len(spans)  # tracing must never break the tools
+
+
+_exporter = _Exporter()
+
+
+def flush():
+    """Export the spans still queued; also run at interpreter exit."""
+    _exporter.flush()
+
+
+def otlp_request(spans: List[Span]) -> Dict[str, Any]:
+    """An OTLP ExportTraceServiceRequest (JSON encoding) for tool spans and all their descendants."""
+    flat, pending = [], list(spans)
+    while pending:
+        span = pending.pop()
+        flat.append(span.to_otlp())
+        pending.extend(span.children)
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{"scope": {"name": "tools.tracing"}, "spans": flat}],
+    }]}
+
+
+def export(spans: List[Span], target: str):
+    if not target:
+        return
+    body = json.dumps(otlp_request(spans), separators=(",", ":"))
+    if target.startswith(("http://", "https://")):
+        url = target if target.rstrip("/").endswith("/v1/traces") else target.rstrip("/") + "/v1/traces"
+        # urllib rather than the shared session, so exports are neither traced nor recorded
+        request = urllib.request.Request(url, data=body.encode("utf-8"), method="POST",
+                                         headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(request, timeout=10).close()
+    else:
+        with open(target, "a", encoding="utf-8") as f:
+            f.write(body + "\n")
+
+
+def _sampled() -> bool:
+    if not os.environ.get("TOOL_TRACE_EXPORT"):
+        return False
+    rate = float(os.environ.get("TOOL_TRACE_SAMPLE", "1"))
+    return rate >= 1 or random.random() < rate
+
+
+def _result_size(result: Any) -> Optional[int]:
+    if isinstance(result, (str, bytes, list, tuple, dict)):
+        return len(result)
+    return None
+
+
+def instrument(tool):
+    """
+    Trace every call of a `@tool` (apply it on top of `@tool` and any `@cached`/`@invalidates`).
+
+    Calls are also handed to `profiling.profile` when on-demand profiling is switched on.
+    """
+    spec = getattr(tool, "__tool_spec__", None)
+    if spec is None or not hasattr(tool, "fn"):
+        raise TypeError("instrument must be applied on top of @tool")
+    fn = tool.fn
+    name = spec.name
+
+    def traced(*args, **kwargs):
+        if not _enabled():
+            return fn(*args, **kwargs)
+        parent = current_span.get()
+        if parent is not None:
+            span = parent.child(name)
+        else:
+            span = Span(name, f"{random.getrandbits(128):032x}", None, KIND_INTERNAL, _sampled())
+        span.attributes["tool.name"] = name
+        token = current_span.set(span)
+        try:
+            with calling_tool(name):
+                result = fn(*args, **kwargs)
+        except Exception as e:
+            span.finish(STATUS_ERROR, f"{type(e).__name__}: {e}")
+            span.attributes["exception.type"] = type(e).__name__
+            raise
+        else:
+            size = _result_size(result)
+            if size is not None:
+                span.attributes["tool.result.size"] = size
+            failed = is_error_result(result)
+            span.finish(STATUS_ERROR if failed else STATUS_OK, result[:200] if failed else "")
+            return result
+        finally:
+            current_span.reset(token)
+            histogram(name).record(span.seconds)
+            if parent is None and span.sampled:
+                _exporter.submit(span)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if profiling.settings.rate and profiling.sampled():
+            with profiling.profile(name):
+                return traced(*args, **kwargs)
+        return traced(*args, **kwargs)
+
+    tool.fn = wrapper
+    return tool
+
+
+@contextmanager
+def phase(name: str, **attributes):
+    """Time a part of the current tool call (credentials, parse, validate, ...) as a child span."""
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+    span = parent.child(name)
+    span.attributes.update(attributes)
+    token = current_span.set(span)
+    try:
+        yield span
+    except Exception as e:
+        span.finish(STATUS_ERROR, f"{type(e).__name__}: {e}")
+        raise
+    else:
+        span.finish()
+    finally:
+        current_span.reset(token)
+        histogram(f"{current_tool.get()}/{name}").record(span.seconds)
+
+
+class TracedAdapter(CassetteAdapter):
+    """Times each request of a traced tool call, including reading the body, as an `http` client span."""
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if current_span.get() is None:
+            return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        body = request.body
+        with phase("http", **{"http.request.method": request.method, "url.full": request.url.split("?")[0],
+                              "http.request.body.size": len(body) if body else 0}) as span:
+            response = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert,
+                                    proxies=proxies)
+            span.kind = KIND_CLIENT
+            span.attributes["http.response.status_code"] = response.status_code
+            if not stream:
+                span.attributes["http.response.body.size"] = len(response.content)
+            elif "Content-Length" in response.headers:
+                # A streamed body is not read yet: its size on the wire (compressed, if it is) is all there is
+                span.attributes["http.response.body.size"] = int(response.headers["Content-Length"])
+            if response.status_code >= 500:
+                span.status = STATUS_ERROR
+        return response